@@ -6,9 +6,12 @@ from __future__ import annotations
 import random
 from collections import deque
 from typing import List, Tuple, Sequence, Optional, Dict
-from ai.knowledge import ClueNotebook
+from ai.knowledge import BitsetNotebook, ClueNotebook, JointNotebook
 from game.cards import SUSPECTS, WEAPONS, ROOMS
 from board.rooms import get_room_name
+from board.topology import get_topology, ROOM, SECRET, DOOR, WALL
+from entities.occupancy import occupancy_for
+from ai.travel import UNREACHABLE, get_travel_table, get_travel_table_for_topology
 
 #Same interpretation of directions as in mechanics/movement.py, but I define them here for clarity.
 DIRECTION_COMMANDS = ["w", "a", "s", "d"]
@@ -21,9 +24,25 @@ DIR_VECTORS = {
 
 
 class AIPlayerController:
-    def __init__(self, player, notebook: Optional[ClueNotebook] = None):
+    #Accusing on a probable solution (ai/posterior.py). Off by default: with a confidence like
+    #0.9 the AI also accuses when the likeliest triplet is at least that likely, before it has
+    #deduced it for sure. The estimate is only measured to be calibrated up to about 0.8, so
+    #a higher confidence is not a known rate of wrong accusations. It is only tried late in the
+    #game, once at most posterior_hypotheses triplets are left (earlier a triplet is rarely that
+    #likely, and counting every time the notebook changes cost most of the game's time), and
+    #only the exact count is used, when it is estimated to take less than posterior_seconds,
+    #so no randomness or clock is involved and a seeded game still replays exactly.
+    confidence: Optional[float] = None
+    posterior_seconds = 0.005
+    posterior_hypotheses = 4
+    def __init__(self, player, notebook: Optional[ClueNotebook | BitsetNotebook] = None, rng=None):
         self.player = player
-        self.nb = notebook if notebook is not None else ClueNotebook()
+        self.nb = notebook if notebook is not None else JointNotebook()
+        #The game's random.Random, so a seeded game replays exactly
+        self.rng = rng or random
+        #Last posterior estimate and the notebook state it was made for
+        self._probable: Optional[Tuple[str, str, str]] = None
+        self._probable_key = None
 
         if self.player.hand:
             self.nb.note_own_hand(self.player.hand)
@@ -32,143 +51,65 @@ class AIPlayerController:
 
     #Check if we can win immediately
     def check_for_winning_accusation(self) -> Optional[Tuple[str, str, str]]:
-        return self.nb.current_singleton_hypothesis()
-    
-
-
-
-
-    #BFS movement
-    def _build_door_to_room_map(self, base_board) -> Dict[Tuple[int, int], int]:
-        
-        #Scan the board for door tiles 'X'.
-        rows = len(base_board)
-        cols = len(base_board[0])
-        door_map: Dict[Tuple[int, int], int] = {}
-
-        for r in range(rows):
-            for c in range(cols):
-                if base_board[r][c] != "X":
-                    continue
-
-                room_id: Optional[int] = None
-                for dr, dc in DIR_VECTORS.values():
-                    nr, nc = r + dr, c + dc
-                    if 0 <= nr < rows and 0 <= nc < cols:
-                        tile = base_board[nr][nc]
-                        if tile in "123456789":
-                            room_id = int(tile)
-                            break
-                if room_id is not None:
-                    door_map[(r, c)] = room_id
-        return door_map
-
-    def _bfs_distances(self, base_board, start: Tuple[int, int]):
-        #BFS over hallway/door tiles from start
-        from mechanics.movement import in_bounds
-
-        rows = len(base_board)
-        cols = len(base_board[0])
-
-        dist = [[None for _ in range(cols)] for _ in range(rows)]
-        prev = [[None for _ in range(cols)] for _ in range(rows)]
-
-        sr, sc = start
-        if not in_bounds(base_board, sr, sc):
-            return dist, prev
-
-        #At first I didnt allow players to be on same tile, but now I do.
-        q = deque()
-        q.append((sr, sc))
-        dist[sr][sc] = 0
-
-        def can_walk(r: int, c: int) -> bool:
-            if not in_bounds(base_board, r, c):
-                return False
-            tile = base_board[r][c]
-            return tile in (".", "X")
-
-        while q:
-            r, c = q.popleft()
-            for dr, dc in DIR_VECTORS.values():
-                nr, nc = r + dr, c + dc
-                if not can_walk(nr, nc):
-                    continue
-                if dist[nr][nc] is not None:
-                    continue
-                dist[nr][nc] = dist[r][c] + 1
-                prev[nr][nc] = (r, c)
-                q.append((nr, nc))
-
-        return dist, prev
-
-    def _reconstruct_first_step(
-        self,
-        start: Tuple[int, int],
-        target: Tuple[int, int],
-        prev,
-    ) -> Optional[str]:
-        sr, sc = start
-        tr, tc = target
-
-        if prev[tr][tc] is None and (sr, sc) != (tr, tc):
+        hypo = self.nb.current_singleton_hypothesis()
+        if hypo is None and self.confidence is not None:
+            hypo = self.probable_solution()
+        return hypo
+
+    #The likeliest triplet if it is at least `confidence` likely, otherwise None.
+    #Only recomputed when the notebook has learnt something since the last call.
+    def probable_solution(self) -> Optional[Tuple[str, str, str]]:
+        nb = self.nb
+        if self.confidence is None or not getattr(nb, "names", ()):
             return None
+        key = nb.knowledge_key()
+        if key != self._probable_key:
+            self._probable = None
+            self._probable_key = key
+            count = getattr(nb, "hypothesis_count", None)
+            if count is not None and count() > self.posterior_hypotheses:
+                return None
+            from ai.posterior import exact_posterior
+            post = exact_posterior(nb, self.posterior_seconds)
+            if post is not None:
+                triplet, p = post.best()
+                if p >= self.confidence:
+                    self._probable = triplet
+        return self._probable
+    
 
-        #Reconstruct backwards
-        path = []
-        cur = (tr, tc)
-        while cur is not None:
-            path.append(cur)
-            if cur == (sr, sc):
-                break
-            cur = prev[cur[0]][cur[1]]
-
-        if not path or path[-1] != (sr, sc):
-            return None
 
-        path.reverse()
-        if len(path) < 2:
-            return None
 
-        next_r, next_c = path[1]
-        dr = next_r - sr
-        dc = next_c - sc
-
-        for cmd, (vr, vc) in DIR_VECTORS.items():
-            if (dr, dc) == (vr, vc):
-                return cmd
-        return None
 
     #This is basically the function that decides movement each turn.
     #I divided it into multiple steps for clarity, since it would get super confusing otherwise.
     def choose_move_command(self, base_board, players, steps_remaining: int) -> str:
         #Decide one movement command.
         #I imported is_occupied here to avoid crash ***
-        from mechanics.movement import in_bounds, is_occupied
-        from mechanics.movement import WALL_TILE
+        from mechanics.movement import is_occupied
 
+        topo = get_topology(base_board)
         row, col = self.player.position
-        current_tile = base_board[row][col]
+        current_kind = topo.kind[row][col]
+        #Neighbours in w, a, s, d order (the order the AI has always tried them in)
+        by_cmd = dict(topo.neighbours[(row, col)])
+        neighbours = [(cmd, by_cmd[cmd]) for cmd in DIRECTION_COMMANDS if cmd in by_cmd]
 
         #STEP 0: INSIDE A ROOM
-        if self.player.in_room is not None and current_tile in "123456789%&":
+        if self.player.in_room is not None and current_kind in (ROOM, SECRET):
             
             #0a: If adjacent to a door ('X'), TAKE IT (unless blocked).
-            for cmd in DIRECTION_COMMANDS:
-                dr, dc = DIR_VECTORS[cmd]
-                nr, nc = row + dr, col + dc
-                if not in_bounds(base_board, nr, nc): continue
-                if base_board[nr][nc] == "X":
+            for cmd, (nr, nc) in neighbours:
+                if topo.kind[nr][nc] == DOOR:
                     if not is_occupied(players, nr, nc, self.player):
                         return cmd
 
             #This part was the wanderin inside room logic before I added BFS.
-            door_map = self._build_door_to_room_map(base_board)
             my_room_id = self.player.in_room
             
             
             #Move towards the nearest door of this room
-            my_doors = [pos for pos, rid in door_map.items() if rid == my_room_id]
+            my_doors = topo.room_doors.get(my_room_id, ())
             
             if my_doors:
                 best_door = None
@@ -192,14 +133,14 @@ class AIPlayerController:
             #Inside moves
             tried = set()
             for _ in range(10):
-                cmd = random.choice(DIRECTION_COMMANDS)
+                cmd = self.rng.choice(DIRECTION_COMMANDS)
                 if cmd in tried: continue
                 tried.add(cmd)
                 dr, dc = DIR_VECTORS[cmd]
                 nr, nc = row + dr, col + dc
                 
-                if not in_bounds(base_board, nr, nc): continue
-                if base_board[nr][nc] == WALL_TILE: continue
+                if not topo.in_bounds(nr, nc): continue
+                if topo.kind[nr][nc] == WALL: continue
                 if is_occupied(players, nr, nc, self.player): continue
                 return cmd
             return "done"
@@ -207,23 +148,18 @@ class AIPlayerController:
 
 
         #STEP 1 - STANDING ON A DOOR ('X')
-        if current_tile == "X":
+        if current_kind == DOOR:
             #Enter the room if we didn't just leave it.
-            for cmd in DIRECTION_COMMANDS:
-                dr, dc = DIR_VECTORS[cmd]
-                nr, nc = row + dr, col + dc
-                if not in_bounds(base_board, nr, nc): continue
-                
-                tile = base_board[nr][nc]
-                if tile in "123456789":
-                    room_id = int(tile)
+            for cmd, (nr, nc) in neighbours:
+                room_id = topo.room_id[nr][nc]
+                if room_id is not None:
                     room_name = get_room_name(room_id)
                     
                     if room_name == self.nb.last_room:
                         continue 
                     
                     #Do not enter if we know it's not the solution
-                    if room_name not in self.nb.possible_rooms:
+                    if not self.nb.is_possible(room_name):
                         continue
 
                     if not is_occupied(players, nr, nc, self.player):
@@ -231,46 +167,37 @@ class AIPlayerController:
 
 
         #STEP 2-5: BFS main movement
-        door_map = self._build_door_to_room_map(base_board)
-        dist, prev = self._bfs_distances(base_board, (row, col))
-
-        best_utility = -float('inf')
+        #Pick the room by expected turns (ai/travel.py: dice, secret passages), then head for
+        #the nearest door of the room to walk into. Distances come from the per-door fields
+        #precomputed in board/topology.py
+        travel = get_travel_table(base_board)
         best_door = None
-
-        for (dr_row, dr_col), room_id in door_map.items():
-            d = dist[dr_row][dr_col]
-            if d is None: continue
-            if d == 0: continue
-
-            room_name = get_room_name(room_id)
-            
-            #Heavy penalty if this is the last room we visited. This is basically to mimic human-like
-            #behavior of not immediately re-entering a room we just left.
-            if room_name == self.nb.last_room:
-                pass
-
-            room_score = self.nb.score_room(room_name)
-            utility = room_score - (0.5 * d)
-
-            if utility > best_utility:
-                best_utility = utility
-                best_door = (dr_row, dr_col)
+        best_field = None
+        best_d = None
+
+        target = self._best_room(travel, (row, col))
+        if target is not None:
+            for door in topo.room_doors.get(target[1], ()):
+                field = topo.door_field(door)
+                d = topo.distance_from(field, (row, col))
+                if not d:
+                    continue
+                if best_d is None or d < best_d:
+                    best_d = d
+                    best_door = door
+                    best_field = field
 
         if best_door is not None:
-            cmd = self._reconstruct_first_step((row, col), best_door, prev)
-            if cmd is not None:
-                dr, dc = DIR_VECTORS[cmd]
-                nr, nc = row + dr, col + dc
+            step = topo.first_step(best_field, (row, col))
+            if step is not None:
+                cmd, (nr, nc) = step
                 if not is_occupied(players, nr, nc, self.player):
                     return cmd
 
 
         # STEP 6: FALLBACK if next to door
-        for cmd in DIRECTION_COMMANDS:
-            dr, dc = DIR_VECTORS[cmd]
-            nr, nc = row + dr, col + dc
-            if not in_bounds(base_board, nr, nc): continue
-            if base_board[nr][nc] == "X":
+        for cmd, (nr, nc) in neighbours:
+            if topo.kind[nr][nc] == DOOR:
                 if not is_occupied(players, nr, nc, self.player):
                     return cmd
 
@@ -279,22 +206,22 @@ class AIPlayerController:
         #STEP 7: FINAL FALLBACK Random Valid Move
         tried = set()
         for _ in range(15):
-            cmd = random.choice(DIRECTION_COMMANDS)
+            cmd = self.rng.choice(DIRECTION_COMMANDS)
             if cmd in tried: continue
             tried.add(cmd)
 
             dr, dc = DIR_VECTORS[cmd]
             nr, nc = row + dr, col + dc
             
-            if not in_bounds(base_board, nr, nc): continue
+            if not topo.in_bounds(nr, nc): continue
             
-            tile = base_board[nr][nc]
+            kind = topo.kind[nr][nc]
             
-            if tile == WALL_TILE: continue
+            if kind == WALL: continue
             if is_occupied(players, nr, nc, self.player): continue
             
             #This is to avoid room enterance
-            if tile in "123456789": continue
+            if kind == ROOM: continue
 
             return cmd
 
@@ -303,6 +230,208 @@ class AIPlayerController:
 
 
 
+    #Whole-roll planning.
+    #choose_move_command decides one pip at a time, which repeats the target scoring for every
+    #step of the roll. plan_move picks the target once and returns every command for the roll.
+    def plan_move(self, base_board, players, steps: int) -> Optional[List[str]]:
+        #Returns the commands to play ([] = stay put), or None if nothing could be planned,
+        #in which case the caller falls back to choose_move_command step by step.
+        from mechanics.reachability import reachable_with_roll
+
+        topo = get_topology(base_board)
+        index = occupancy_for(players)
+        if index is not None:
+            occupied = index.occupied_positions(self.player)
+        else:
+            occupied = {p.position for p in players if p is not self.player}
+        pos = self.player.position
+        plan: List[str] = []
+
+        #Rooms we could actually walk into with this roll
+        reach = reachable_with_roll(base_board, players, self.player, steps)
+        quick_rooms = [rid for rid in reach.rooms if self._worth_entering(get_room_name(rid))]
+
+        #Inside a room: walk to the exit door that suits the best target
+        if self.player.in_room is not None and topo.is_room_like(pos):
+            exits = self._room_exits(topo, pos, occupied)
+            if not exits:
+                return None
+
+            target = self._choose_target_door(
+                topo, {door: len(route) for door, route in exits.items()}, pos, quick_rooms
+            )
+            if target is not None:
+                field = topo.door_field(target)
+                exit_door = min(
+                    (d for d in exits if field[d[0]][d[1]] is not None),
+                    key=lambda d: len(exits[d]) + field[d[0]][d[1]],
+                )
+            else:
+                exit_door = min(exits, key=lambda d: len(exits[d]))
+
+            for cmd, nxt in exits[exit_door]:
+                if steps == 0:
+                    return plan
+                plan.append(cmd)
+                pos = nxt
+                steps -= 1
+        else:
+            target = None
+
+        #Hallway: follow the distance field towards the target door
+        while steps > 0:
+            if topo.kind_at(pos) == DOOR:
+                entry = self._room_entry_command(topo, pos, occupied)
+                if entry is not None:
+                    plan.append(entry)
+                    return plan
+
+            if target is None or pos == target:
+                target = self._choose_target_door(topo, {pos: 0}, pos, quick_rooms)
+                if target is None:
+                    break
+
+            step = self._step_towards(topo, topo.door_field(target), pos, occupied)
+            if step is None:
+                break
+            cmd, pos = step
+            plan.append(cmd)
+            steps -= 1
+
+        return plan
+
+    def _choose_target_door(
+        self,
+        topo,
+        origins: Dict[Tuple[int, int], int],
+        here: Tuple[int, int],
+        quick_rooms: Sequence[int] = (),
+    ) -> Optional[Tuple[int, int]]:
+        #Same choice as choose_move_command: the room with the best score minus the expected
+        #turns to get in from `here`, then the nearest door of the room to walk into.
+        #origins maps starting tiles to the steps already spent reaching them.
+        travel = get_travel_table_for_topology(topo)
+        door_dist: Dict[Tuple[int, int], int] = {}
+
+        for door in topo.door_to_room:
+            field = topo.door_field(door)
+            d = None
+            for origin, spent in origins.items():
+                od = topo.distance_from(field, origin)
+                if od is not None and (d is None or od + spent < d):
+                    d = od + spent
+            if d:
+                door_dist[door] = d
+
+        best_door = None
+        target = self._best_room(travel, here)
+        if target is not None:
+            doors = [d for d in topo.room_doors.get(target[1], ()) if d in door_dist]
+            if doors:
+                best_door = min(doors, key=lambda d: door_dist[d])
+
+        #A room we can enter with this very roll beats an equally good room further away:
+        #the suggestion happens this turn instead of turns later.
+        if quick_rooms:
+            quick = max(quick_rooms, key=lambda rid: self.nb.score_room(get_room_name(rid)))
+            quick_score = self.nb.score_room(get_room_name(quick))
+            target_score = (
+                self.nb.score_room(get_room_name(target[0]))
+                if best_door is not None else -float('inf')
+            )
+            quick_doors = [d for d in topo.room_doors.get(quick, ()) if d in door_dist]
+            if quick_doors and quick_score >= target_score:
+                return min(quick_doors, key=lambda d: door_dist[d])
+
+        return best_door
+
+    def _best_room(self, travel, pos) -> Optional[Tuple[int, int]]:
+        #(target room, room to walk into) with the best utility from pos, or None.
+        #A secret passage only counts if we would walk into the room it starts from;
+        #the room we are standing in does not count.
+        best_utility = -float('inf')
+        best = None
+        for room_id in travel.room_ids:
+            entry = travel.entry_room(room_id, pos)
+            turns = travel.expected_turns(room_id, pos)
+            if entry != room_id and not self._worth_entering(get_room_name(entry)):
+                entry = room_id
+                turns = travel.expected_turns(room_id, pos, passages=False)
+            if turns == 0.0 or turns == UNREACHABLE:
+                continue
+
+            utility = self.nb.room_utility(get_room_name(room_id), turns)
+            if utility > best_utility:
+                best_utility = utility
+                best = (room_id, entry)
+        return best
+
+    def _worth_entering(self, room_name: str) -> bool:
+        #Skip the room we just left and rooms we know are innocent
+        return room_name != self.nb.last_room and self.nb.is_possible(room_name)
+
+    def _step_towards(self, topo, field, pos, occupied) -> Optional[Tuple[str, Tuple[int, int]]]:
+        #First free neighbour that is one step closer to the field's target
+        here = topo.distance_from(field, pos)
+        if not here:
+            return None
+        for cmd, (nr, nc) in topo.neighbours[pos]:
+            if not topo.walkable[nr][nc] or (nr, nc) in occupied:
+                continue
+            if field[nr][nc] == here - 1:
+                return cmd, (nr, nc)
+        return None
+
+    def _room_entry_command(self, topo, door, occupied) -> Optional[str]:
+        #Standing on a door: step into the room unless we just left it or know it's innocent
+        by_cmd = dict(topo.neighbours[door])
+        for cmd in DIRECTION_COMMANDS:
+            nxt = by_cmd.get(cmd)
+            if nxt is None:
+                continue
+            room_id = topo.room_id[nxt[0]][nxt[1]]
+            if room_id is None:
+                continue
+            if not self._worth_entering(get_room_name(room_id)):
+                continue
+            if nxt not in occupied:
+                return cmd
+        return None
+
+    def _room_exits(self, topo, start, occupied) -> Dict[Tuple[int, int], List[Tuple[str, Tuple[int, int]]]]:
+        #BFS over the room tiles from start. Returns every free door we can step out to,
+        #with the (command, position) route that ends on the door.
+        prev = {start: None}
+        exits: Dict[Tuple[int, int], List[Tuple[str, Tuple[int, int]]]] = {}
+        q = deque([start])
+
+        while q:
+            pos = q.popleft()
+            for cmd, nxt in topo.neighbours[pos]:
+                if nxt in prev or nxt in occupied:
+                    continue
+                kind = topo.kind_at(nxt)
+                if kind == DOOR:
+                    if nxt not in exits:
+                        route = [(cmd, nxt)]
+                        cur = pos
+                        while prev[cur] is not None:
+                            step_cmd, parent = prev[cur]
+                            route.append((step_cmd, cur))
+                            cur = parent
+                        route.reverse()
+                        exits[nxt] = route
+                    continue
+                if kind not in (ROOM, SECRET):
+                    continue
+                prev[nxt] = (cmd, pos)
+                q.append(nxt)
+
+        return exits
+
+
+
+
     #Room entry notification
     def note_entered_room(self, room_id: int) -> None:
         room_name = get_room_name(room_id)
@@ -320,13 +449,13 @@ class AIPlayerController:
         all_suspects: Sequence[str] = SUSPECTS,
         all_weapons: Sequence[str] = WEAPONS,
     ) -> Tuple[str, str, str]:
-        suspect = self.nb.choose_suspect_candidate()
+        suspect = self.nb.choose_suspect_candidate(self.rng)
         if suspect not in all_suspects:
-            suspect = random.choice(list(all_suspects))
+            suspect = self.rng.choice(list(all_suspects))
 
-        weapon = self.nb.choose_weapon_candidate()
+        weapon = self.nb.choose_weapon_candidate(self.rng)
         if weapon not in all_weapons:
-            weapon = random.choice(list(all_weapons))
+            weapon = self.rng.choice(list(all_weapons))
 
         room = room_name
         self.nb.note_room_suggestion(room_name)
@@ -347,7 +476,7 @@ class AIPlayerController:
         #but now I added some logic to it.
         
         #Never take a passage to a room we know is innocent.
-        if dest_room_name not in self.nb.possible_rooms:
+        if not self.nb.is_possible(dest_room_name):
             return False
 
         if dest_room_name == self.nb.last_room:
@@ -392,9 +521,29 @@ class AIPlayerController:
 
 
 
+    #Formal accusation (any room). Uses the deduced solution when there is one (or a probable
+    #one, with confidence set), otherwise a random guess.
+    def choose_accusation(self) -> Tuple[str, str, str]:
+        hypo = self.nb.current_singleton_hypothesis() or self.probable_solution()
+        if hypo:
+            return hypo
+        return self.rng.choice(SUSPECTS), self.rng.choice(WEAPONS), self.rng.choice(ROOMS)
+
+
+
     # Knowledge updates - seen cards
-    def note_seen_card(self, card_name: str):
-        self.nb.note_seen_card(card_name)
+    def note_seen_card(self, card_name: str, holder: Optional[str] = None):
+        self.nb.note_seen_card(card_name, holder)
+
+    #Table talk (game/events.py): every suggestion and wrong accusation at the table
+    def on_table(self, names, hand_sizes) -> None:
+        self.nb.note_table(names, hand_sizes, self.player.name)
+
+    def on_suggestion(self, event) -> None:
+        self.nb.note_suggestion(event.suggester, event.triplet, event.passers, event.refuter, event.card)
+
+    def on_accusation(self, event) -> None:
+        self.nb.note_failed_accusation(event.triplet)
 
     def debug_print_notebook(self):
         print(self.nb.debug_summary())
\ No newline at end of file
@@ -7,8 +7,33 @@
 
 
 from __future__ import annotations
-from typing import Iterable, Optional, Tuple, Dict, Set
-from game.cards import SUSPECTS, WEAPONS, ROOMS
+import random
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Dict, Set, FrozenSet
+
+import numpy as np
+
+from game.cards import (SUSPECTS, WEAPONS, ROOMS, CARD_BIT, CARD_ID, N_CARDS, WEAPON_BASE, ROOM_BASE,
+                        SUSPECT_BITS, WEAPON_BITS, ROOM_BITS, ALL_CARDS, cards_mask)
+
+
+#Immutable copy of a notebook's contents (see game/state.py).
+#Counts are kept as sorted (room, count) pairs so two equal notebooks give equal tuples.
+#The last fields are DeductionNotebook's who-holds-what table, empty for the other notebooks.
+class NotebookState(NamedTuple):
+    possible_suspects: FrozenSet[str]
+    possible_weapons: FrozenSet[str]
+    possible_rooms: FrozenSet[str]
+    seen_cards: FrozenSet[str]
+    room_visit_count: Tuple[Tuple[str, int], ...]
+    room_suggestion_count: Tuple[Tuple[str, int], ...]
+    last_room: Optional[str]
+    owner: Optional[str] = None
+    holders: Tuple[str, ...] = ()
+    hand_sizes: Tuple[int, ...] = ()
+    holds: Tuple[FrozenSet[str], ...] = ()
+    lacks: Tuple[FrozenSet[str], ...] = ()
+    clauses: Tuple[Tuple[str, FrozenSet[str]], ...] = ()
+    wrong_accusations: Tuple[FrozenSet[str], ...] = ()
 
 
 
@@ -41,14 +66,31 @@ class ClueNotebook:
         for card in cards:
             self.note_seen_card(card)
 
-    def note_seen_card(self, card_name: str) -> None:
-        #This is for when the player sees a card.
+    def note_seen_card(self, card_name: str, holder: Optional[str] = None) -> None:
+        #This is for when the player sees a card (holder: who showed it, if anybody).
         if card_name in self.seen_cards:
             return
 
         self.seen_cards.add(card_name)
         self._eliminate_card(card_name)
 
+    def is_possible(self, card: str) -> bool:
+        #Can this card still be part of the solution?
+        return card in self.possible_suspects or card in self.possible_weapons or card in self.possible_rooms
+
+    #Suggestions at the table (game/events.py): this notebook only learns the cards it is
+    #shown, DeductionNotebook below also uses the passes, refutations and wrong accusations
+    def note_table(self, names, hand_sizes, owner: str) -> None:
+        pass
+
+    def note_suggestion(self, suggester: str, triplet: Tuple[str, str, str], passers,
+                        refuter: Optional[str], card: Optional[str] = None) -> None:
+        if card is not None:
+            self.note_seen_card(card, refuter)
+
+    def note_failed_accusation(self, triplet: Tuple[str, str, str]) -> None:
+        pass
+
     def _eliminate_card(self, card: str) -> None:
         #Remove 'card' from the candidate sets if present.
         if card in self.possible_suspects:
@@ -122,18 +164,31 @@ class ClueNotebook:
 
 
 
+    #Room utility in turns.
+    #score_room says how useful a room is, expected_turns (see ai/travel.py) says how many
+    #dice turns it takes to get there. Each turn spent walking costs TURN_PENALTY points,
+    #which is roughly what the old 0.5 per hallway step came to at 3.5 pips a turn.
+    TURN_PENALTY = 1.75
+
+    def room_utility(self, room_name: str, expected_turns: float) -> float:
+        return self.score_room(room_name) - self.TURN_PENALTY * expected_turns
+
+
+
     #Candidate choice for suggestions
-    def choose_suspect_candidate(self) -> str:
-        import random
+    #The sets are sorted first: set order changes with the string hash seed,
+    #and the same rng must give the same card in every process.
+    def choose_suspect_candidate(self, rng=None) -> str:
+        rng = rng or random
         if self.possible_suspects:
-            return random.choice(list(self.possible_suspects))
-        return random.choice(list(self.all_suspects))
+            return rng.choice(sorted(self.possible_suspects))
+        return rng.choice(sorted(self.all_suspects))
 
-    def choose_weapon_candidate(self) -> str:
-        import random
+    def choose_weapon_candidate(self, rng=None) -> str:
+        rng = rng or random
         if self.possible_weapons:
-            return random.choice(list(self.possible_weapons))
-        return random.choice(list(self.all_weapons))
+            return rng.choice(sorted(self.possible_weapons))
+        return rng.choice(sorted(self.all_weapons))
 
 
     #Current best guess 
@@ -151,6 +206,29 @@ class ClueNotebook:
 
 
 
+    #Snapshots
+    def snapshot(self) -> NotebookState:
+        return NotebookState(
+            possible_suspects=frozenset(self.possible_suspects),
+            possible_weapons=frozenset(self.possible_weapons),
+            possible_rooms=frozenset(self.possible_rooms),
+            seen_cards=frozenset(self.seen_cards),
+            room_visit_count=tuple(sorted(self.room_visit_count.items())),
+            room_suggestion_count=tuple(sorted(self.room_suggestion_count.items())),
+            last_room=self.last_room,
+        )
+
+    def restore(self, state: NotebookState) -> None:
+        self.possible_suspects = set(state.possible_suspects)
+        self.possible_weapons = set(state.possible_weapons)
+        self.possible_rooms = set(state.possible_rooms)
+        self.seen_cards = set(state.seen_cards)
+        self.room_visit_count = dict(state.room_visit_count)
+        self.room_suggestion_count = dict(state.room_suggestion_count)
+        self.last_room = state.last_room
+
+
+
     #Debug
     def debug_summary(self) -> str:
         lines = []
@@ -165,4 +243,610 @@ class ClueNotebook:
             s = self.room_suggestion_count.get(r, 0)
             lines.append(f"  {r}: visits={v}, suggestions={s}")
         lines.append(f"Last room        : {self.last_room}")
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
+
+
+
+#Bitset notebook
+#The same notebook with the cards as bitmasks over the card ids of game/cards.py: the
+#candidates and the seen cards are one int each, counts come from a table instead of len(),
+#and visits / suggestions are lists indexed by room. Noting a card is two integer ops.
+#It plays exactly like ClueNotebook (same rng -> same choices, candidates are picked from the
+#same sorted names) and gives the same NotebookState, so the two can be swapped freely.
+N_ROOM_CARDS = len(ROOMS)
+
+#Set-bit count of every mask of up to 9 bits
+_POPCOUNT = tuple(bin(m).count("1") for m in range(1 << N_ROOM_CARDS))
+
+
+def _sorted_names(cards) -> Tuple[Tuple[str, ...], ...]:
+    #For every mask over 'cards': the names of its cards, sorted
+    return tuple(
+        tuple(sorted(card for i, card in enumerate(cards) if m >> i & 1))
+        for m in range(1 << len(cards))
+    )
+
+
+_SUSPECT_NAMES = _sorted_names(SUSPECTS)
+_WEAPON_NAMES = _sorted_names(WEAPONS)
+_ROOM_NAMES = _sorted_names(ROOMS)
+
+#Room name -> (card bit, index into the visit / suggestion lists)
+_ROOM_SLOTS: Dict[str, Tuple[int, int]] = {room: (CARD_BIT[room], i) for i, room in enumerate(ROOMS)}
+
+
+class BitsetNotebook:
+    __slots__ = ("all_cards", "possible", "seen", "visits", "suggestions", "last")
+    TURN_PENALTY = ClueNotebook.TURN_PENALTY
+
+    def __init__(
+        self,
+        suspects: Iterable[str] = SUSPECTS,
+        weapons: Iterable[str] = WEAPONS,
+        rooms: Iterable[str] = ROOMS,
+    ):
+        self.all_cards = cards_mask(suspects) | cards_mask(weapons) | cards_mask(rooms)
+        self.possible = self.all_cards
+        self.seen = 0
+        #Indexed by room card id - ROOM_BASE (= board room id - 1); last is -1 before any room
+        self.visits = [0] * N_ROOM_CARDS
+        self.suggestions = [0] * N_ROOM_CARDS
+        self.last = -1
+
+
+
+    # Card knowledge tracking
+    def note_own_hand(self, cards: Iterable[str]) -> None:
+        for card in cards:
+            self.note_seen_card(card)
+
+    def note_seen_card(self, card_name: str, holder: Optional[str] = None) -> None:
+        bit = CARD_BIT[card_name]
+        self.seen |= bit
+        self.possible &= ~bit
+
+    def is_possible(self, card: str) -> bool:
+        return (self.possible & CARD_BIT.get(card, 0)) != 0
+
+    note_table = ClueNotebook.note_table
+    note_suggestion = ClueNotebook.note_suggestion
+    note_failed_accusation = ClueNotebook.note_failed_accusation
+
+    def process_unrefuted_suggestion(self, triplet: Tuple[str, str, str]) -> None:
+        #Every unseen card of the triplet is the only candidate of its kind
+        for card, kind in zip(triplet, (SUSPECT_BITS, WEAPON_BITS, ROOM_BITS)):
+            bit = CARD_BIT[card]
+            if not self.seen & bit:
+                self.possible = (self.possible & ~kind) | bit
+
+
+    #Room tracking
+    def note_room_visit(self, room_name: str) -> None:
+        room = _ROOM_SLOTS[room_name][1]
+        self.visits[room] += 1
+        self.last = room
+
+    def note_room_suggestion(self, room_name: str) -> None:
+        self.suggestions[_ROOM_SLOTS[room_name][1]] += 1
+
+
+
+    #Room scoring, same numbers as ClueNotebook.score_room
+    def score_room(self, room_name: str) -> float:
+        possible = self.possible
+        bit, room = _ROOM_SLOTS.get(room_name, (0, 0))
+        if not possible & bit:
+            return -100.0
+
+        base = float(_POPCOUNT[possible & SUSPECT_BITS] * _POPCOUNT[(possible & WEAPON_BITS) >> WEAPON_BASE])
+        score = base - 5.0 * self.visits[room] - 20.0 * self.suggestions[room]
+        if self.last == room:
+            score -= 100.0
+        return score
+
+    def room_utility(self, room_name: str, expected_turns: float) -> float:
+        return self.score_room(room_name) - self.TURN_PENALTY * expected_turns
+
+
+
+    #Candidate choice for suggestions
+    def choose_suspect_candidate(self, rng=None) -> str:
+        rng = rng or random
+        names = _SUSPECT_NAMES[self.possible & SUSPECT_BITS] or _SUSPECT_NAMES[self.all_cards & SUSPECT_BITS]
+        return rng.choice(names)
+
+    def choose_weapon_candidate(self, rng=None) -> str:
+        rng = rng or random
+        weapons = (self.possible & WEAPON_BITS) >> WEAPON_BASE
+        names = _WEAPON_NAMES[weapons] or _WEAPON_NAMES[(self.all_cards & WEAPON_BITS) >> WEAPON_BASE]
+        return rng.choice(names)
+
+
+    #Current best guess
+    def current_singleton_hypothesis(self) -> Optional[Tuple[str, str, str]]:
+        possible = self.possible
+        suspects = possible & SUSPECT_BITS
+        if _POPCOUNT[suspects] != 1:
+            return None
+        weapons = (possible & WEAPON_BITS) >> WEAPON_BASE
+        rooms = (possible & ROOM_BITS) >> ROOM_BASE
+        if _POPCOUNT[weapons] == 1 and _POPCOUNT[rooms] == 1:
+            return _SUSPECT_NAMES[suspects][0], _WEAPON_NAMES[weapons][0], _ROOM_NAMES[rooms][0]
+        return None
+
+
+
+    #Set views, read-only (for snapshots, debugging and code written against ClueNotebook)
+    @property
+    def possible_suspects(self) -> FrozenSet[str]:
+        return frozenset(_SUSPECT_NAMES[self.possible & SUSPECT_BITS])
+
+    @property
+    def possible_weapons(self) -> FrozenSet[str]:
+        return frozenset(_WEAPON_NAMES[(self.possible & WEAPON_BITS) >> WEAPON_BASE])
+
+    @property
+    def possible_rooms(self) -> FrozenSet[str]:
+        return frozenset(_ROOM_NAMES[(self.possible & ROOM_BITS) >> ROOM_BASE])
+
+    @property
+    def seen_cards(self) -> FrozenSet[str]:
+        return frozenset(card for card, bit in CARD_BIT.items() if self.seen & bit)
+
+    @property
+    def room_visit_count(self) -> Dict[str, int]:
+        return self._room_counts(self.visits)
+
+    @property
+    def room_suggestion_count(self) -> Dict[str, int]:
+        return self._room_counts(self.suggestions)
+
+    @property
+    def last_room(self) -> Optional[str]:
+        return ROOMS[self.last] if self.last >= 0 else None
+
+    def _room_counts(self, counts) -> Dict[str, int]:
+        #Like ClueNotebook: every room of the notebook, plus any other room with a count
+        return {
+            room: counts[i] for i, room in enumerate(ROOMS)
+            if self.all_cards & CARD_BIT[room] or counts[i]
+        }
+
+
+
+    #Snapshots
+    def snapshot(self) -> NotebookState:
+        return NotebookState(
+            possible_suspects=self.possible_suspects,
+            possible_weapons=self.possible_weapons,
+            possible_rooms=self.possible_rooms,
+            seen_cards=self.seen_cards,
+            room_visit_count=tuple(sorted(self.room_visit_count.items())),
+            room_suggestion_count=tuple(sorted(self.room_suggestion_count.items())),
+            last_room=self.last_room,
+        )
+
+    def restore(self, state: NotebookState) -> None:
+        self.possible = (cards_mask(state.possible_suspects) | cards_mask(state.possible_weapons)
+                         | cards_mask(state.possible_rooms))
+        self.seen = cards_mask(state.seen_cards)
+        self.visits = [0] * N_ROOM_CARDS
+        self.suggestions = [0] * N_ROOM_CARDS
+        for room, count in state.room_visit_count:
+            self.visits[CARD_ID[room] - ROOM_BASE] = count
+        for room, count in state.room_suggestion_count:
+            self.suggestions[CARD_ID[room] - ROOM_BASE] = count
+        self.last = CARD_ID[state.last_room] - ROOM_BASE if state.last_room is not None else -1
+
+    debug_summary = ClueNotebook.debug_summary
+
+
+
+#Deduction notebook
+#BitsetNotebook plus who holds what. For every player it keeps the cards known to be in their
+#hand (holds) and known not to be (lacks), and a one-of clause for every refutation whose card
+#it did not see; the envelope's candidates are still `possible`. After every event these rules
+#run until nothing changes:
+#  - a card somebody holds is in nobody else's hand and not in the envelope
+#  - the envelope holds exactly one card of each kind
+#  - a card that has only one place left (a hand or the envelope) is there
+#  - a player whose known cards fill their hand holds nothing else, and a player with exactly
+#    hand-size candidates left holds all of them
+#  - a clause down to one candidate is that card
+#  - a wrongly accused triplet with two of its cards certain rules out the third
+#Passes and hand sizes need note_table() first (the game's EventBus calls it when the AI
+#subscribes); until then this plays like a BitsetNotebook.
+_KINDS = (SUSPECT_BITS, WEAPON_BITS, ROOM_BITS)
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _names(mask: int) -> FrozenSet[str]:
+    return frozenset(card for card, bit in CARD_BIT.items() if mask & bit)
+
+
+class DeductionNotebook(BitsetNotebook):
+    __slots__ = ("hand", "names", "seat", "sizes", "owner", "holds", "lacks", "clauses", "wrong")
+
+    def __init__(
+        self,
+        suspects: Iterable[str] = SUSPECTS,
+        weapons: Iterable[str] = WEAPONS,
+        rooms: Iterable[str] = ROOMS,
+    ):
+        super().__init__(suspects, weapons, rooms)
+        #Own cards, kept until the table is known
+        self.hand = 0
+        #Seat order of the players, their hand sizes and our seat
+        self.names: Tuple[str, ...] = ()
+        self.seat: Dict[str, int] = {}
+        self.sizes: Tuple[int, ...] = ()
+        self.owner = -1
+        #Per seat: card masks known held / known not held; clauses are (seat, mask) pairs
+        self.holds: List[int] = []
+        self.lacks: List[int] = []
+        self.clauses: List[Tuple[int, int]] = []
+        #Triplets (as masks) that are known not to be the solution
+        self.wrong: List[int] = []
+
+
+
+    # Events
+    def note_own_hand(self, cards: Iterable[str]) -> None:
+        cards = list(cards)
+        self.hand |= cards_mask(cards)
+        if self.names:
+            self.holds[self.owner] |= self.hand
+        super().note_own_hand(cards)
+
+    def note_seen_card(self, card_name: str, holder: Optional[str] = None) -> None:
+        super().note_seen_card(card_name, holder)
+        if self.names:
+            if holder in self.seat:
+                self.holds[self.seat[holder]] |= CARD_BIT[card_name]
+            self._propagate()
+
+    def note_table(self, names, hand_sizes, owner: str) -> None:
+        if self.names:
+            return
+        self.names = tuple(names)
+        self.seat = {name: i for i, name in enumerate(self.names)}
+        self.sizes = tuple(hand_sizes)
+        self.owner = self.seat[owner]
+        self.holds = [0] * len(self.names)
+        self.lacks = [0] * len(self.names)
+        self.clauses = []
+        #We know our whole hand
+        self.holds[self.owner] = self.hand
+        self.lacks[self.owner] = self.all_cards & ~self.hand
+        self._propagate()
+
+    def note_suggestion(self, suggester: str, triplet: Tuple[str, str, str], passers,
+                        refuter: Optional[str], card: Optional[str] = None) -> None:
+        #Everybody in passers has none of the three cards; refuter has `card`, or at least
+        #one of the three if we did not see which
+        if not self.names:
+            if card is not None:
+                super().note_seen_card(card)
+            return
+        mask = cards_mask(triplet)
+        for name in passers:
+            self.lacks[self.seat[name]] |= mask
+        if card is not None:
+            bit = CARD_BIT[card]
+            self.seen |= bit
+            self.possible &= ~bit
+            self.holds[self.seat[refuter]] |= bit
+        elif refuter is not None:
+            self.clauses.append((self.seat[refuter], mask))
+        self._propagate()
+
+    def note_failed_accusation(self, triplet: Tuple[str, str, str]) -> None:
+        self.wrong.append(cards_mask(triplet))
+        self._propagate()
+
+    def process_unrefuted_suggestion(self, triplet: Tuple[str, str, str]) -> None:
+        super().process_unrefuted_suggestion(triplet)
+        if self.names:
+            self._propagate()
+
+
+
+    # Propagation
+    def _propagate(self) -> None:
+        deck = self.all_cards
+        holds, lacks, sizes = self.holds, self.lacks, self.sizes
+        seats = range(len(holds))
+        while True:
+            before = (self.possible, tuple(holds), tuple(lacks), len(self.clauses), len(self.wrong))
+
+            #Clauses: drop the satisfied ones, a single candidate left is held
+            clauses = []
+            for p, mask in self.clauses:
+                if mask & holds[p]:
+                    continue
+                left = mask & ~lacks[p]
+                if left & (left - 1):
+                    clauses.append((p, left))
+                else:
+                    holds[p] |= left
+            self.clauses = clauses
+
+            #A held card is nowhere else
+            held = 0
+            for p in seats:
+                held |= holds[p]
+            for p in seats:
+                lacks[p] |= held & ~holds[p]
+            possible = self.possible & ~held
+
+            #Wrong accusations: drop the ones already ruled out, and two certain cards rule
+            #out the third
+            certain = 0
+            for kind in _KINDS:
+                cards = possible & kind
+                if cards and not cards & (cards - 1):
+                    certain |= cards
+            wrong = []
+            for mask in self.wrong:
+                if mask & ~possible:
+                    continue
+                if _popcount(mask & certain) == 2:
+                    possible &= ~(mask & ~certain)
+                else:
+                    wrong.append(mask)
+            self.wrong = wrong
+
+            #Envelope: a card no player can hold is in it, and it has one card of each kind
+            nobody = deck
+            for p in seats:
+                nobody &= lacks[p]
+            envelope = 0
+            for kind in _KINDS:
+                forced = nobody & possible & kind
+                if forced and not forced & (forced - 1):
+                    possible = (possible & ~kind) | forced
+                cards = possible & kind
+                if cards and not cards & (cards - 1):
+                    envelope |= cards
+            for p in seats:
+                lacks[p] |= envelope
+            self.possible = possible
+
+            #A card the envelope and every other player lack is in this player's hand
+            for p in seats:
+                only_here = deck & ~possible & ~lacks[p]
+                for q in seats:
+                    if q != p:
+                        only_here &= lacks[q]
+                holds[p] |= only_here
+
+            #Hand sizes
+            for p in seats:
+                if _popcount(holds[p]) >= sizes[p]:
+                    lacks[p] |= deck & ~holds[p]
+                else:
+                    candidates = deck & ~lacks[p]
+                    if _popcount(candidates) == sizes[p]:
+                        holds[p] |= candidates
+
+            if (self.possible, tuple(holds), tuple(lacks), len(self.clauses), len(self.wrong)) == before:
+                break
+
+        for p in seats:
+            self.seen |= holds[p]
+
+    #Everything known about where the cards are, as one hashable value (room scores left out):
+    #equal keys mean nothing new was learnt in between
+    def knowledge_key(self):
+        return (self.possible, tuple(self.holds), tuple(self.lacks), tuple(self.clauses), tuple(self.wrong))
+
+
+
+    #Snapshots
+    def snapshot(self) -> NotebookState:
+        state = super().snapshot()._replace(wrong_accusations=tuple(_names(m) for m in self.wrong))
+        if not self.names:
+            return state
+        return state._replace(
+            owner=self.names[self.owner],
+            holders=self.names,
+            hand_sizes=self.sizes,
+            holds=tuple(_names(m) for m in self.holds),
+            lacks=tuple(_names(m) for m in self.lacks),
+            clauses=tuple((self.names[p], _names(m)) for p, m in self.clauses),
+        )
+
+    def restore(self, state: NotebookState) -> None:
+        super().restore(state)
+        self.names = tuple(state.holders)
+        self.seat = {name: i for i, name in enumerate(self.names)}
+        self.sizes = tuple(state.hand_sizes)
+        self.owner = self.seat[state.owner] if self.names else -1
+        self.holds = [cards_mask(cards) for cards in state.holds]
+        self.lacks = [cards_mask(cards) for cards in state.lacks]
+        self.clauses = [(self.seat[name], cards_mask(cards)) for name, cards in state.clauses]
+        self.wrong = [cards_mask(cards) for cards in state.wrong_accusations]
+        if self.names:
+            self.hand = self.holds[self.owner]
+
+
+
+#Joint notebook
+#DeductionNotebook's candidates are three separate sets, so a fact about a whole triplet only
+#counts once it pins down a single card. This notebook also keeps the 6 x 6 x 9 table of
+#envelope hypotheses (suspect, weapon, room) that are still possible, and rules out:
+#  - every hypothesis with a card that is no longer a candidate
+#  - every hypothesis with all the cards of an open refutation clause (the refuter holds one
+#    of them, so they are not all in the envelope)
+#  - every wrongly accused triplet
+#The candidates are then the cards some hypothesis still has, which can rule out a card none
+#of the rules above does on its own (say both weapons left were accused wrongly with the
+#Hall), and that goes back into DeductionNotebook's rules until neither changes anything.
+#score_room counts the hypotheses with the room instead of suspects x weapons.
+#
+#The table is a 324-bit int, bit suspect * 54 + weapon * 9 + room (the C order of a NumPy
+#6 x 6 x 9 array): ruling out a card is one AND with that card's mask, and a card is still a
+#candidate if its mask meets the table. `hypotheses` gives it as a NumPy bool array.
+#The table follows from the candidates, the clauses and the wrong accusations, so snapshots
+#need nothing more than DeductionNotebook's. game/setup.py gives every AI one of these.
+N_HYPOTHESES = len(SUSPECTS) * len(WEAPONS) * len(ROOMS)
+ALL_HYPOTHESES = (1 << N_HYPOTHESES) - 1
+HYPOTHESIS_SHAPE = (len(SUSPECTS), len(WEAPONS), len(ROOMS))
+
+
+def _hypotheses_by_card() -> Tuple[int, ...]:
+    masks = [0] * N_CARDS
+    n_w, n_r = len(WEAPONS), len(ROOMS)
+    for s in range(len(SUSPECTS)):
+        for w in range(n_w):
+            for r in range(n_r):
+                bit = 1 << ((s * n_w + w) * n_r + r)
+                masks[s] |= bit
+                masks[WEAPON_BASE + w] |= bit
+                masks[ROOM_BASE + r] |= bit
+    return tuple(masks)
+
+
+#Card id -> the hypotheses with that card in the envelope
+HYPOTHESES_WITH_CARD = _hypotheses_by_card()
+_WITH_ALL: Dict[int, int] = {}
+
+
+def hypotheses_with(mask: int) -> int:
+    #The hypotheses with every card of `mask` in the envelope (none if two are of one kind)
+    hyps = _WITH_ALL.get(mask)
+    if hyps is None:
+        hyps = ALL_HYPOTHESES
+        rest = mask
+        while rest:
+            low = rest & -rest
+            hyps &= HYPOTHESES_WITH_CARD[low.bit_length() - 1]
+            rest ^= low
+        _WITH_ALL[mask] = hyps
+    return hyps
+
+
+class JointNotebook(DeductionNotebook):
+    __slots__ = ("joint", "joint_cards", "room_hyps")
+
+    def __init__(
+        self,
+        suspects: Iterable[str] = SUSPECTS,
+        weapons: Iterable[str] = WEAPONS,
+        rooms: Iterable[str] = ROOMS,
+    ):
+        super().__init__(suspects, weapons, rooms)
+        self._reset_joint()
+
+
+
+    # Events (DeductionNotebook only propagates once the table is known)
+    def note_seen_card(self, card_name: str, holder: Optional[str] = None) -> None:
+        super().note_seen_card(card_name, holder)
+        if not self.names:
+            self._propagate()
+
+    def note_suggestion(self, suggester: str, triplet: Tuple[str, str, str], passers,
+                        refuter: Optional[str], card: Optional[str] = None) -> None:
+        super().note_suggestion(suggester, triplet, passers, refuter, card)
+        if not self.names:
+            self._propagate()
+
+    def process_unrefuted_suggestion(self, triplet: Tuple[str, str, str]) -> None:
+        super().process_unrefuted_suggestion(triplet)
+        if not self.names:
+            self._propagate()
+
+
+
+    # Propagation
+    def _propagate(self) -> None:
+        while True:
+            if self.names:
+                super()._propagate()
+            if not self._narrow():
+                break
+
+    def _reset_joint(self) -> None:
+        #joint_cards: the candidates the table was last narrowed with;
+        #room_hyps: hypotheses per room for score_room, None until asked for
+        self.joint = ALL_HYPOTHESES
+        self.joint_cards = ALL_CARDS
+        self.room_hyps = None
+        self._narrow()
+
+    def _narrow(self) -> bool:
+        #Rule out hypotheses, then candidates no hypothesis has. True if a candidate went.
+        before = joint = self.joint
+        possible = self.possible
+        gone = self.joint_cards & ~possible
+        while gone:
+            low = gone & -gone
+            joint &= ~HYPOTHESES_WITH_CARD[low.bit_length() - 1]
+            gone ^= low
+        for _, mask in self.clauses:
+            joint &= ~hypotheses_with(mask)
+        for mask in self.wrong:
+            joint &= ~hypotheses_with(mask)
+        self.joint = joint
+        self.joint_cards = possible
+        #The candidates were the table's cards last time, so an unchanged table changes nothing
+        if joint == before:
+            return False
+        self.room_hyps = None
+
+        left = possible
+        rest = possible
+        while rest:
+            low = rest & -rest
+            if not joint & HYPOTHESES_WITH_CARD[low.bit_length() - 1]:
+                left &= ~low
+            rest ^= low
+        if left == possible:
+            return False
+        self.possible = self.joint_cards = left
+        return True
+
+
+
+    #Room scoring: like BitsetNotebook's, with the hypotheses left in the room as the base
+    #(suspects x weapons when no joint fact is known)
+    def score_room(self, room_name: str) -> float:
+        bit, room = _ROOM_SLOTS.get(room_name, (0, 0))
+        if not self.possible & bit:
+            return -100.0
+
+        if self.room_hyps is None:
+            self.room_hyps = [float(_popcount(self.joint & HYPOTHESES_WITH_CARD[ROOM_BASE + r]))
+                              for r in range(N_ROOM_CARDS)]
+        score = self.room_hyps[room] - 5.0 * self.visits[room] - 20.0 * self.suggestions[room]
+        if self.last == room:
+            score -= 100.0
+        return score
+
+    #Current best guess: the one hypothesis left
+    def current_singleton_hypothesis(self) -> Optional[Tuple[str, str, str]]:
+        joint = self.joint
+        if not joint or joint & (joint - 1):
+            return None
+        s, w, r = np.unravel_index(joint.bit_length() - 1, HYPOTHESIS_SHAPE)
+        return SUSPECTS[s], WEAPONS[w], ROOMS[r]
+
+    def hypothesis_count(self) -> int:
+        return _popcount(self.joint)
+
+    @property
+    def hypotheses(self) -> np.ndarray:
+        #(6, 6, 9) bool array, SUSPECTS x WEAPONS x ROOMS
+        raw = np.frombuffer(self.joint.to_bytes((N_HYPOTHESES + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder="little")[:N_HYPOTHESES].astype(bool).reshape(HYPOTHESIS_SHAPE)
+
+
+
+    #Snapshots: the table is rebuilt from what DeductionNotebook restores
+    def restore(self, state: NotebookState) -> None:
+        super().restore(state)
+        self._reset_joint()
@@ -0,0 +1,369 @@
+# ai/posterior.py
+
+#Probabilities instead of certainty.
+#A DeductionNotebook (ai/knowledge.py) knows which cards are ruled out for sure; this module
+#weighs what is left. Every deal of the cards that agrees with everything the notebook knows
+#(who holds / lacks what, the refutation clauses, the hand sizes, one envelope card of each
+#kind, the envelope hypotheses still open) is equally likely, so the probability of an
+#envelope triplet is the number of such deals with that envelope over the number of all of them.
+#
+#Two ways to get there:
+#  - exact: count the deals with a dynamic program over the players' hands. The state is the
+#    set of cards placed so far (a bitmask over the cards whose place is unknown, used as an
+#    index into a NumPy array of counts), one player's possible hands at a time. Whatever is
+#    left at the end is the envelope, so the counts of all 324 triplets come out of a single
+#    bincount over the final states.
+#  - sampled: draw deals in batches (an envelope among the candidates, the other cards shuffled
+#    into the hands) and keep the ones that agree with the notebook. The proposal is uniform,
+#    so the kept deals are uniform over the consistent ones and their frequencies estimate the
+#    same probabilities.
+#Exact is used when its estimated cost fits in the time budget, otherwise sampling runs until
+#the budget (or max_samples) is used up. With budget=None no clock is looked at, so a seeded
+#rng gives the same answer every time: exact if its estimated cost is under DEFAULT_BUDGET,
+#otherwise max_samples kept deals (or MAX_DRAW_FACTOR times as many drawn).
+#
+#    post = posterior(nb, budget=0.05)
+#    post.best()                       -> (("Mrs. White", "Rope", "Hall"), 0.82)
+#    post.envelope_probability("Rope")
+#
+#Every consistent deal counting the same is the only model of the other players: what they
+#chose to suggest is not used. On 1500 distinct all-AI positions (benchmarks/posterior.py) the
+#likeliest triplet is right a little more often than it claims below p = 0.4 (8% of the time
+#at a mean p of 0.05, 36% at 0.28) and about as often as it claims from 0.4 to 0.8. Above 0.8
+#there are too few positions to tell, and a sampled estimate that kept only a few deals can
+#give p = 1 to a wrong triplet.
+
+from __future__ import annotations
+import time
+from itertools import combinations
+from math import comb
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from game.cards import (SUSPECTS, WEAPONS, ROOMS, CARD_ID, N_CARDS, WEAPON_BASE, ROOM_BASE,
+                        SUSPECT_BITS, WEAPON_BITS, ROOM_BITS)
+
+Triplet = Tuple[str, str, str]
+
+DEFAULT_BUDGET = 0.05
+DEFAULT_MAX_SAMPLES = 200_000
+SAMPLE_BATCH = 4096
+#Without a time budget, give up after drawing this many times max_samples
+MAX_DRAW_FACTOR = 25
+#Rough cost of one element of a NumPy step in the exact count, used to decide exact vs sampled
+EXACT_SECONDS_PER_OP = 3e-9
+#Most cards with an open place the exact count takes on (it keeps 2^n counts per seat);
+#18 is everything but our own hand
+EXACT_MAX_UNKNOWN = 18
+
+N_S, N_W, N_R = len(SUSPECTS), len(WEAPONS), len(ROOMS)
+_KINDS = (SUSPECT_BITS, WEAPON_BITS, ROOM_BITS)
+
+
+class Posterior(NamedTuple):
+    hypotheses: np.ndarray      #(6, 6, 9) probability of each envelope, SUSPECTS x WEAPONS x ROOMS
+    holders: Tuple[str, ...]    #seat names; cards[:, len(holders)] is the envelope
+    cards: np.ndarray           #(21, seats + 1) probability of each card being with each holder
+    exact: bool
+    deals: float                #consistent deals counted (exact) or sampled deals kept
+    elapsed: float
+
+    def best(self) -> Tuple[Triplet, float]:
+        s, w, r = np.unravel_index(int(np.argmax(self.hypotheses)), self.hypotheses.shape)
+        return (SUSPECTS[s], WEAPONS[w], ROOMS[r]), float(self.hypotheses[s, w, r])
+
+    def envelope_probability(self, card: str) -> float:
+        return float(self.cards[CARD_ID[card], -1])
+
+
+class _Problem:
+    #What the notebook knows, reduced to the cards whose place is still open
+    def __init__(self, nb):
+        self.names: Tuple[str, ...] = tuple(nb.names)
+        seats = len(self.names)
+        deck = nb.all_cards
+        possible = nb.possible
+
+        held = 0
+        for mask in nb.holds:
+            held |= mask
+        certain = 0
+        for kind in _KINDS:
+            cards = possible & kind
+            if cards and not cards & (cards - 1):
+                certain |= cards
+        self.deck = deck
+        self.possible = possible
+        self.holds = list(nb.holds)
+        self.certain = certain
+        self.unknown = deck & ~held & ~certain
+        self.envelope_need = 3 - _popcount(certain)
+        self.envelopes = _envelope_table(nb)
+
+        #Per seat: free places in the hand, cards it may still get, clauses still open
+        self.capacity = [nb.sizes[p] - _popcount(nb.holds[p]) for p in range(seats)]
+        self.allowed = [self.unknown & ~nb.lacks[p] for p in range(seats)]
+        self.clauses: List[List[int]] = [[] for _ in range(seats)]
+        for p, mask in nb.clauses:
+            if not mask & nb.holds[p]:
+                self.clauses[p].append(mask & self.allowed[p])
+
+        self.cards = [c for c in range(N_CARDS) if self.unknown >> c & 1]
+        self.consistent = (
+            sum(self.capacity) == len(self.cards) - self.envelope_need
+            and all(c >= 0 for c in self.capacity)
+        )
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _envelope_table(nb) -> np.ndarray:
+    #(324,) bool, by flat hypothesis index: the envelopes the notebook still allows.
+    #A JointNotebook has the table; otherwise candidates of each kind minus wrong accusations.
+    if hasattr(nb, "joint"):
+        return nb.hypotheses.ravel()
+    table = np.zeros((N_S, N_W, N_R), dtype=bool)
+    s = [i for i in range(N_S) if nb.possible >> i & 1]
+    w = [i for i in range(N_W) if nb.possible >> (WEAPON_BASE + i) & 1]
+    r = [i for i in range(N_R) if nb.possible >> (ROOM_BASE + i) & 1]
+    table[np.ix_(s, w, r)] = True
+    table = table.ravel()
+    for mask in getattr(nb, "wrong", ()):
+        valid, index = _envelope_index(np.array([mask], dtype=np.int64))
+        if valid[0]:
+            table[index[0]] = False
+    return table
+
+
+def _card_table(cards: List[int]) -> np.ndarray:
+    return np.array([1 << c for c in cards], dtype=np.int64)
+
+
+def _envelope_index(env: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    #Full envelopes (21-bit masks) -> (valid, flat index into the 6 x 6 x 9 hypotheses)
+    index = np.zeros(len(env), dtype=np.int64)
+    valid = np.ones(len(env), dtype=bool)
+    for base, size, stride in ((0, N_S, N_W * N_R), (WEAPON_BASE, N_W, N_R), (ROOM_BASE, N_R, 1)):
+        part = (env >> base) & ((1 << size) - 1)
+        valid &= (part != 0) & ((part & (part - 1)) == 0)
+        index += np.log2(np.maximum(part, 1)).astype(np.int64) * stride
+    return valid, index
+
+
+def _valid_envelopes(problem: _Problem, env: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    valid, index = _envelope_index(env)
+    valid &= problem.envelopes[index]
+    return valid, index
+
+
+# ------------- exact count -------------
+def _hands(problem: _Problem, p: int, bit_of) -> np.ndarray:
+    #Every hand seat p can still be dealt (as masks over the unknown cards)
+    allowed = [c for c in problem.cards if problem.allowed[p] >> c & 1]
+    hands = []
+    for combo in combinations(allowed, problem.capacity[p]):
+        mask = 0
+        for c in combo:
+            mask |= 1 << c
+        if all(mask & clause for clause in problem.clauses[p]):
+            hands.append(sum(bit_of[c] for c in combo))
+    return np.array(hands, dtype=np.int64)
+
+
+def _exact_cost(problem: _Problem) -> float:
+    #Elements touched by the three passes, with the states per level bounded both by the
+    #binomial and by the product of the hand counts so far
+    u = len(problem.cards)
+    ops = 0.0
+    states = 1.0
+    placed = 0
+    for p in sorted(range(len(problem.names)), key=lambda p: comb(_popcount(problem.allowed[p]), problem.capacity[p])):
+        n_hands = comb(_popcount(problem.allowed[p]), problem.capacity[p])
+        ops += 3.0 * n_hands * states
+        placed += problem.capacity[p]
+        states = min(states * n_hands, comb(u, placed))
+    return ops
+
+
+def _exact(problem: _Problem):
+    u = len(problem.cards)
+    bit_of = {c: 1 << j for j, c in enumerate(problem.cards)}
+    seats = [p for p in range(len(problem.names)) if problem.capacity[p] > 0]
+    hands = {p: _hands(problem, p, bit_of) for p in seats}
+    #Fewest hands first keeps the number of states small
+    seats.sort(key=lambda p: len(hands[p]))
+    if any(len(hands[p]) == 0 for p in seats):
+        return None
+
+    #Forward: f[k][placed] = ways to deal the first k seats' hands
+    size = 1 << u
+    forward = [np.zeros(size)]
+    forward[0][0] = 1.0
+    for p in seats:
+        f, g = forward[-1], np.zeros(size)
+        states = np.flatnonzero(f)
+        for hand in hands[p]:
+            free = states[(states & hand) == 0]
+            g[free | hand] += f[free]
+        forward.append(g)
+
+    #The cards left over go in the envelope
+    final = np.flatnonzero(forward[-1])
+    env = np.full(len(final), problem.certain, dtype=np.int64)
+    table = _card_table(problem.cards)
+    for j in range(u):
+        env |= np.where((final >> j) & 1, 0, table[j])
+    valid, index = _valid_envelopes(problem, env)
+    final, index = final[valid], index[valid]
+    counts = np.bincount(index, weights=forward[-1][final], minlength=N_S * N_W * N_R)
+    total = counts.sum()
+    if total == 0:
+        return None
+
+    #Backward: b[placed] = ways to finish the deal from here (with a valid envelope)
+    owner = np.zeros((N_CARDS, len(problem.names) + 1))
+    b = np.zeros(size)
+    b[final] = 1.0
+    for k in range(len(seats) - 1, -1, -1):
+        p, f = seats[k], forward[k]
+        states = np.flatnonzero(f)
+        prev = np.zeros(size)
+        weights = np.zeros(len(hands[p]))
+        for i, hand in enumerate(hands[p]):
+            free = states[(states & hand) == 0]
+            after = b[free | hand]
+            prev[free] += after
+            weights[i] = np.dot(f[free], after)
+        for j, c in enumerate(problem.cards):
+            owner[c, p] = weights[((hands[p] >> j) & 1) == 1].sum() / total
+        b = prev
+    return counts / total, owner, float(total)
+
+
+# ------------- sampling -------------
+def _sampled(problem: _Problem, rng: np.random.Generator, budget: Optional[float], max_samples: int, start: float):
+    cards = np.array(problem.cards, dtype=np.int64)
+    table = _card_table(problem.cards)
+    u = len(cards)
+    seats = [p for p in range(len(problem.names)) if problem.capacity[p] > 0]
+    bounds = np.cumsum([0] + [problem.capacity[p] for p in seats])
+
+    #Envelope candidates per kind, as positions in `cards` (-1 = already certain)
+    candidates = []
+    for kind in _KINDS:
+        if problem.certain & kind:
+            continue
+        candidates.append(np.array([j for j, c in enumerate(problem.cards) if (problem.possible & kind) >> c & 1]))
+    if any(len(c) == 0 for c in candidates):
+        return None
+
+    counts = np.zeros(N_S * N_W * N_R)
+    owner = np.zeros((N_CARDS, len(problem.names) + 1))
+    kept = 0
+    drawn = 0
+    while kept < max_samples:
+        if budget is not None and drawn and time.perf_counter() - start > budget:
+            break
+        if budget is None and drawn >= MAX_DRAW_FACTOR * max_samples:
+            break
+        n = SAMPLE_BATCH
+        drawn += n
+        keys = rng.random((n, u))
+        env = np.full(n, problem.certain, dtype=np.int64)
+        rows = np.arange(n)
+        for cand in candidates:
+            pick = cand[rng.integers(0, len(cand), n)]
+            keys[rows, pick] = 2.0
+            env |= table[pick]
+        order = np.argsort(keys, axis=1)
+
+        ok = np.ones(n, dtype=bool)
+        dealt = []
+        for i, p in enumerate(seats):
+            hand = np.bitwise_or.reduce(table[order[:, bounds[i]:bounds[i + 1]]], axis=1)
+            ok &= (hand & ~(problem.allowed[p])) == 0
+            for clause in problem.clauses[p]:
+                ok &= (hand & clause) != 0
+            dealt.append(hand)
+        valid, index = _valid_envelopes(problem, env)
+        ok &= valid
+        if not ok.any():
+            continue
+
+        kept += int(ok.sum())
+        counts += np.bincount(index[ok], minlength=N_S * N_W * N_R)
+        for i, p in enumerate(seats):
+            owner[cards, p] += ((dealt[i][ok, None] & table) != 0).sum(axis=0)
+
+    if kept == 0:
+        return None
+    return counts / kept, owner / kept, float(kept)
+
+
+# ------------- entry point -------------
+def exact_posterior(nb, max_seconds: float) -> Optional[Posterior]:
+    #The exact posterior if the count is estimated to take at most max_seconds, otherwise None.
+    #Uses no clock or randomness, so it is safe inside a seeded game.
+    start = time.perf_counter()
+    if not getattr(nb, "names", ()):
+        return None
+    problem = _Problem(nb)
+    if not problem.consistent or len(problem.cards) > EXACT_MAX_UNKNOWN:
+        return None
+    if _exact_cost(problem) * EXACT_SECONDS_PER_OP > max_seconds:
+        return None
+    result = _exact(problem)
+    if result is None:
+        return None
+    return _assemble(nb, problem, result, True, start)
+
+
+def posterior(nb, budget: Optional[float] = DEFAULT_BUDGET, max_samples: int = DEFAULT_MAX_SAMPLES,
+              rng: Optional[np.random.Generator] = None, exact: Optional[bool] = None) -> Posterior:
+    #nb: a DeductionNotebook. budget: seconds (None = no clock, only max_samples; reproducible).
+    #exact: force (True) or forbid (False) the exact count; None decides from its cost.
+    start = time.perf_counter()
+    rng = rng if rng is not None else np.random.default_rng()
+    problem = _Problem(nb) if getattr(nb, "names", ()) else None
+
+    result = None
+    used_exact = False
+    if problem is not None and problem.consistent:
+        if exact is None:
+            limit = DEFAULT_BUDGET if budget is None else budget
+            cheap = _exact_cost(problem) * EXACT_SECONDS_PER_OP <= limit
+            exact = len(problem.cards) <= EXACT_MAX_UNKNOWN and cheap
+        if exact:
+            result = _exact(problem)
+            used_exact = result is not None
+        if result is None:
+            result = _sampled(problem, rng, budget, max_samples, start)
+    return _assemble(nb, problem, result, used_exact, start)
+
+
+def _assemble(nb, problem: Optional[_Problem], result, used_exact: bool, start: float) -> Posterior:
+    if result is None:
+        #No table yet (or nothing consistent found): every envelope still allowed counts the same
+        hyp = _envelope_table(nb).reshape(N_S, N_W, N_R).astype(float)
+        hyp /= max(hyp.sum(), 1.0)
+        owner = np.zeros((N_CARDS, len(getattr(nb, "names", ())) + 1))
+        names = tuple(getattr(nb, "names", ()))
+        deals = 0.0
+    else:
+        hyp, owner, deals = result
+        hyp = hyp.reshape(N_S, N_W, N_R)
+        names = problem.names
+        #Cards whose holder is known for sure
+        for p, mask in enumerate(problem.holds):
+            for c in range(N_CARDS):
+                if mask >> c & 1:
+                    owner[c, p] = 1.0
+
+    #The envelope column from the hypotheses (exact for both methods' own estimates)
+    owner[:N_S, -1] = hyp.sum(axis=(1, 2))
+    owner[WEAPON_BASE:ROOM_BASE, -1] = hyp.sum(axis=(0, 2))
+    owner[ROOM_BASE:, -1] = hyp.sum(axis=(0, 1))
+    return Posterior(hyp, names, owner, used_exact, deals, time.perf_counter() - start)
@@ -0,0 +1,149 @@
+# ai/travel.py
+
+#Expected number of turns to get into each room from any tile.
+#Raw hallway distance is a poor measure of how far a room is: movement happens in 1d6 chunks,
+#you may stop early when you reach a room, and a secret passage gets you across the board in one turn.
+#So for each room I precompute E[turns] with a small dynamic program over the dice distribution
+#(same uniform 1..6 as roll_dice in mechanics/movement.py) and store it in one flat float array per board.
+
+from __future__ import annotations
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from board.rooms import SECRET_PASSAGES
+from board.topology import BoardTopology, get_topology, DOOR, ROOM, SECRET
+
+DICE_FACES = (1, 2, 3, 4, 5, 6)
+UNREACHABLE = float("inf")
+
+
+def expected_turns_by_distance(max_distance: int) -> List[float]:
+    #E[n] = expected turns to cover n steps when each turn moves up to one die roll
+    #and reaching the room ends the movement (so overshooting is fine).
+    #E[0] = 0, E[n] = 1 + mean over rolls of E[max(n - roll, 0)]
+    p = 1.0 / len(DICE_FACES)
+    table = [0.0] * (max_distance + 1)
+    for n in range(1, max_distance + 1):
+        table[n] = 1.0 + p * sum(table[max(n - roll, 0)] for roll in DICE_FACES)
+    return table
+
+
+class TravelTable:
+    def __init__(self, topo: BoardTopology):
+        self.topo = topo
+        self.rows = topo.rows
+        self.cols = topo.cols
+        self.room_ids = sorted(topo.room_doors)
+        self._room_index = {rid: i for i, rid in enumerate(self.room_ids)}
+
+        #Longest possible route is bounded by the number of tiles
+        self.turns_by_distance = expected_turns_by_distance(self.rows * self.cols)
+
+        self._inside = {rid: self._inside_distances(rid) for rid in self.room_ids}
+        steps = {rid: self._steps_to_enter(rid) for rid in self.room_ids}
+
+        #_turns: best of walking in and taking the secret passage; _direct: walking in only
+        cells = self.rows * self.cols
+        self._turns = array("f", [UNREACHABLE]) * (len(self.room_ids) * cells)
+        self._direct = array("f", [UNREACHABLE]) * (len(self.room_ids) * cells)
+        for i, rid in enumerate(self.room_ids):
+            base = i * cells
+            via = SECRET_PASSAGES.get(rid)
+            for idx in range(cells):
+                n = steps[rid][idx]
+                best = self.turns_by_distance[n] if n is not None else UNREACHABLE
+                self._direct[base + idx] = best
+
+                #Go to the room at the other end of the secret passage first, then take it (1 turn)
+                if via is not None and via in steps:
+                    m = steps[via][idx]
+                    if m is not None:
+                        best = min(best, self.turns_by_distance[m] + 1.0)
+
+                self._turns[base + idx] = best
+
+    def _steps_to_enter(self, room_id: int) -> List:
+        #Steps needed to end up inside room_id, for every tile (flat list, None = unreachable).
+        #Hallway tiles: distance to the nearest door + 1 step into the room.
+        #Tiles inside another room: walk to one of its doors first.
+        topo = self.topo
+        field = topo.room_field(room_id)
+        steps: List = [None] * (self.rows * self.cols)
+
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if topo.room_id[r][c] == room_id or topo.secret_tiles.get((r, c)) == room_id:
+                    steps[r * self.cols + c] = 0
+                elif field[r][c] is not None:
+                    steps[r * self.cols + c] = field[r][c] + 1
+
+        for other, inside in self._inside.items():
+            if other == room_id:
+                continue
+            for (r, c), to_door in inside.items():
+                best = None
+                for door, d in to_door:
+                    fd = field[door[0]][door[1]]
+                    if fd is not None and (best is None or d + fd + 1 < best):
+                        best = d + fd + 1
+                steps[r * self.cols + c] = best
+
+        return steps
+
+    def _inside_distances(self, room_id: int) -> Dict[Tuple[int, int], Tuple[Tuple[Tuple[int, int], int], ...]]:
+        #For every tile of the room (and its secret passage tile): steps to each of its doors,
+        #walking over room tiles only.
+        topo = self.topo
+        result: Dict[Tuple[int, int], List[Tuple[Tuple[int, int], int]]] = {}
+        for door in topo.room_doors.get(room_id, ()):
+            dist = {door: 0}
+            q = deque([door])
+            while q:
+                pos = q.popleft()
+                for _, nxt in topo.neighbours[pos]:
+                    if nxt in dist or topo.kind_at(nxt) not in (ROOM, SECRET):
+                        continue
+                    dist[nxt] = dist[pos] + 1
+                    q.append(nxt)
+            for pos, d in dist.items():
+                if topo.kind_at(pos) != DOOR:
+                    result.setdefault(pos, []).append((door, d))
+        return {pos: tuple(v) for pos, v in result.items()}
+
+    # ------------- lookups -------------
+    def expected_turns(self, room_id: int, pos: Tuple[int, int], passages: bool = True) -> float:
+        #Expected turns for a player standing on pos to get into room_id
+        #(passages=False: walking in through one of its doors only)
+        i = self._room_index.get(room_id)
+        if i is None:
+            return UNREACHABLE
+        r, c = pos
+        table = self._turns if passages else self._direct
+        return table[i * self.rows * self.cols + r * self.cols + c]
+
+    def entry_room(self, room_id: int, pos: Tuple[int, int]) -> int:
+        #The room to walk into on the quickest way to room_id: room_id itself, or the room at
+        #the other end of its secret passage
+        if self.expected_turns(room_id, pos) < self.expected_turns(room_id, pos, passages=False):
+            return SECRET_PASSAGES[room_id]
+        return room_id
+
+    def expected_turns_for_steps(self, steps: int) -> float:
+        #Same dice model for a plain step count (e.g. hallway distance to a door + 1)
+        if steps < 0:
+            return 0.0
+        if steps >= len(self.turns_by_distance):
+            return UNREACHABLE
+        return self.turns_by_distance[steps]
+
+
+#One table per board layout (topologies are shared per layout already)
+@lru_cache(maxsize=None)
+def get_travel_table_for_topology(topo: BoardTopology) -> TravelTable:
+    return TravelTable(topo)
+
+
+def get_travel_table(base_board) -> TravelTable:
+    return get_travel_table_for_topology(get_topology(base_board))
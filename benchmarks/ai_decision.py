@@ -0,0 +1,147 @@
+# benchmarks/ai_decision.py
+
+#Per-decision latency of the AI movement choice.
+#"before" replays what choose_move_command used to do on every step (scan the grid for
+#doors, fresh BFS from the player, walk the path back); "after" is the current
+#controller using the cached distance fields from board/topology.py.
+#The per-turn numbers compare one choose_move_command call per pip with a single
+#plan_move call for the whole roll.
+#
+#Run from the project root:  python -m benchmarks.ai_decision [--decisions N]
+
+from __future__ import annotations
+import argparse
+import random
+import time
+from collections import deque
+
+from board.grid import get_board
+from board.rooms import get_room_name
+from board.topology import get_topology
+from entities.player import Player
+from ai.ai_player import AIPlayerController, DIR_VECTORS
+from ai.knowledge import ClueNotebook
+
+
+def _legacy_decision(base_board, nb: ClueNotebook, start):
+    #The pre-topology work done for a single step: door scan + BFS + path reconstruction
+    rows = len(base_board)
+    cols = len(base_board[0])
+
+    door_map = {}
+    for r in range(rows):
+        for c in range(cols):
+            if base_board[r][c] != "X":
+                continue
+            for dr, dc in DIR_VECTORS.values():
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and base_board[nr][nc] in "123456789":
+                    door_map[(r, c)] = int(base_board[nr][nc])
+                    break
+
+    dist = [[None for _ in range(cols)] for _ in range(rows)]
+    prev = [[None for _ in range(cols)] for _ in range(rows)]
+    sr, sc = start
+    dist[sr][sc] = 0
+    q = deque([(sr, sc)])
+    while q:
+        r, c = q.popleft()
+        for dr, dc in DIR_VECTORS.values():
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols):
+                continue
+            if base_board[nr][nc] not in (".", "X") or dist[nr][nc] is not None:
+                continue
+            dist[nr][nc] = dist[r][c] + 1
+            prev[nr][nc] = (r, c)
+            q.append((nr, nc))
+
+    best_utility = -float("inf")
+    best_door = None
+    for (r, c), room_id in door_map.items():
+        d = dist[r][c]
+        if not d:
+            continue
+        utility = nb.score_room(get_room_name(room_id)) - 0.5 * d
+        if utility > best_utility:
+            best_utility = utility
+            best_door = (r, c)
+
+    if best_door is None:
+        return None
+    cur = best_door
+    while prev[cur[0]][cur[1]] is not None and prev[cur[0]][cur[1]] != start:
+        cur = prev[cur[0]][cur[1]]
+    return cur
+
+
+def _hallway_positions(base_board):
+    return [
+        (r, c)
+        for r, row in enumerate(base_board)
+        for c, tile in enumerate(row)
+        if tile == "."
+    ]
+
+
+def _time_per_call(fn, positions) -> float:
+    start = time.perf_counter()
+    for pos in positions:
+        fn(pos)
+    return (time.perf_counter() - start) / len(positions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI movement decision latency")
+    parser.add_argument("--decisions", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base_board = get_board()
+    positions = [rng.choice(_hallway_positions(base_board)) for _ in range(args.decisions)]
+
+    player = Player("Bench", "B", positions[0])
+    controller = AIPlayerController(player, ClueNotebook())
+
+    def new_decision(pos):
+        player.position = pos
+        controller.choose_move_command(base_board, [player], 6)
+
+    def old_decision(pos):
+        _legacy_decision(base_board, controller.nb, pos)
+
+    #Cold: first decision on a fresh board pays for building the topology + fields
+    topo_start = time.perf_counter()
+    get_topology(base_board).build_distance_fields()
+    build_time = time.perf_counter() - topo_start
+
+    before = _time_per_call(old_decision, positions)
+    after = _time_per_call(new_decision, positions)
+
+    print(f"decisions           : {args.decisions}")
+    print(f"one-off field build : {build_time * 1e3:8.2f} ms")
+    print(f"before (BFS / step) : {before * 1e6:8.1f} us per decision")
+    print(f"after (field lookup): {after * 1e6:8.1f} us per decision")
+    print(f"speed-up            : {before / after:8.1f}x")
+
+    #Whole turn with a roll of 6: per-pip decisions vs one plan for the roll
+    def per_step_turn(pos):
+        player.position = pos
+        for steps in range(6, 0, -1):
+            controller.choose_move_command(base_board, [player], steps)
+
+    def planned_turn(pos):
+        player.position = pos
+        controller.plan_move(base_board, [player], 6)
+
+    per_step = _time_per_call(per_step_turn, positions)
+    planned = _time_per_call(planned_turn, positions)
+
+    print(f"turn, step by step  : {per_step * 1e6:8.1f} us per roll of 6")
+    print(f"turn, planned once  : {planned * 1e6:8.1f} us per roll of 6")
+    print(f"speed-up            : {per_step / planned:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
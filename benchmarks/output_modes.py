@@ -0,0 +1,50 @@
+# benchmarks/output_modes.py
+
+#Cost of narration: the same seeded all-AI games played with each output mode.
+#Text modes print into a throwaway stream (so the terminal itself is not measured),
+#"silent" never formats anything, "json" writes one small record per event.
+#
+#Run from the project root:  python -m benchmarks.output_modes [--games N]
+
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import time
+
+from game.engine import GameEngine
+from game.output import OUTPUT_MODES, make_output
+
+
+class _Discard(io.TextIOBase):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _play(mode: str, games: int) -> float:
+    sink = _Discard()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        for seed in range(games):
+            engine = GameEngine.new_game(ai_flags=[True] * 6, output=make_output(mode, sink), seed=seed)
+            engine.run_to_completion(max_turns=2000)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="All-AI game speed per output mode")
+    parser.add_argument("--games", type=int, default=30)
+    args = parser.parse_args()
+
+    #One untimed pass fills the topology / reachability caches for these games,
+    #otherwise the first mode measured pays for them
+    _play("silent", args.games)
+
+    print(f"games per mode: {args.games}")
+    for mode in OUTPUT_MODES:
+        elapsed = _play(mode, args.games)
+        print(f"{mode:<8}: {elapsed:7.2f} s  ({args.games / elapsed:7.1f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
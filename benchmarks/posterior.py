@@ -0,0 +1,153 @@
+# benchmarks/posterior.py
+
+#Cost and quality of ai/posterior.py.
+#Plays seeded all-AI games and, every few turns, asks for the posterior of one AI's notebook:
+#  - time of the exact count and of sampling, by how many cards still have an open place
+#  - calibration: grouped by the probability the posterior gives its likeliest triplet, how
+#    often that triplet really is the solution (a calibrated estimate is right about as often
+#    as it claims)
+#Then plays --games games with the AIs accusing on a probable solution (--confidence) and the
+#same seeds without it, and compares game length and wrong accusations.
+#
+#Run from the project root:  python -m benchmarks.posterior [--positions N] [--games N]
+
+from __future__ import annotations
+import argparse
+import statistics
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from ai.posterior import DEFAULT_BUDGET, posterior
+from entities.character import CHARACTERS
+from game.cards import SUSPECTS, WEAPONS, ROOMS, N_CARDS
+from game.engine import GameEngine
+from game.output import NullOutput
+from game.simulate import DEFAULT_MAX_TURNS
+
+SEATS = len(CHARACTERS)
+#Probability bins for the calibration table
+BINS = (0.0, 0.2, 0.4, 0.6, 0.8, 0.9, 0.95, 1.0001)
+#Turns without the watched notebook learning anything after which a game counts as stuck
+#(finished games go at most about 50)
+STALL_TURNS = 100
+
+
+def _positions(count: int, seed: int, every: int):
+    #(notebook, solution) pairs from the games seed, seed + 1, ... every `every` turns.
+    #A position the watched notebook was already in is skipped (the same estimate counted twice
+    #would weigh in the calibration again), and a game whose notebook has learnt nothing for
+    #STALL_TURNS is left: it is stuck and would only play on until DEFAULT_MAX_TURNS.
+    game = seed
+    while True:
+        engine = GameEngine.new_game(ai_flags=[True] * SEATS, output=NullOutput(), seed=game)
+        solution = (engine.solution["suspect"], engine.solution["weapon"], engine.solution["room"])
+        watched = engine.players[game % SEATS]
+        last_key = yielded_key = None
+        learnt = 0
+        while engine.step() and engine.turn_count <= DEFAULT_MAX_TURNS:
+            nb = watched.ai.nb
+            key = nb.knowledge_key()
+            if key != last_key:
+                last_key = key
+                learnt = engine.turn_count
+            elif engine.turn_count - learnt >= STALL_TURNS:
+                break
+            if engine.turn_count % every or watched.is_eliminated or key == yielded_key:
+                continue
+            if nb.current_singleton_hypothesis() is not None:
+                break
+            yielded_key = key
+            yield nb, solution
+            count -= 1
+            if count == 0:
+                return
+        game += 1
+
+
+def bench_estimates(positions: int, seed: int, every: int, budget: float) -> None:
+    rng = np.random.default_rng(seed)
+    timings = defaultdict(lambda: defaultdict(list))     #cards nobody is known to hold -> method -> seconds
+    calibration = defaultdict(lambda: [0, 0, 0.0])        #bin -> [positions, right, sum of p]
+    log_loss = []
+
+    for nb, solution in _positions(positions, seed, every):
+        post = posterior(nb, budget=budget, rng=rng)
+        held = 0
+        for mask in nb.holds:
+            held |= mask
+        open_cards = N_CARDS - bin(held).count("1")
+        timings[open_cards]["exact" if post.exact else "sampled"].append(post.elapsed)
+
+        triplet, p = post.best()
+        for lo, hi in zip(BINS, BINS[1:]):
+            if lo <= p < hi:
+                row = calibration[lo]
+                row[0] += 1
+                row[1] += triplet == solution
+                row[2] += p
+        p_solution = post.hypotheses[SUSPECTS.index(solution[0]), WEAPONS.index(solution[1]),
+                                     ROOMS.index(solution[2])]
+        log_loss.append(-np.log(max(p_solution, 1e-12)))
+
+    print(f"\n=== POSTERIOR: {positions} positions, budget {1000 * budget:.0f} ms ===")
+    print(" open cards | exact: n    median ms   max ms | sampled: n   median ms   max ms")
+    for open_cards in sorted(timings):
+        cells = []
+        for method in ("exact", "sampled"):
+            t = timings[open_cards][method]
+            if t:
+                cells.append(f"{len(t):6d} {1000 * statistics.median(t):11.2f} {1000 * max(t):8.2f}")
+            else:
+                cells.append(f"{'-':>6} {'':11} {'':8}")
+        print(f"{open_cards:11d} | {cells[0]}  | {cells[1]}")
+
+    print("\n likeliest p | positions | mean p | right")
+    for lo, hi in zip(BINS, BINS[1:]):
+        n, right, total_p = calibration[lo]
+        if n:
+            print(f" {lo:4.2f}-{min(hi, 1.0):4.2f}   | {n:9d} | {total_p / n:6.3f} | {right / n:5.3f}")
+    print(f"Mean log loss of the solution: {statistics.fmean(log_loss):.3f} "
+          f"(uniform over 324 triplets: {np.log(324):.3f})")
+
+
+def _play(seed: int, confidence):
+    engine = GameEngine.new_game(ai_flags=[True] * SEATS, output=NullOutput(), seed=seed)
+    for p in engine.players:
+        p.ai.confidence = confidence
+    engine.run_to_completion(max_turns=DEFAULT_MAX_TURNS)
+    eliminated = sum(1 for p in engine.players if p.is_eliminated)
+    return engine.turn_count, eliminated, engine.finished
+
+
+def bench_games(games: int, seed: int, confidence: float) -> None:
+    print(f"\n=== GAMES: {games} seeds, accusing on p >= {confidence} vs certainty only ===")
+    for label, value in (("certainty only", None), (f"confidence {confidence}", confidence)):
+        start = time.perf_counter()
+        results = [_play(seed + i, value) for i in range(games)]
+        elapsed = time.perf_counter() - start
+        turns = sorted(t for t, _, finished in results if finished)
+        wrong = sum(e for _, e, _ in results)
+        print(f"{label:>16}: median {statistics.median(turns):5.0f} turns | "
+              f"p90 {turns[int(0.9 * (len(turns) - 1))]:4d} | wrong accusations {wrong:4d} | "
+              f"capped {sum(1 for *_, finished in results if not finished):3d} | {games / elapsed:6.1f} games/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Posterior estimation: time, calibration, games")
+    parser.add_argument("--positions", type=int, default=300)
+    parser.add_argument("--every", type=int, default=6, help="turns between two positions of a game")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds per estimate")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bench_estimates(args.positions, args.seed, args.every, args.budget)
+    if args.games:
+        bench_games(args.games, args.seed, args.confidence)
+
+
+if __name__ == "__main__":
+    main()
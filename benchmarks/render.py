@@ -0,0 +1,83 @@
+# benchmarks/render.py
+
+#Board image build time: the old per-tile Python double loop vs the palette lookup
+#in board/renderer.py, plus a full off-screen frame (image + token labels) with the Agg backend.
+#
+#Run from the project root:  python -m benchmarks.render [--frames N]
+
+from __future__ import annotations
+import argparse
+import os
+import time
+
+#Off-screen on purpose, even when a display is available
+os.environ["MPLBACKEND"] = "Agg"
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from board.grid import get_board_array, decode_board, overlay_players_on_board
+from board.renderer import (
+    COLORMAP, HALLLIGHT, HALLDARK, PLAYERTOKENS, board_image, token_cells,
+)
+from game.setup import create_players
+
+
+def _legacy_image(board):
+    board = decode_board(board)
+    rows = len(board)
+    cols = len(board[0])
+    img = np.zeros((rows, cols, 3))
+    for r in range(rows):
+        for c in range(cols):
+            tile = board[r][c]
+            if tile == '.':
+                img[r, c] = HALLLIGHT if (r + c) % 2 == 0 else HALLDARK
+            elif tile in PLAYERTOKENS:
+                img[r, c] = (0.2, 0.2, 0.2)
+            else:
+                img[r, c] = COLORMAP.get(tile, (1.0, 1.0, 1.0))
+    return img
+
+
+def _per_frame(fn, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return (time.perf_counter() - start) / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Board rendering cost per frame")
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    board = overlay_players_on_board(get_board_array(), create_players())
+    assert np.allclose(_legacy_image(board), board_image(board))
+
+    before = _per_frame(lambda: _legacy_image(board), args.frames)
+    after = _per_frame(lambda: board_image(board), args.frames)
+
+    fig, ax = plt.subplots()
+    artist = ax.imshow(board_image(board), interpolation='nearest')
+
+    def full_frame():
+        artist.set_data(board_image(board))
+        for t in list(ax.texts):
+            t.remove()
+        for r, c, token in token_cells(board):
+            ax.text(c, r, token, ha='center', va='center', color='white')
+        fig.canvas.draw()
+
+    frame = _per_frame(full_frame, max(1, args.frames // 10))
+    plt.close(fig)
+
+    print(f"frames              : {args.frames}")
+    print(f"image, per-tile loop: {before * 1e3:8.3f} ms per frame")
+    print(f"image, palette      : {after * 1e3:8.3f} ms per frame")
+    print(f"speed-up            : {before / after:8.1f}x")
+    print(f"full Agg frame      : {frame * 1e3:8.3f} ms per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/server_load.py
+
+#Load generator for game/server.py.
+#Starts a server in this process (or uses a running one with --port / --unix), opens
+#--tables tables at once, each with --humans bot-controlled human seats (game/client.py's
+#auto_answer, one connection per seat) and AIs in the other seats, and plays them all to
+#the end. Reports tables and prompts per second, and how late the server's event loop
+#ran while all of that was going on (a blocked loop would show up there first).
+#
+#Run from the project root:  python -m benchmarks.server_load [--tables N] [--humans N]
+
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+from typing import List, Optional
+
+from game.client import Connection, auto_answer
+from game.server import AI, HUMAN, GameServer
+
+#How often the loop-lag probe wakes up
+PROBE_INTERVAL = 0.01
+
+
+async def _bot(conn: Connection, table: int, seat: int, rng: random.Random) -> int:
+    #Take the seat and answer every prompt until the game is over; returns the prompt count
+    await conn.send({"op": "join", "table": table, "seat": seat})
+    await conn.expect("joined")
+    prompts = 0
+    while True:
+        message = await conn.receive()
+        if message is None:
+            return prompts
+        if message["op"] == "prompt":
+            prompts += 1
+            await conn.send({"op": "answer", "table": table, "id": message["id"],
+                             "value": auto_answer(message, rng)})
+        elif message["op"] == "over":
+            return prompts
+
+
+async def _table(n: int, humans: int, connect, results: Counter, seed: int) -> None:
+    rng = random.Random(seed + n)
+    seats = [HUMAN] * humans + [AI] * (6 - humans)
+    conns = [await connect() for _ in range(max(1, humans))]
+    try:
+        for conn in conns:
+            await conn.expect("hello")
+        await conns[0].send({"op": "create", "seats": seats, "seed": seed + n, "move_timeout": 60,
+                             "watch": not humans})
+        table = (await conns[0].expect("created"))["table"]
+
+        if humans:
+            prompts = await asyncio.gather(*(_bot(conn, table, seat, rng) for seat, conn in enumerate(conns)))
+            results["prompts"] += sum(prompts)
+        else:
+            await conns[0].expect("over")
+        results["tables"] += 1
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def run(tables: int, humans: int, seed: int, port: Optional[int], unix: Optional[str]) -> None:
+    server = None
+    if port is None and unix is None:
+        server = GameServer(max_tables=tables)
+        listener = await server.start_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    async def connect() -> Connection:
+        return await Connection.open(port=port, unix=unix)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    results: Counter = Counter()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_table(n, humans, connect, results, seed) for n in range(tables)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    if server is not None:
+        await server.close()
+
+    lags.sort()
+    print(f"\n=== SERVER LOAD: {tables} tables at once, {humans} bot seat(s) each ===")
+    print(f"Time      : {elapsed:.2f} s")
+    print(f"Tables    : {results['tables']} finished ({results['tables'] / elapsed:.1f} per second)")
+    print(f"Prompts   : {results['prompts']} answered ({results['prompts'] / elapsed:,.0f} per second)")
+    if lags:
+        print(f"Loop lag  : median {1000 * statistics.median(lags):.2f} ms | "
+              f"p99 {1000 * lags[int(0.99 * (len(lags) - 1))]:.2f} ms | max {1000 * lags[-1]:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for the Cluedo server")
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--humans", type=int, default=1, choices=range(0, 7),
+                        help="bot-controlled human seats per table")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=None, help="use a running server instead of starting one")
+    parser.add_argument("--unix", metavar="PATH", default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.tables, args.humans, args.seed, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/startup.py
+
+#CLI startup cost: how long `import main` takes before the first prompt can appear,
+#measured with `python -X importtime` in fresh interpreters.
+#Also checks that the visualisation stack (matplotlib) is NOT imported at startup;
+#it should only load when the visual map is first opened.
+#
+#Run from the project root:  python -m benchmarks.startup [--runs N] [--budget-ms MS]
+
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("matplotlib", "matplotlib.pyplot", "tkinter", "PIL")
+
+
+def _import_profile() -> Tuple[Dict[str, int], List[str]]:
+    #{module: cumulative microseconds}, in import order
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    order: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum_us, name = line.split("|", 2)
+        module = name.strip()
+        cumulative[module] = int(cum_us.strip())
+        order.append(module)
+    return cumulative, order
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI import-time profile")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="exit with status 1 if the median import of main exceeds this")
+    args = parser.parse_args()
+
+    totals = []
+    profile: Dict[str, int] = {}
+    for _ in range(args.runs):
+        profile, _ = _import_profile()
+        totals.append(profile.get("main", 0) / 1000.0)
+
+    median = statistics.median(totals)
+    print(f"import main (median of {args.runs}): {median:8.1f} ms")
+
+    #Top-level packages by cumulative time (last run)
+    top_level = {m: us for m, us in profile.items() if "." not in m and m != "main"}
+    print("\nslowest top-level imports:")
+    for module, us in sorted(top_level.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {module:<24} {us / 1000.0:8.1f} ms")
+
+    heavy = [m for m in HEAVY_MODULES if m in profile]
+    print(f"\nvisualisation stack loaded at startup: {'YES ' + str(heavy) if heavy else 'no'}")
+
+    failed = bool(heavy)
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"over budget: {median:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
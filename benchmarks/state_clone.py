@@ -0,0 +1,49 @@
+# benchmarks/state_clone.py
+
+#Cost of copying a game: copy.deepcopy of the live objects (players with their AI and
+#notebook, board, solution) vs GameState (game/state.py): capturing it from the engine,
+#deriving a state with one player changed, and the stable hash.
+#
+#Run from the project root:  python -m benchmarks.state_clone [--copies N]
+
+from __future__ import annotations
+import argparse
+import copy
+import time
+
+from game.engine import GameEngine
+from game.output import NullOutput
+
+
+def _rate(fn, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Game state copy cost")
+    parser.add_argument("--copies", type=int, default=5000)
+    args = parser.parse_args()
+    n = args.copies
+
+    #A game some way in, so the notebooks have something in them
+    engine = GameEngine.new_game(ai_flags=[True] * 6, output=NullOutput(), seed=11)
+    for _ in range(40):
+        engine.step()
+    state = engine.snapshot()
+
+    deep = _rate(lambda i: copy.deepcopy((engine.players, engine.base_board, engine.solution)), max(1, n // 20))
+    capture = _rate(lambda i: engine.snapshot(), n)
+    derive = _rate(lambda i: state.with_player(i % 6, position=(9, 12), in_room=None), n)
+    hashed = _rate(lambda i: state.stable_hash(), n)
+
+    print(f"deepcopy of live objects : {deep:12,.0f} per second")
+    print(f"GameState capture        : {capture:12,.0f} per second")
+    print(f"GameState.with_player    : {derive:12,.0f} per second")
+    print(f"GameState.stable_hash    : {hashed:12,.0f} per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,24 @@
+import numpy as np
+
+
+#Compact board representation: one uint8 tile code per cell instead of a list of 1-char strings.
+#A 28x28 board is 784 bytes, and copying it (e.g. to draw player tokens on top) is a single memcpy.
+#The code of a tile is its index in TILE_CHARS.
+TILE_CHARS = "#.X123456789%&Q"
+#Player tokens (see entities/character.py) get codes too so a board with tokens drawn on it
+#can be stored the same way.
+TOKEN_CHARS = "SMWGPL"
+CODE_CHARS = TILE_CHARS + TOKEN_CHARS
+TILE_CODES = {ch: code for code, ch in enumerate(CODE_CHARS)}
+
+#Byte value of a character -> tile code (255 = not a tile)
+_ENCODE_LUT = np.full(256, 255, dtype=np.uint8)
+for _ch, _code in TILE_CODES.items():
+    _ENCODE_LUT[ord(_ch)] = _code
+#Tile code -> byte value of its character
+_DECODE_LUT = np.frombuffer(CODE_CHARS.encode("ascii"), dtype=np.uint8)
+
+
 def get_board():
     board = [
         list("############################"),
@@ -32,7 +53,69 @@ def get_board():
     return board
 
 
+def encode_board(board) -> np.ndarray:
+    #List of lists of characters -> (rows, cols) uint8 array of tile codes
+    if isinstance(board, np.ndarray):
+        return board
+    rows = len(board)
+    cols = len(board[0])
+    raw = np.frombuffer("".join("".join(row) for row in board).encode("ascii"), dtype=np.uint8)
+    codes = _ENCODE_LUT[raw].reshape(rows, cols)
+    if (codes == 255).any():
+        bad = sorted({chr(b) for b in raw[codes.ravel() == 255]})
+        raise ValueError(f"Unknown board tiles: {bad}")
+    return codes
+
+
+def decode_board(codes) -> list:
+    #uint8 tile codes -> list of lists of characters (the get_board() format)
+    if not isinstance(codes, np.ndarray):
+        return codes
+    return [list(row) for row in board_rows(codes)]
+
+
+def board_rows(board) -> list:
+    #One string per row, whatever the representation
+    if isinstance(board, np.ndarray):
+        cols = board.shape[1]
+        text = _DECODE_LUT[board].tobytes().decode("ascii")
+        return [text[i:i + cols] for i in range(0, len(text), cols)]
+    return ["".join(row) for row in board]
+
+
+def get_board_array() -> np.ndarray:
+    return encode_board(get_board())
+
+
+def overlay_players_on_board(base_board, players):
+    #Returning a copy of the board with player tokens drawn on top
+    from entities.occupancy import occupancy_for
+
+    if isinstance(base_board, np.ndarray):
+        board = base_board.copy()
+        rows, cols = board.shape
+        index = occupancy_for(players)
+        if index is not None:
+            tokens = index.tokens_by_position().items()
+        else:
+            tokens = [(p.position, p.token) for p in players]
+        for (r, c), token in tokens:
+            if 0 <= r < rows and 0 <= c < cols:
+                board[r, c] = TILE_CODES[token]
+        return board
+
+    board = [row[:] for row in base_board]
+    for p in players:
+        r, c = p.position
+        if 0 <= r < len(board) and 0 <= c < len(board[0]):
+            board[r][c] = p.token
+    return board
+
+
+def format_board(board) -> str:
+    return "\n".join(" ".join(row) for row in board_rows(board))
+
+
 def print_board(board):
-    for row in board:
-        print(" ".join(row))
+    print(format_board(board))
 
@@ -0,0 +1,73 @@
+# board/live_view.py
+
+#Persistent, non-blocking board window for spectating a game.
+#visualize_board builds a brand new figure and blocks until the window is closed.
+#Here the figure, the AxesImage and one text artist per player token are created once,
+#and every update only swaps the image data and moves the token labels, then asks
+#matplotlib for a redraw without blocking the game loop.
+
+from __future__ import annotations
+from typing import Dict
+
+#board.renderer picks the backend, so it has to come before pyplot
+from board.renderer import board_image, board_legend_patches, token_cells
+from board.grid import TOKEN_CHARS
+
+import matplotlib.pyplot as plt
+
+
+class LiveBoardView:
+    def __init__(self, board):
+        plt.ion()
+        self.fig, ax = plt.subplots(1, 2, figsize=(12, 8), gridspec_kw={'width_ratios': [4, 1]})
+        self.ax = ax[0]
+
+        self.image = self.ax.imshow(board_image(board), interpolation='nearest')
+        self.ax.set_title("Cluedo Board (live)", fontsize=16)
+        self.ax.axis('off')
+
+        #One label per token letter, reused for the whole game
+        self.labels: Dict[str, object] = {}
+        for token in TOKEN_CHARS:
+            self.labels[token] = self.ax.text(
+                0, 0, token,
+                ha='center', va='center',
+                color='white', fontsize=12, fontweight='bold',
+                visible=False,
+            )
+
+        ax[1].legend(handles=board_legend_patches(), loc='center left', fontsize=10)
+        ax[1].axis('off')
+
+        plt.tight_layout()
+        plt.show(block=False)
+        self.update(board)
+
+    def is_open(self) -> bool:
+        return plt.fignum_exists(self.fig.number)
+
+    def update(self, board) -> None:
+        #Redraw in place: new image data + moved token labels, no new artists
+        if not self.is_open():
+            return
+
+        self.image.set_data(board_image(board))
+
+        shown = set()
+        for r, c, token in token_cells(board):
+            label = self.labels.get(token)
+            if label is None:
+                continue
+            label.set_position((c, r))
+            label.set_visible(True)
+            shown.add(token)
+        for token, label in self.labels.items():
+            if token not in shown:
+                label.set_visible(False)
+
+        self.fig.canvas.draw_idle()
+        self.fig.canvas.flush_events()
+
+    def close(self) -> None:
+        if self.is_open():
+            plt.close(self.fig)
@@ -0,0 +1,61 @@
+# board/mpl_backend.py
+
+#Picks the Matplotlib backend the first time the visual map is needed.
+#The game used to force TkAgg at import time, which is slow and crashes on hosts without a display.
+#Now: an explicit MPLBACKEND wins, otherwise TkAgg when there is a display,
+#and the off-screen Agg backend when there isn't (or Tk is missing or cannot open a window).
+
+import os
+import sys
+
+import matplotlib
+
+INTERACTIVE_BACKEND = "TkAgg"
+HEADLESS_BACKEND = "Agg"
+
+_selected = None
+
+
+def has_display() -> bool:
+    if sys.platform.startswith("win") or sys.platform == "darwin":
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def has_tk() -> bool:
+    #matplotlib.use() only records the name until pyplot is imported, so it never fails here:
+    #check that Tk imports and can open a window on this display before choosing TkAgg
+    try:
+        import tkinter
+    except ImportError:
+        return False
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return False
+    root.destroy()
+    return True
+
+
+def ensure_backend() -> str:
+    #Call before the first `import matplotlib.pyplot`
+    global _selected
+    if _selected is not None:
+        return _selected
+
+    if os.environ.get("MPLBACKEND"):
+        _selected = matplotlib.get_backend()
+        return _selected
+
+    if has_display() and has_tk():
+        matplotlib.use(INTERACTIVE_BACKEND)
+        _selected = INTERACTIVE_BACKEND
+        return _selected
+
+    matplotlib.use(HEADLESS_BACKEND)
+    _selected = HEADLESS_BACKEND
+    return _selected
+
+
+def is_interactive() -> bool:
+    return ensure_backend().lower() != HEADLESS_BACKEND.lower()
@@ -1,11 +1,13 @@
-import matplotlib
-matplotlib.use("TkAgg")
-
+#Backend is chosen on first use (TkAgg with a display, Agg without one)
+from board.mpl_backend import ensure_backend
+ensure_backend()
 
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import Patch
 
+from board.grid import CODE_CHARS, TILE_CODES, TOKEN_CHARS, encode_board
+
 
 COLORMAP = {
     '#': (0.0, 0.0, 0.0),
@@ -27,43 +29,43 @@ COLORMAP = {
 HALLLIGHT = (0.93, 0.93, 0.93)
 HALLDARK  = (0.85, 0.85, 0.85)
 PLAYERTOKENS = {'S', 'M', 'W', 'G', 'P', 'L'}
+TOKENCOLOR = (0.2, 0.2, 0.2)
 
 
+#Tile code -> RGB, so a whole board becomes an image with one fancy-indexing lookup
+PALETTE = np.array(
+    [
+        TOKENCOLOR if ch in PLAYERTOKENS
+        else HALLLIGHT if ch == '.'
+        else COLORMAP.get(ch, (1.0, 1.0, 1.0))
+        for ch in CODE_CHARS
+    ],
+    dtype=np.float64,
+)
+HALLCODE = TILE_CODES['.']
+TOKENCODES = np.array([TILE_CODES[t] for t in TOKEN_CHARS], dtype=np.uint8)
 
-def visualize_board(board):
-    rows = len(board)
-    cols = len(board[0])
-    img = np.zeros((rows, cols, 3))
 
-    for r in range(rows):
-        for c in range(cols):
-            tile = board[r][c]
+def board_image(board) -> np.ndarray:
+    #(rows, cols, 3) RGB image of the board, hallway tiles shaded like a checkerboard
+    codes = encode_board(board)
+    img = PALETTE[codes]
 
-            if tile == '.':
-                img[r, c] = HALLLIGHT if (r + c) % 2 == 0 else HALLDARK
-            elif tile in PLAYERTOKENS:
-                img[r, c] = (0.2, 0.2, 0.2)
-            else:
-                img[r, c] = COLORMAP.get(tile, (1.0, 1.0, 1.0))
+    rows, cols = codes.shape
+    checker = (np.add.outer(np.arange(rows), np.arange(cols)) % 2) == 1
+    img[(codes == HALLCODE) & checker] = HALLDARK
+    return img
 
 
-    fig, ax = plt.subplots(1, 2, figsize=(12, 8), gridspec_kw={'width_ratios': [4, 1]})
+def token_cells(board):
+    #[(row, col, token letter), ...] for every player token drawn on the board
+    codes = encode_board(board)
+    rs, cs = np.nonzero(np.isin(codes, TOKENCODES))
+    return [(int(r), int(c), CODE_CHARS[codes[r, c]]) for r, c in zip(rs, cs)]
 
-    ax[0].imshow(img, interpolation='nearest')
-    ax[0].set_title("Cluedo Board Visualization", fontsize=16)
-    ax[0].axis('off')
 
-    for r in range(rows):
-        for c in range(cols):
-            tile = board[r][c]
-            if tile in PLAYERTOKENS:
-                ax[0].text(
-                    c, r, tile,
-                    ha='center', va='center',
-                    color='white', fontsize=12, fontweight='bold'
-                )
-
-    legend_patches = [
+def board_legend_patches():
+    return [
         Patch(facecolor=COLORMAP['1'], label="Kitchen"),
         Patch(facecolor=COLORMAP['2'], label="Ballroom"),
         Patch(facecolor=COLORMAP['3'], label="Conservatory"),
@@ -81,9 +83,41 @@ def visualize_board(board):
         Patch(facecolor=COLORMAP['#'], label="Wall")
     ]
 
+
+def visualize_board(board):
+    #Accepts the uint8 tile-code array as well as the list-of-lists board
+    img = board_image(board)
+
+    fig, ax = plt.subplots(1, 2, figsize=(12, 8), gridspec_kw={'width_ratios': [4, 1]})
+
+    ax[0].imshow(img, interpolation='nearest')
+    ax[0].set_title("Cluedo Board Visualization", fontsize=16)
+    ax[0].axis('off')
+
+    #Only the token tiles get a label, found in one pass over the code array
+    for r, c, token in token_cells(board):
+        ax[0].text(
+            c, r, token,
+            ha='center', va='center',
+            color='white', fontsize=12, fontweight='bold'
+        )
+
+    legend_patches = board_legend_patches()
+
     ax[1].legend(handles=legend_patches, loc='center left', fontsize=10)
     ax[1].axis('off')
 
     plt.tight_layout()
     plt.show(block=True)
 
+
+def save_board_image(board, path: str) -> str:
+    #Off-screen fallback for hosts without a display
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.imshow(board_image(board), interpolation='nearest')
+    for r, c, token in token_cells(board):
+        ax.text(c, r, token, ha='center', va='center', color='white', fontsize=12, fontweight='bold')
+    ax.axis('off')
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+    return path
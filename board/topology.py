@@ -0,0 +1,268 @@
+# board/topology.py
+
+#Precomputed board topology. The board never changes during a game, so instead of
+#rescanning the 28x28 grid with string membership tests on every AI step,
+#everything about the layout (which tiles are walkable, which door leads to which room,
+#neighbours of each cell, ...) is worked out once and then shared read-only by
+#movement, AI and the renderer.
+
+from __future__ import annotations
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from board.grid import CODE_CHARS, encode_board
+
+Pos = Tuple[int, int]
+#field[r][c] = number of hallway steps to the target, None if it can't be reached
+DistanceField = Tuple[Tuple[Optional[int], ...], ...]
+
+#Tile kinds
+WALL = 0
+HALL = 1
+DOOR = 2
+ROOM = 3
+SECRET = 4
+CENTRE = 5
+
+ROOM_CHARS = "123456789"
+SECRET_CHARS = "%&"
+
+#Same order as the movement commands (w, s, a, d) so tie-breaks stay the same everywhere.
+STEP_VECTORS: Tuple[Tuple[str, Tuple[int, int]], ...] = (
+    ("w", (-1, 0)),
+    ("s", (1, 0)),
+    ("a", (0, -1)),
+    ("d", (0, 1)),
+)
+
+
+def tile_kind(tile: str) -> int:
+    if tile == ".":
+        return HALL
+    if tile == "X":
+        return DOOR
+    if tile in ROOM_CHARS:
+        return ROOM
+    if tile in SECRET_CHARS:
+        return SECRET
+    if tile == "Q":
+        return CENTRE
+    return WALL
+
+
+#Tile code (board/grid.py) -> tile kind / room number (0 = not a room)
+KIND_BY_CODE = np.array([tile_kind(ch) for ch in CODE_CHARS], dtype=np.uint8)
+ROOM_BY_CODE = np.array([int(ch) if ch in ROOM_CHARS else 0 for ch in CODE_CHARS], dtype=np.uint8)
+
+
+class BoardTopology:
+    def __init__(self, base_board):
+        #Works on the uint8 tile codes; a list-of-lists board is encoded first
+        codes = encode_board(base_board)
+        self.rows, self.cols = codes.shape
+
+        #Whole-board masks, for vectorised users (renderer, batch code)
+        self.kind_array: np.ndarray = KIND_BY_CODE[codes]
+        self.room_array: np.ndarray = ROOM_BY_CODE[codes]
+        self.walkable_mask: np.ndarray = (self.kind_array == HALL) | (self.kind_array == DOOR)
+
+        #Plain tuples for the per-cell lookups done in Python (faster than indexing numpy scalars)
+        #kind[r][c] is one of the tile kind constants above
+        self.kind: Tuple[Tuple[int, ...], ...] = tuple(map(tuple, self.kind_array.tolist()))
+
+        #room_id[r][c] is the room number of a room tile, None otherwise
+        self.room_id: Tuple[Tuple[Optional[int], ...], ...] = tuple(
+            tuple(rid or None for rid in row) for row in self.room_array.tolist()
+        )
+
+        #Hallway + door tiles, the only tiles you can walk on outside a room
+        self.walkable: Tuple[Tuple[bool, ...], ...] = tuple(map(tuple, self.walkable_mask.tolist()))
+
+        #Neighbour lists per cell: (command, position) for every in-bounds non-wall neighbour
+        self.neighbours: Dict[Pos, Tuple[Tuple[str, Pos], ...]] = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                nbrs = []
+                for cmd, (dr, dc) in STEP_VECTORS:
+                    nr, nc = r + dr, c + dc
+                    if not (0 <= nr < self.rows and 0 <= nc < self.cols):
+                        continue
+                    if self.kind[nr][nc] == WALL:
+                        continue
+                    nbrs.append((cmd, (nr, nc)))
+                self.neighbours[(r, c)] = tuple(nbrs)
+
+        #Door -> room it opens into (first adjacent room tile in w, s, a, d order)
+        self.door_to_room: Dict[Pos, int] = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.kind[r][c] != DOOR:
+                    continue
+                for _, (nr, nc) in self.neighbours[(r, c)]:
+                    rid = self.room_id[nr][nc]
+                    if rid is not None:
+                        self.door_to_room[(r, c)] = rid
+                        break
+
+        #Per-room door lists
+        room_doors: Dict[int, List[Pos]] = {}
+        for pos, rid in self.door_to_room.items():
+            room_doors.setdefault(rid, []).append(pos)
+        self.room_doors: Dict[int, Tuple[Pos, ...]] = {
+            rid: tuple(doors) for rid, doors in room_doors.items()
+        }
+
+        #Per-room interior tiles
+        room_tiles: Dict[int, set] = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                rid = self.room_id[r][c]
+                if rid is not None:
+                    room_tiles.setdefault(rid, set()).add((r, c))
+        self.room_tiles: Dict[int, FrozenSet[Pos]] = {
+            rid: frozenset(tiles) for rid, tiles in room_tiles.items()
+        }
+
+        #Secret passage tiles -> room they sit in
+        self.secret_tiles: Dict[Pos, int] = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.kind[r][c] != SECRET:
+                    continue
+                for _, (nr, nc) in self.neighbours[(r, c)]:
+                    rid = self.room_id[nr][nc]
+                    if rid is not None:
+                        self.secret_tiles[(r, c)] = rid
+                        break
+
+        #Distance fields are filled lazily (see door_field / room_field)
+        self._door_fields: Dict[Pos, DistanceField] = {}
+        self._room_fields: Dict[int, DistanceField] = {}
+
+    # ------------- lookups -------------
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def kind_at(self, pos: Pos) -> int:
+        r, c = pos
+        return self.kind[r][c]
+
+    def is_walkable(self, pos: Pos) -> bool:
+        r, c = pos
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.walkable[r][c]
+
+    def is_room_like(self, pos: Pos) -> bool:
+        #Room tile or secret passage tile (both count as "inside a room")
+        r, c = pos
+        return self.kind[r][c] in (ROOM, SECRET)
+
+    def adjacent_room(self, pos: Pos) -> Optional[int]:
+        #Room a door opens into, or None if pos is not a door
+        return self.door_to_room.get(pos)
+
+    # ------------- distance fields -------------
+    #Hallway distances never depend on where the player is standing, only on the target,
+    #so instead of a BFS from the player on every step we run one reverse BFS per door
+    #(and one multi-source BFS per room over all its doors) and keep them for the whole board.
+    def _reverse_bfs(self, sources: Iterable[Pos]) -> DistanceField:
+        dist: List[List[Optional[int]]] = [[None] * self.cols for _ in range(self.rows)]
+        q = deque()
+        for r, c in sources:
+            if dist[r][c] is None:
+                dist[r][c] = 0
+                q.append((r, c))
+
+        walkable = self.walkable
+        neighbours = self.neighbours
+        while q:
+            r, c = q.popleft()
+            d = dist[r][c] + 1
+            for _, (nr, nc) in neighbours[(r, c)]:
+                if not walkable[nr][nc] or dist[nr][nc] is not None:
+                    continue
+                dist[nr][nc] = d
+                q.append((nr, nc))
+
+        return tuple(tuple(row) for row in dist)
+
+    def door_field(self, door: Pos) -> DistanceField:
+        field = self._door_fields.get(door)
+        if field is None:
+            field = self._reverse_bfs((door,))
+            self._door_fields[door] = field
+        return field
+
+    def room_field(self, room_id: int) -> DistanceField:
+        #Distance to the nearest door of the room
+        field = self._room_fields.get(room_id)
+        if field is None:
+            field = self._reverse_bfs(self.room_doors.get(room_id, ()))
+            self._room_fields[room_id] = field
+        return field
+
+    def build_distance_fields(self) -> None:
+        #Optional warm-up so the first AI decision doesn't pay for the BFS runs
+        for door in self.door_to_room:
+            self.door_field(door)
+        for room_id in self.room_doors:
+            self.room_field(room_id)
+
+    def distance_from(self, field: DistanceField, pos: Pos) -> Optional[int]:
+        #Hallway steps from pos to the field's target.
+        #A player standing on a non-walkable tile (inside a room, on a start square)
+        #first has to step onto a walkable neighbour.
+        r, c = pos
+        if self.walkable[r][c]:
+            return field[r][c]
+        best = None
+        for _, (nr, nc) in self.neighbours[pos]:
+            d = field[nr][nc]
+            if d is not None and (best is None or d + 1 < best):
+                best = d + 1
+        return best
+
+    def distance_to_door(self, pos: Pos, door: Pos) -> Optional[int]:
+        return self.distance_from(self.door_field(door), pos)
+
+    def distance_to_room(self, pos: Pos, room_id: int) -> Optional[int]:
+        return self.distance_from(self.room_field(room_id), pos)
+
+    def first_step(self, field: DistanceField, pos: Pos) -> Optional[Tuple[str, Pos]]:
+        #(command, next position) of one shortest hallway step towards the field's target
+        here = self.distance_from(field, pos)
+        if not here:
+            return None
+        for cmd, (nr, nc) in self.neighbours[pos]:
+            if field[nr][nc] == here - 1 and self.walkable[nr][nc]:
+                return cmd, (nr, nc)
+        return None
+
+
+#One topology per board object. Boards are never mutated after get_board()
+#(player tokens are always drawn on a copy), so the object identity is a safe key.
+#Fresh board objects with the same layout (one per game) share the same topology,
+#and only the last few board objects are remembered so long sessions don't leak.
+_TOPOLOGY_BY_ID: Dict[int, Tuple[object, BoardTopology]] = {}
+_TOPOLOGY_BY_LAYOUT: Dict[bytes, BoardTopology] = {}
+_MAX_CACHED_BOARDS = 16
+
+
+def get_topology(base_board) -> BoardTopology:
+    key = id(base_board)
+    cached = _TOPOLOGY_BY_ID.get(key)
+    if cached is not None and cached[0] is base_board:
+        return cached[1]
+
+    codes = encode_board(base_board)
+    layout = bytes(codes.shape) + codes.tobytes()
+    topo = _TOPOLOGY_BY_LAYOUT.get(layout)
+    if topo is None:
+        topo = BoardTopology(codes)
+        _TOPOLOGY_BY_LAYOUT[layout] = topo
+
+    if len(_TOPOLOGY_BY_ID) >= _MAX_CACHED_BOARDS:
+        _TOPOLOGY_BY_ID.pop(next(iter(_TOPOLOGY_BY_ID)))
+    _TOPOLOGY_BY_ID[key] = (base_board, topo)
+    return topo
@@ -0,0 +1,109 @@
+# entities/occupancy.py
+
+#Who is standing where.
+#The index is kept up to date by Player itself (position setter, enter_room, exit_room,
+#reset_to_start), so "is this tile taken?" and "find the player called X" are dict lookups
+#instead of loops over every player.
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Pos = Tuple[int, int]
+
+
+class OccupancyIndex:
+    def __init__(self, players: Iterable = ()):
+        self._players: List = []
+        #Several players can share a tile (e.g. after being summoned into a room)
+        self._by_position: Dict[Pos, List] = {}
+        self._by_room: Dict[int, List] = {}
+        self._by_name: Dict[str, object] = {}
+        self._by_token: Dict[str, object] = {}
+        for p in players:
+            self.add(p)
+
+    def add(self, player) -> None:
+        if player.occupancy is not None and player.occupancy is not self:
+            player.occupancy.remove(player)
+        player.occupancy = self
+        self._players.append(player)
+        self._by_name[player.name] = player
+        self._by_token[player.token] = player
+        self._by_position.setdefault(player.position, []).append(player)
+        if player.in_room is not None:
+            self._by_room.setdefault(player.in_room, []).append(player)
+
+    def remove(self, player) -> None:
+        self._players.remove(player)
+        self._by_name.pop(player.name, None)
+        self._by_token.pop(player.token, None)
+        self._discard(self._by_position, player.position, player)
+        if player.in_room is not None:
+            self._discard(self._by_room, player.in_room, player)
+        player.occupancy = None
+
+    # ------------- updates (called from Player) -------------
+    def moved(self, player, old: Pos, new: Pos) -> None:
+        self._discard(self._by_position, old, player)
+        self._by_position.setdefault(new, []).append(player)
+
+    def room_changed(self, player, old: Optional[int], new: Optional[int]) -> None:
+        if old is not None:
+            self._discard(self._by_room, old, player)
+        if new is not None:
+            self._by_room.setdefault(new, []).append(player)
+
+    @staticmethod
+    def _discard(index: Dict, key, player) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        if player in bucket:
+            bucket.remove(player)
+        if not bucket:
+            del index[key]
+
+    # ------------- lookups -------------
+    def is_occupied(self, pos: Pos, ignore_player=None) -> bool:
+        bucket = self._by_position.get(pos)
+        if not bucket:
+            return False
+        return any(p is not ignore_player for p in bucket)
+
+    def players_at(self, pos: Pos) -> Tuple:
+        return tuple(self._by_position.get(pos, ()))
+
+    def players_in_room(self, room_id: int) -> Tuple:
+        return tuple(self._by_room.get(room_id, ()))
+
+    def by_name(self, name: str):
+        return self._by_name.get(name)
+
+    def by_token(self, token: str):
+        return self._by_token.get(token)
+
+    def occupied_positions(self, ignore_player=None) -> frozenset:
+        return frozenset(
+            pos for pos, bucket in self._by_position.items()
+            if any(p is not ignore_player for p in bucket)
+        )
+
+    def tokens_by_position(self) -> Dict[Pos, str]:
+        #Token drawn on each occupied tile (the last player to arrive is on top)
+        return {pos: bucket[-1].token for pos, bucket in self._by_position.items()}
+
+    def covers(self, players) -> bool:
+        #True if this index tracks exactly the given player list (same size, every player in it)
+        return len(players) == len(self._players) and all(p.occupancy is self for p in players)
+
+
+def occupancy_for(players) -> Optional[OccupancyIndex]:
+    #Shared index of a list of players, or None if they are not (all) indexed together
+    if isinstance(players, OccupancyIndex):
+        return players
+    if not players:
+        return None
+    index = players[0].occupancy
+    if index is not None and index.covers(players):
+        return index
+    return None
@@ -8,9 +8,11 @@ class Player:
         self.name = name
         self.token = token
         self.start_position = start_position
-        self.position = start_position
+        #Shared OccupancyIndex (entities/occupancy.py), kept in sync on every move
+        self.occupancy = None
+        self._position = start_position
+        self._in_room: int | None = None
         self.hand: list[str] = []
-        self.in_room: int | None = None
         self.is_ai: bool = False
         self.ai_controller = None
         self.ai = None
@@ -18,6 +20,30 @@ class Player:
         self.is_eliminated: bool = False
 
     
+    # ------------- position / room (kept in the occupancy index) -------------
+    @property
+    def position(self) -> tuple[int, int]:
+        return self._position
+
+    @position.setter
+    def position(self, pos: tuple[int, int]) -> None:
+        old = self._position
+        self._position = pos
+        if self.occupancy is not None and old != pos:
+            self.occupancy.moved(self, old, pos)
+
+    @property
+    def in_room(self) -> int | None:
+        return self._in_room
+
+    @in_room.setter
+    def in_room(self, room_id: int | None) -> None:
+        old = self._in_room
+        self._in_room = room_id
+        if self.occupancy is not None and old != room_id:
+            self.occupancy.room_changed(self, old, room_id)
+
+
     # ------------- basic helpers -------------
     #Move player to a new position
     def move_to(self, pos: tuple[int, int]) -> None:
@@ -0,0 +1,540 @@
+# game/batch.py
+
+#Lockstep batch simulator for all-AI games with the old, own-cards-only AI.
+#game/simulate.py plays every game with the real Player / notebook / GameEngine objects,
+#which is exact but costs a few milliseconds of Python per turn. Here thousands of games are
+#kept as NumPy arrays (struct of arrays, one row per game) and every game plays its current
+#player's turn at the same time, so each rule is a handful of array operations per turn
+#for the whole batch instead of a Python call per game.
+#
+#State per game (G games, 6 seats, cards numbered 0-20 = SUSPECTS, WEAPONS, ROOMS):
+#  pos[G, 6]            flat board cell of every seat (row * cols + col); the room a seat is
+#                       in follows from the cell, like in_room does on the real board
+#  hand[G, 6]           21-bit card masks
+#  possible/seen[G, 6]  the AI notebooks as card masks (ai/knowledge.py BitsetNotebook)
+#  visits/suggs[G,6,9]  room visit / suggestion counts, last[G, 6] = last room entered
+#
+#This is not the AI that ships: the batch models the policy from before the table talk of
+#game/events.py and the per-tile travel table of ai/travel.py:
+#  - a notebook only learns the cards shown to its owner and the unrefuted suggestions its
+#    owner made. The shipped JointNotebook also hears every other suggestion (passes,
+#    refutations, wrong accusations) and deduces who holds what, which makes games far shorter.
+#  - target rooms are scored by walking distance only. Secret passages are used when standing
+#    in a passage room, but they do not count towards the travel cost of a target.
+#Otherwise the rules follow mechanics/ and ai/ai_player.py: the same room scores, a door on the
+#way into a worthwhile room is taken, the secret passage rule, summoning, refutation in seat
+#order showing the first matching card of the hand, and accusing as soon as the notebook is
+#down to one triplet. Movement is simplified to one precomputed shortest route per
+#(cell, room) from board/topology.py; a blocked step falls back to a random free neighbour,
+#like the step-by-step AI does.
+#
+#So its numbers are not a stand-in for game/simulate.py: use it to measure this fixed, simpler
+#policy over very many games (or the array machinery itself), and game/simulate.py for
+#anything about the current AI. The dice and the AIs' random choices come from one numpy
+#Generator per batch, so even under the same policy a game here would not be the same game
+#as GameEngine.new_game(seed).
+#
+#Run from the project root:
+#    python -m game.batch --games 100000 --seed 1
+
+from __future__ import annotations
+import argparse
+import time
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+from ai.knowledge import ClueNotebook
+from ai.travel import expected_turns_by_distance
+from board.grid import get_board_array
+from board.rooms import SECRET_PASSAGES, SECRET_PASSAGE_POSITIONS
+from board.topology import BoardTopology, get_topology, HALL, DOOR, ROOM, SECRET
+from entities.character import CHARACTERS
+from game.cards import (SUSPECTS, WEAPONS, ROOMS, N_CARDS, WEAPON_BASE, ROOM_BASE,
+                        SUSPECT_BITS, WEAPON_BITS, ROOM_BITS, ALL_CARDS)
+from game.simulate import DEFAULT_MAX_TURNS, GameResult, SEATS, SimStats, print_report
+
+DEFAULT_BATCH_SIZE = 10000
+
+#Cards are the ids of game/cards.py: suspects 0-5, weapons 6-11, rooms 12-20 (room id r is card 11 + r)
+N_SUSPECTS = len(SUSPECTS)
+N_WEAPONS = len(WEAPONS)
+N_ROOMS = len(ROOMS)
+
+#Same penalties as ClueNotebook.score_room / room_utility
+SCORE_NOT_POSSIBLE = -100.0
+VISIT_PENALTY = 5.0
+SUGGESTION_PENALTY = 20.0
+LAST_ROOM_PENALTY = 100.0
+PASSAGE_SLACK = 15.0
+
+#Small lookup tables over 9-bit masks: set-bit count, and the position of the i-th set bit
+_POPCOUNT = np.array([bin(m).count("1") for m in range(1 << N_ROOMS)], dtype=np.int32)
+_NTH_BIT = np.zeros((1 << N_ROOMS, N_ROOMS), dtype=np.int8)
+for _m in range(1 << N_ROOMS):
+    for _i, _b in enumerate(b for b in range(N_ROOMS) if _m >> b & 1):
+        _NTH_BIT[_m, _i] = _b
+
+#w, s, a, d - the neighbour order of board/topology.py
+_MOVE_VECTORS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class BatchTables:
+    #Everything movement needs, as flat per-cell arrays (cell = row * cols + col)
+    def __init__(self, topo: BoardTopology):
+        rows, cols = topo.rows, topo.cols
+        cells = rows * cols
+        self.cols = cols
+        kind = topo.kind_array.ravel()
+
+        #Room index 0-8 of every room / secret passage tile, -1 elsewhere
+        room_of = topo.room_array.ravel().astype(np.int16) - 1
+        for (r, c), rid in topo.secret_tiles.items():
+            room_of[r * cols + c] = rid - 1
+        self.room_of = room_of.astype(np.int8)
+
+        #Legal moves that do not enter a room: hallway <-> hallway/door, inside a room
+        #between its own tiles and out through a door
+        moves = np.full((cells, len(_MOVE_VECTORS)), -1, dtype=np.int16)
+        for cell in range(cells):
+            r, c = divmod(cell, cols)
+            for i, (dr, dc) in enumerate(_MOVE_VECTORS):
+                nr, nc = r + dr, c + dc
+                if not topo.in_bounds(nr, nc):
+                    continue
+                nxt = nr * cols + nc
+                if kind[cell] in (ROOM, SECRET):
+                    ok = kind[nxt] == DOOR or (kind[nxt] in (ROOM, SECRET) and room_of[nxt] == room_of[cell])
+                else:
+                    ok = kind[cell] in (HALL, DOOR) and kind[nxt] in (HALL, DOOR)
+                if ok:
+                    moves[cell, i] = nxt
+        self.moves = moves
+
+        #Door -> the room tile it opens onto (first one in w, a, s, d order, as _room_entry_command)
+        self.door_entry = np.full(cells, -1, dtype=np.int16)
+        self.door_room = np.full(cells, -1, dtype=np.int8)
+        for (r, c) in topo.door_to_room:
+            for dr, dc in ((-1, 0), (0, -1), (1, 0), (0, 1)):
+                nr, nc = r + dr, c + dc
+                if topo.in_bounds(nr, nc) and kind[nr * cols + nc] == ROOM:
+                    self.door_entry[r * cols + c] = nr * cols + nc
+                    self.door_room[r * cols + c] = room_of[nr * cols + nc]
+                    break
+
+        #Steps to get into every room from every cell, and the first step of such a route.
+        #Unreachable cells get the last entry of `turns`, which is infinite.
+        turns = expected_turns_by_distance(cells)
+        self.unreachable = len(turns)
+        self.turns = np.array(turns + [float("inf")], dtype=np.float64)
+        self.dist = np.full((N_ROOMS, cells), self.unreachable, dtype=np.int16)
+        self.hop = np.full((N_ROOMS, cells), -1, dtype=np.int16)
+        for room in range(N_ROOMS):
+            self._route_to(room)
+
+        #Secret passages: destination room and arrival cell per room (-1 = none)
+        self.passage_room = np.full(N_ROOMS, -1, dtype=np.int8)
+        self.passage_cell = np.full(N_ROOMS, -1, dtype=np.int16)
+        for rid, dest in SECRET_PASSAGES.items():
+            r, c = SECRET_PASSAGE_POSITIONS[dest]
+            self.passage_room[rid - 1] = dest - 1
+            self.passage_cell[rid - 1] = r * cols + c
+
+        #Start cell of every character (SUSPECTS order)
+        self.start_cell = np.array(
+            [CHARACTERS[name]["start_pos"][0] * cols + CHARACTERS[name]["start_pos"][1] for name in SUSPECTS],
+            dtype=np.int16,
+        )
+
+    def _steps_into(self, cell: int, room: int):
+        #Next cells of a route towards `room`: the non-entering moves plus the door into it
+        for nxt in self.moves[cell]:
+            if nxt >= 0:
+                yield int(nxt)
+        if self.door_room[cell] == room:
+            yield int(self.door_entry[cell])
+
+    def _route_to(self, room: int) -> None:
+        #Reverse BFS from the room's tiles over the predecessors of every cell
+        cells = len(self.room_of)
+        preds = [[] for _ in range(cells)]
+        for cell in range(cells):
+            for nxt in self._steps_into(cell, room):
+                preds[nxt].append(cell)
+
+        dist = self.dist[room]
+        inside = np.flatnonzero(self.room_of == room)
+        dist[inside] = 0
+        q = deque(int(c) for c in inside)
+        while q:
+            cell = q.popleft()
+            for prev in preds[cell]:
+                if dist[prev] == self.unreachable:
+                    dist[prev] = dist[cell] + 1
+                    q.append(prev)
+
+        for cell in range(cells):
+            d = dist[cell]
+            if d == 0 or d == self.unreachable:
+                continue
+            for nxt in self._steps_into(cell, room):
+                if dist[nxt] == d - 1:
+                    self.hop[room, cell] = nxt
+                    break
+
+
+@lru_cache(maxsize=None)
+def get_batch_tables(topo: BoardTopology) -> BatchTables:
+    return BatchTables(topo)
+
+
+def _pick_bit(masks: np.ndarray, u: np.ndarray) -> np.ndarray:
+    #Uniformly random set bit of every (up to 9-bit) mask, like rng.choice over a card set
+    n = _POPCOUNT[masks]
+    return _NTH_BIT[masks, np.minimum((u * n).astype(np.int32), np.maximum(n - 1, 0))]
+
+
+class GameBatch:
+    def __init__(self, games: int, rng: np.random.Generator, tables: BatchTables,
+                 first_game: int = 0):
+        self.rng = rng
+        self.t = tables
+        g = games
+
+        #Random seating, solution and deal (deck order = order in the hands, see deal_cards)
+        self.game_id = np.arange(first_game, first_game + g)
+        self.character = np.argsort(rng.random((g, SEATS)), axis=1).astype(np.int8)
+        self.solution = np.stack([
+            rng.integers(0, N_SUSPECTS, g),
+            WEAPON_BASE + rng.integers(0, N_WEAPONS, g),
+            ROOM_BASE + rng.integers(0, N_ROOMS, g),
+        ], axis=1)
+        keys = rng.random((g, N_CARDS))
+        np.put_along_axis(keys, self.solution, 2.0, axis=1)
+        order = np.argsort(keys, axis=1)
+        deck = order[:, :N_CARDS - 3]
+        self.deck_pos = np.argsort(order, axis=1).astype(np.int8)
+        self.hand = np.zeros((g, SEATS), dtype=np.int32)
+        for i in range(deck.shape[1]):
+            self.hand[np.arange(g), i % SEATS] |= (1 << deck[:, i]).astype(np.int32)
+
+        self.pos = tables.start_cell[self.character].astype(np.int16)
+        self.seen = self.hand.copy()
+        self.possible = ALL_CARDS & ~self.hand
+        self.visits = np.zeros((g, SEATS, N_ROOMS), dtype=np.int16)
+        self.suggs = np.zeros((g, SEATS, N_ROOMS), dtype=np.int16)
+        self.last = np.full((g, SEATS), -1, dtype=np.int8)
+        self.summoned = np.zeros((g, SEATS), dtype=bool)
+        self.out = np.zeros((g, SEATS), dtype=bool)
+
+        self.cur = np.zeros(g, dtype=np.int64)
+        self.turn = np.ones(g, dtype=np.int64)
+        self.winner = np.full(g, -1, dtype=np.int64)
+        self.finished = np.zeros(g, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.cur)
+
+    # ------------- notebook views (current seat of the given rows) -------------
+    def _room_scores(self, rows: np.ndarray, seat: np.ndarray) -> np.ndarray:
+        #ClueNotebook.score_room for all 9 rooms -> (len(rows), 9)
+        possible = self.possible[rows, seat]
+        base = (_POPCOUNT[possible & SUSPECT_BITS] * _POPCOUNT[(possible & WEAPON_BITS) >> WEAPON_BASE]).astype(np.float64)
+        score = (base[:, None]
+                 - VISIT_PENALTY * self.visits[rows, seat]
+                 - SUGGESTION_PENALTY * self.suggs[rows, seat])
+        score -= LAST_ROOM_PENALTY * (self.last[rows, seat][:, None] == np.arange(N_ROOMS))
+        room_possible = ((possible[:, None] >> (ROOM_BASE + np.arange(N_ROOMS))) & 1).astype(bool)
+        return np.where(room_possible, score, SCORE_NOT_POSSIBLE)
+
+    def _worth_entering(self, rows, seat, room) -> np.ndarray:
+        #Not the room we just left, and not known to be innocent
+        possible = self.possible[rows, seat]
+        return (room >= 0) & (room != self.last[rows, seat]) & (
+            ((possible >> (ROOM_BASE + np.maximum(room, 0))) & 1) == 1)
+
+    def _enter(self, rows, seat, room) -> None:
+        #Player.enter_room -> AIPlayerController.note_entered_room
+        self.visits[rows, seat, room] += 1
+        self.last[rows, seat] = room
+
+    def _singleton(self, rows, seat) -> np.ndarray:
+        possible = self.possible[rows, seat]
+        return ((_POPCOUNT[possible & SUSPECT_BITS] == 1)
+                & (_POPCOUNT[(possible & WEAPON_BITS) >> WEAPON_BASE] == 1)
+                & (_POPCOUNT[(possible & ROOM_BITS) >> ROOM_BASE] == 1))
+
+    def _correct(self, rows, triplet_mask) -> np.ndarray:
+        sol = self.solution[rows]
+        return triplet_mask == ((1 << sol[:, 0]) | (1 << sol[:, 1]) | (1 << sol[:, 2]))
+
+    # ------------- turn phases -------------
+    def _secret_passage(self, rows, seat) -> np.ndarray:
+        #AIPlayerController.decide_use_secret_passage, then the move; returns the rows that went
+        room = self.t.room_of[self.pos[rows, seat]]
+        dest = np.where(room >= 0, self.t.passage_room[np.maximum(room, 0)], -1)
+        has = dest >= 0
+        rows, seat, room, dest = rows[has], seat[has], room[has], dest[has]
+
+        scores = self._room_scores(rows, seat)
+        k = np.arange(len(rows))
+        s_cur, s_dest = scores[k, room], scores[k, dest]
+        go = (self._worth_entering(rows, seat, dest)
+              & (s_dest > s_cur)
+              & (s_dest >= scores.max(axis=1) - PASSAGE_SLACK))
+
+        rows, seat, room, dest = rows[go], seat[go], room[go], dest[go]
+        self.pos[rows, seat] = self.t.passage_cell[room]
+        self._enter(rows, seat, dest)
+        return rows
+
+    def _move(self, rows, seat) -> np.ndarray:
+        #Dice roll + movement for every row; returns the rows that entered a room
+        t = self.t
+        n = len(rows)
+        k = np.arange(n)
+        dice = self.rng.integers(1, 7, n)
+        pos = self.pos[rows, seat].astype(np.int64)
+
+        #Target room: best score minus the travel cost in expected turns, unless a room we
+        #would walk into with this very roll scores at least as well (_choose_target_door).
+        #The travel cost is the walking distance only: the shipped AI also counts secret
+        #passages and leaving the current room (ai/travel.py TravelTable), this batch does not
+        dist = t.dist[:, pos].T
+        scores = self._room_scores(rows, seat)
+        reachable = (dist > 0) & (dist < t.unreachable)
+        utility = np.where(reachable, scores - ClueNotebook.TURN_PENALTY * t.turns[dist], -np.inf)
+        target = np.argmax(utility, axis=1)
+        has_target = np.isfinite(utility[k, target])
+
+        quick = reachable & (dist <= dice[:, None]) & self._worth_entering(
+            rows[:, None], seat[:, None], np.arange(N_ROOMS)[None, :])
+        quick_scores = np.where(quick, scores, -np.inf)
+        best_quick = np.argmax(quick_scores, axis=1)
+        use_quick = quick.any(axis=1) & (quick_scores[k, best_quick] >= np.where(has_target, scores[k, target], -np.inf))
+        target = np.where(use_quick, best_quick, target)
+        has_target |= use_quick
+
+        #Everyone else stays put during the move, so occupancy is one array per row
+        others = self.pos[rows].astype(np.int64)
+        others[k, seat] = -1
+
+        entered = np.zeros(n, dtype=bool)
+        moving = np.ones(n, dtype=bool)
+        for pip in range(6):
+            a = np.flatnonzero(moving & (dice > pip))
+            if not len(a):
+                break
+            p = pos[a]
+
+            #Standing on a door of a room worth entering: step in
+            door_room = t.door_room[p]
+            entry = t.door_entry[p].astype(np.int64)
+            enter = self._worth_entering(rows[a], seat[a], door_room) & ~(others[a] == entry[:, None]).any(axis=1)
+
+            #Otherwise one step along the route to the target, or a random free step if blocked
+            hop = np.where(has_target[a], t.hop[target[a], p], -1).astype(np.int64)
+            blocked = (others[a] == hop[:, None]).any(axis=1)
+            nxt = np.where(enter, entry, hop)
+
+            stuck = ~enter & has_target[a] & ((hop < 0) | blocked)
+            if stuck.any():
+                s = np.flatnonzero(stuck)
+                options = t.moves[p[s]].astype(np.int64)
+                free = (options >= 0) & ~(options[:, :, None] == others[a[s]][:, None, :]).any(axis=2)
+                order = np.where(free, self.rng.random(options.shape), np.inf)
+                choice = np.argmin(order, axis=1)
+                nxt[s] = np.where(free.any(axis=1), options[np.arange(len(s)), choice], -1)
+
+            nxt = np.where(~enter & ~has_target[a], -1, nxt)
+            go = nxt >= 0
+            moving[a[~go]] = False
+            pos[a[go]] = nxt[go]
+
+            #A step from a door into a room ends the movement
+            came_in = go & (t.room_of[np.maximum(nxt, 0)] >= 0) & (t.room_of[p] < 0)
+            if came_in.any():
+                e = a[came_in]
+                self._enter(rows[e], seat[e], t.room_of[pos[e]].astype(np.int64))
+                entered[e] = True
+                moving[e] = False
+
+        self.pos[rows, seat] = pos
+        return rows[entered]
+
+    def _suggest(self, rows, seat) -> np.ndarray:
+        #make_suggestion for the current seat of every row; returns the rows that won
+        t = self.t
+        n = len(rows)
+        k = np.arange(n)
+        room = t.room_of[self.pos[rows, seat]].astype(np.int64)
+        possible = self.possible[rows, seat]
+
+        sus_bits = possible & SUSPECT_BITS
+        weap_bits = (possible & WEAPON_BITS) >> WEAPON_BASE
+        sus_bits = np.where(sus_bits == 0, SUSPECT_BITS, sus_bits)
+        weap_bits = np.where(weap_bits == 0, WEAPON_BITS >> WEAPON_BASE, weap_bits)
+        suspect = _pick_bit(sus_bits, self.rng.random(n)).astype(np.int64)
+        weapon = WEAPON_BASE + _pick_bit(weap_bits, self.rng.random(n)).astype(np.int64)
+        room_card = ROOM_BASE + room
+        self.suggs[rows, seat, room] += 1
+
+        #Summon the suspect into the room
+        victim = np.argmax(self.character[rows] == suspect[:, None], axis=1)
+        pull = (victim != seat) & (t.room_of[self.pos[rows, victim]] != room)
+        pr, pv = rows[pull], victim[pull]
+        self.pos[pr, pv] = self.pos[pr, seat[pull]]
+        self._enter(pr, pv, room[pull])
+        self.summoned[pr, pv] = True
+
+        #Refutation: first seat after the suggester holding any of the cards
+        triplet = (1 << suspect) | (1 << weapon) | (1 << room_card)
+        order = (seat[:, None] + np.arange(1, SEATS)) % SEATS
+        holds = (self.hand[rows[:, None], order] & triplet[:, None]) != 0
+        refuted = holds.any(axis=1)
+        refuter = order[k, np.argmax(holds, axis=1)]
+
+        #The refuter shows the first matching card of their hand (AIDecisions: matches[0])
+        cards = np.stack([suspect, weapon, room_card], axis=1)
+        in_hand = ((self.hand[rows, refuter][:, None] >> cards) & 1) == 1
+        deck_pos = np.take_along_axis(self.deck_pos[rows], cards, axis=1)
+        shown = cards[k, np.argmin(np.where(in_hand, deck_pos, N_CARDS), axis=1)]
+
+        r, s = rows[refuted], seat[refuted]
+        bit = (1 << shown[refuted]).astype(np.int32)
+        self.seen[r, s] |= bit
+        self.possible[r, s] &= ~bit
+
+        #Nobody could refute: every card of it we have not seen is in the envelope
+        u = ~refuted
+        r, s, tr = rows[u], seat[u], triplet[u]
+        seen = self.seen[r, s]
+        possible = self.possible[r, s]
+        for card, part in ((suspect[u], SUSPECT_BITS), (weapon[u], WEAPON_BITS), (room_card[u], ROOM_BITS)):
+            unseen = ((seen >> card) & 1) == 0
+            possible = np.where(unseen, (possible & ~part) | (1 << card), possible)
+        self.possible[r, s] = possible
+
+        #Accuse right away if the deduction is exactly this suggestion
+        accuse = self._singleton(r, s) & ((self.possible[r, s] & ALL_CARDS) == tr)
+        r, s, tr = r[accuse], s[accuse], tr[accuse]
+        correct = self._correct(r, tr)
+        self.out[r[~correct], s[~correct]] = True
+        return r[correct]
+
+    # ------------- one turn of every game -------------
+    def step(self) -> None:
+        rows = np.flatnonzero(~self.finished)
+        seat = self.cur[rows]
+
+        #Everybody eliminated: game over without a winner
+        dead = self.out[rows].all(axis=1)
+        self.finished[rows[dead]] = True
+        rows, seat = rows[~dead], seat[~dead]
+
+        #Eliminated seats are skipped without using up a turn
+        skip = self.out[rows, seat]
+        self.cur[rows[skip]] = (seat[skip] + 1) % SEATS
+        rows, seat = rows[~skip], seat[~skip]
+
+        #1. Summoned last time round: stay and suggest
+        summoned = self.summoned[rows, seat]
+        self.summoned[rows, seat] = False
+        suggest = [rows[summoned]]
+        rest, rest_seat = rows[~summoned], seat[~summoned]
+
+        #2. Secret passage, then suggest
+        went = self._secret_passage(rest, rest_seat)
+        suggest.append(went)
+        left = ~np.isin(rest, went)
+        rest, rest_seat = rest[left], rest_seat[left]
+
+        #3. Accuse if the notebook is down to one triplet, otherwise roll and move
+        accuse = self._singleton(rest, rest_seat)
+        ar, a_seat = rest[accuse], rest_seat[accuse]
+        correct = self._correct(ar, self.possible[ar, a_seat])
+        self.winner[ar[correct]] = a_seat[correct]
+        self.out[ar[~correct], a_seat[~correct]] = True
+
+        movers = ~accuse
+        suggest.append(self._move(rest[movers], rest_seat[movers]))
+
+        srows = np.concatenate(suggest)
+        won = self._suggest(srows, self.cur[srows])
+        self.winner[won] = self.cur[won]
+
+        #End of turn for everyone who did not win
+        done = self.winner[rows] >= 0
+        self.finished[rows[done]] = True
+        going = rows[~done]
+        self.cur[going] = (self.cur[going] + 1) % SEATS
+        self.turn[going] += 1
+
+    def compact(self) -> "GameBatch":
+        #Drop finished games so the long tail of slow games runs on small arrays
+        keep = ~self.finished
+        for name in ("game_id", "character", "solution", "deck_pos", "hand", "pos", "seen", "possible",
+                     "visits", "suggs", "last", "summoned", "out", "cur", "turn", "winner", "finished"):
+            setattr(self, name, getattr(self, name)[keep])
+        return self
+
+    def results(self, rows: np.ndarray, capped: np.ndarray):
+        #GameResult of the given rows
+        for i in rows:
+            seat = int(self.winner[i])
+            yield GameResult(
+                winner_seat=seat if seat >= 0 else None,
+                winner_name=SUSPECTS[self.character[i, seat]] if seat >= 0 else None,
+                turns=int(self.turn[i]),
+                eliminated=int(self.out[i].sum()),
+                capped=bool(capped[i]),
+            )
+
+
+def run_batch(games: int,
+              seed: int = 0,
+              batch_size: int = DEFAULT_BATCH_SIZE,
+              max_turns: int = DEFAULT_MAX_TURNS,
+              base_board=None) -> SimStats:
+    tables = get_batch_tables(get_topology(base_board if base_board is not None else get_board_array()))
+    rng = np.random.default_rng(seed)
+    stats = SimStats()
+
+    for first in range(0, games, batch_size):
+        batch = GameBatch(min(batch_size, games - first), rng, tables, first_game=first)
+        while len(batch):
+            batch.step()
+            #Same cut-off as GameEngine.run_to_completion(max_turns)
+            capped = ~batch.finished & (batch.turn > max_turns)
+            done = batch.finished | capped
+            if done.any():
+                for result in batch.results(np.flatnonzero(done), capped):
+                    stats.add(result)
+                batch.finished = done
+                batch.compact()
+    return stats
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate many all-AI Cluedo games in lockstep with NumPy "
+                                                 "(the older own-cards-only AI, see the module header).")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="games advanced together (bounds memory; results depend on it)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    args = parser.parse_args(argv)
+
+    if args.games <= 0:
+        parser.error("--games must be positive")
+    if args.batch_size <= 0:
+        parser.error("--batch-size must be positive")
+
+    start = time.perf_counter()
+    stats = run_batch(args.games, args.seed, args.batch_size, args.max_turns)
+    print_report(stats, time.perf_counter() - start, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@
 
 #Card definitions and dealing logic for Cluedo.
 #Three main lists: SUSPECTS, WEAPONS, ROOMS.
+#Every card also has a small integer id (suspects 0-5, weapons 6-11, rooms 12-20, so board
+#room id r is card 11 + r), which lets sets of cards be stored as bitmasks: bit i = CARDS[i].
 
 from __future__ import annotations
 import random
-from typing import Dict, List
+from typing import Dict, Iterable, List
 from board.rooms import get_room_name
 from entities.player import Player
 
@@ -42,13 +44,43 @@ ROOMS: List[str] = [
 ]
 
 
+#Card ids
+CARDS: List[str] = SUSPECTS + WEAPONS + ROOMS
+N_CARDS = len(CARDS)
+WEAPON_BASE = len(SUSPECTS)
+ROOM_BASE = WEAPON_BASE + len(WEAPONS)
+CARD_ID: Dict[str, int] = {card: i for i, card in enumerate(CARDS)}
+CARD_BIT: Dict[str, int] = {card: 1 << i for i, card in enumerate(CARDS)}
+
+#Masks of each kind of card, and of the whole deck
+SUSPECT_BITS = (1 << len(SUSPECTS)) - 1
+WEAPON_BITS = ((1 << len(WEAPONS)) - 1) << WEAPON_BASE
+ROOM_BITS = ((1 << len(ROOMS)) - 1) << ROOM_BASE
+ALL_CARDS = (1 << N_CARDS) - 1
+
+
+def cards_mask(cards: Iterable[str]) -> int:
+    #Bitmask of the given card names
+    mask = 0
+    for card in cards:
+        mask |= CARD_BIT[card]
+    return mask
+
+
+def mask_cards(mask: int) -> List[str]:
+    #Card names in a bitmask, in id order
+    return [card for i, card in enumerate(CARDS) if mask >> i & 1]
+
+
 
 #Solution and dealing logic
-def make_solution() -> Dict[str, str]:
+#rng: the game's random.Random (the global random module if left out)
+def make_solution(rng=None) -> Dict[str, str]:
     #Randomly pick one suspect, one weapon, and one room
-    suspect = random.choice(SUSPECTS)
-    weapon = random.choice(WEAPONS)
-    room = random.choice(ROOMS)
+    rng = rng or random
+    suspect = rng.choice(SUSPECTS)
+    weapon = rng.choice(WEAPONS)
+    room = rng.choice(ROOMS)
     return {"suspect": suspect, "weapon": weapon, "room": room}
 
 
@@ -67,10 +99,11 @@ def _build_deck_without_solution(solution: Dict[str, str]) -> List[str]:
     return deck
 
 
-def deal_cards(players: List[Player], solution: Dict[str, str]) -> None:
+def deal_cards(players: List[Player], solution: Dict[str, str], rng=None) -> None:
     #Deal the remaining cards in round-robin fashion.
+    rng = rng or random
     deck = _build_deck_without_solution(solution)
-    random.shuffle(deck)
+    rng.shuffle(deck)
 
     for p in players:
         p.hand.clear()
@@ -0,0 +1,236 @@
+# game/client.py
+
+#Small terminal client for game/server.py.
+#Prints the events of a table and answers the prompts for our seat, either by asking at the
+#terminal or, with --auto, with a simple random bot (handy for trying the server out and
+#used by the load generator in benchmarks/server_load.py).
+#
+#    python -m game.client --create human,ai,ai,ai,ai,ai     create a table and play seat 0
+#    python -m game.client --join 3 --seat 2                  take a seat at table 3
+#    python -m game.client --watch 3                          follow table 3
+#    python -m game.client --list
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+from typing import Optional
+
+from game.cards import SUSPECTS, WEAPONS, ROOMS
+from game.server import DEFAULT_HOST, DEFAULT_PORT, HUMAN, MAX_LINE
+
+DIRECTIONS = ("w", "a", "s", "d")
+
+
+class Connection:
+    #One line-delimited JSON stream to the server
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                   unix: Optional[str] = None) -> "Connection":
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def send(self, message: dict) -> None:
+        self.writer.write((json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8"))
+        await self.writer.drain()
+
+    async def receive(self) -> Optional[dict]:
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def expect(self, *ops: str) -> dict:
+        #Next message with one of the given ops; an error reply is raised
+        while True:
+            message = await self.receive()
+            if message is None:
+                raise ConnectionError("server closed the connection")
+            if message["op"] == "error":
+                raise ValueError(message["error"])
+            if message["op"] in ops:
+                return message
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+# ------------- answering prompts -------------
+def auto_answer(prompt: dict, rng) -> object:
+    #A bot that wanders about, suggests at random and never accuses
+    ask = prompt["ask"]
+    if ask == "turn_action":
+        return "move"
+    if ask == "move":
+        return rng.choice(DIRECTIONS)
+    if ask == "stay_after_summon":
+        return True
+    if ask in ("secret_passage", "accuse_now"):
+        return False
+    if ask == "suggestion":
+        return {"suspect": rng.choice(SUSPECTS), "weapon": rng.choice(WEAPONS)}
+    if ask == "show_card":
+        return prompt["options"][0]
+    if ask == "accusation":
+        return None
+    raise ValueError(f"unknown prompt {ask!r}")
+
+
+def _pick(title: str, options) -> str:
+    print(title)
+    for i, option in enumerate(options, start=1):
+        print(f"  {i}. {option}")
+    while True:
+        choice = input("Enter number: ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+        print("Invalid choice, try again.")
+
+
+def ask_terminal(prompt: dict) -> object:
+    #Same questions as game/console.py asks a human at the terminal
+    ask = prompt["ask"]
+    if ask == "turn_action":
+        return "accuse" if input("m - move, x - accuse: ").strip().lower() == "x" else "move"
+    if ask == "move":
+        return input(f"At {prompt['pos']}, {prompt['steps']} step(s) left. w/a/s/d or 'done': ").strip().lower()
+    if ask == "stay_after_summon":
+        return input(f"Stay in the {prompt['room']} and make a suggestion? (y/n): ").strip().lower().startswith("y")
+    if ask == "secret_passage":
+        return input(f"Take the secret passage to the {prompt['to']}? (y/n): ").strip().lower().startswith("y")
+    if ask == "accuse_now":
+        return input("Nobody could refute. Accuse now? (y/n): ").strip().lower().startswith("y")
+    if ask == "suggestion":
+        return {"suspect": _pick("Choose a suspect:", SUSPECTS), "weapon": _pick("Choose a weapon:", WEAPONS)}
+    if ask == "show_card":
+        return _pick(f"Choose a card to show {prompt['to']}:", prompt["options"])
+    if ask == "accusation":
+        if not input("Are you sure you want to accuse? (y/n): ").strip().lower().startswith("y"):
+            return None
+        return {"suspect": _pick("Suspect:", SUSPECTS), "weapon": _pick("Weapon:", WEAPONS),
+                "room": _pick("Room:", ROOMS)}
+    raise ValueError(f"unknown prompt {ask!r}")
+
+
+def describe(message: dict) -> str:
+    fields = {k: v for k, v in message.items() if k not in ("op", "table", "event")}
+    return f"[{message['event']}] " + ", ".join(f"{k}={v}" for k, v in fields.items())
+
+
+# ------------- sessions -------------
+async def play(conn: Connection, table: int, auto: bool = False, quiet: bool = False,
+               rng=None) -> dict:
+    #Follow a table until it is over, answering our prompts. Returns the "over" message.
+    rng = rng or random.Random()
+    prompt = None
+    while True:
+        message = await conn.receive()
+        if message is None:
+            raise ConnectionError("server closed the connection")
+        op = message["op"]
+        if message.get("table") not in (None, table):
+            continue
+
+        if op == "event":
+            if not quiet:
+                print(describe(message))
+        elif op == "prompt":
+            prompt = message
+            await _answer(conn, table, prompt, auto, rng)
+        elif op == "over":
+            if not quiet:
+                print(f"Game over ({message['reason']}): winner {message['winner']} after {message['turns']} turns")
+                print(f"Solution: {message['solution']}")
+            return message
+        elif op == "error":
+            if not quiet:
+                print(f"Server: {message['error']}")
+            #A rejected answer leaves the prompt open: ask again
+            if prompt is not None and message.get("id") == prompt["id"]:
+                await _answer(conn, table, prompt, auto, rng)
+
+
+async def _answer(conn: Connection, table: int, prompt: dict, auto: bool, rng) -> None:
+    if auto:
+        value = auto_answer(prompt, rng)
+    else:
+        value = await asyncio.get_running_loop().run_in_executor(None, ask_terminal, prompt)
+    await conn.send({"op": "answer", "table": table, "id": prompt["id"], "value": value})
+
+
+async def run(args) -> None:
+    conn = await Connection.open(args.host, args.port, args.unix)
+    try:
+        await conn.expect("hello")
+        if args.list:
+            await conn.send({"op": "list"})
+            for info in (await conn.expect("tables"))["tables"]:
+                seats = ", ".join(f"{s['seat']}:{s['name']}({s['kind']}{', taken' if s['taken'] else ''})"
+                                  for s in info["seats"])
+                print(f"Table {info['table']} turn {info['turn']}: {seats}")
+            return
+
+        if args.create:
+            seats = [HUMAN if kind.strip().lower().startswith("h") else "ai" for kind in args.create.split(",")]
+            request = {"op": "create", "seats": seats, "events": args.events,
+                       "move_timeout": args.move_timeout, "join_timeout": args.join_timeout,
+                       "watch": HUMAN not in seats}
+            if args.seed is not None:
+                request["seed"] = args.seed
+            await conn.send(request)
+            created = await conn.expect("created")
+            table = created["table"]
+            print(f"Created table {table}: " + ", ".join(f"{s['seat']}:{s['name']}" for s in created["seats"]))
+            if HUMAN in seats:
+                await conn.send({"op": "join", "table": table, "seat": seats.index(HUMAN)})
+        elif args.join is not None:
+            table = args.join
+            await conn.send({"op": "join", "table": table, "seat": args.seat})
+        else:
+            table = args.watch
+            await conn.send({"op": "watch", "table": table})
+
+        joined = await conn.expect("joined", "watching")
+        if joined["op"] == "joined":
+            print(f"You are {joined['name']} (seat {joined['seat']}). Your cards: {', '.join(joined['hand'])}")
+        await play(conn, table, auto=args.auto)
+    finally:
+        await conn.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Terminal client for the Cluedo server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH")
+    what = parser.add_mutually_exclusive_group(required=True)
+    what.add_argument("--create", metavar="SEATS",
+                      help="comma-separated seat kinds, e.g. human,ai,ai,ai,ai,ai (you take the first human)")
+    what.add_argument("--join", type=int, metavar="TABLE")
+    what.add_argument("--watch", type=int, metavar="TABLE")
+    what.add_argument("--list", action="store_true")
+    parser.add_argument("--seat", type=int, default=0, help="seat to take with --join")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--events", choices=("summary", "verbose"), default="summary")
+    parser.add_argument("--move-timeout", type=float, default=120.0)
+    parser.add_argument("--join-timeout", type=float, default=300.0, help="close the table if not full by then")
+    parser.add_argument("--auto", action="store_true", help="let a random bot answer the prompts")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# game/console.py
+
+#Human player at the terminal: every decision is asked with input().
+#This is the only place (together with main.py's menu) that reads from the keyboard.
+
+from __future__ import annotations
+from typing import Optional, Sequence
+
+from game.cards import SUSPECTS, WEAPONS, ROOMS
+from game.decisions import DecisionProvider, Triplet, MOVE, ACCUSE, QUIT
+
+
+#User choice
+def choose_from_list(prompt: str, options: Sequence[str]) -> str:
+    while True:
+        print(prompt)
+        for i, opt in enumerate(options, start=1):
+            print(f"{i}. {opt}")
+        choice = input("Enter number: ").strip()
+        if not choice.isdigit():
+            print("Please enter a number.")
+            continue
+        idx = int(choice) - 1
+        if 0 <= idx < len(options):
+            return options[idx]
+        print("Invalid choice, try again.")
+
+
+def ask_yes_no(prompt: str) -> bool:
+    return input(prompt).strip().lower().startswith("y")
+
+
+class ConsoleDecisions(DecisionProvider):
+
+    def choose_turn_action(self, engine, player) -> str:
+        #Bare menu; main.py extends it with the board / map / autoplay options
+        while True:
+            print("\n=== GAME MENU ===")
+            print(f"(Turn {engine.turn_count} | Current turn: {player.name} [{player.token}])")
+            print("m - move current player")
+            print("x - make accusation (any room)")
+            print("q - quit")
+            choice = input("\nEnter choice: ").strip().lower()
+            if choice == "m":
+                return MOVE
+            if choice == "x":
+                return ACCUSE
+            if choice == "q":
+                return QUIT
+            print("Invalid choice, try again.")
+
+    def stay_after_summon(self, engine, player, room_name: str) -> bool:
+        return ask_yes_no("Do you want to stay and make a suggestion? (y/n): ")
+
+    def use_secret_passage(self, engine, player, current_room_name: str, dest_room_name: str) -> bool:
+        return ask_yes_no(
+            f"\n{player.name} is in the {current_room_name}, which has a secret passage.\n"
+            f"Use secret passage to the {dest_room_name}? (y/n): "
+        )
+
+    def choose_move(self, base_board, players, player, steps_remaining: int) -> str:
+        print(
+            "Enter direction: w(up), s(down), a(left), d(right), "
+            "or 'done' to stop movement."
+        )
+        return input("> ").strip().lower()
+
+    def choose_suggestion(self, player, room_name: str) -> Triplet:
+        suspect = choose_from_list("Choose a suspect:", SUSPECTS)
+        weapon = choose_from_list("Choose a weapon:", WEAPONS)
+        return suspect, weapon, room_name
+
+    def choose_card_to_show(self, refuter, suggester, matches: Sequence[str]) -> str:
+        #When human player is refuting, I let them choose which card to show
+        return choose_from_list(
+            f"{refuter.name}, choose a card to show {suggester.name}:",
+            list(matches),
+        )
+
+    def see_refutation(self, player, card: str, refuter) -> None:
+        print(f"The shown card is: {card}")
+
+    def accuse_after_unrefuted(self, player, triplet: Triplet) -> bool:
+        print("\nNo one could refute your suggestion.")
+        return ask_yes_no(
+            "Do you want to make an ACCUSATION with the same suspect/weapon/room? (y/n): "
+        )
+
+    def choose_accusation(self, player) -> Optional[Triplet]:
+        suspect = choose_from_list("Accuse Suspect:", SUSPECTS)
+        weapon = choose_from_list("Accuse Weapon:", WEAPONS)
+        room = choose_from_list("Accuse Room:", ROOMS)
+        print(f"\nCONFIRM ACCUSATION: {suspect} with the {weapon} in the {room}")
+        if not ask_yes_no("Are you sure? (y/n): "):
+            print("Accusation cancelled.")
+            return None
+        return suspect, weapon, room
+
+
+CONSOLE_DECISIONS = ConsoleDecisions()
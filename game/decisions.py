@@ -0,0 +1,111 @@
+# game/decisions.py
+
+#Decision providers: everything the rules need a player to decide goes through one of these,
+#so the same game flow works for a human at a terminal (game/console.py), an AI
+#(AIDecisions below) or anything else (a network client, a test script, ...).
+#
+#The mechanics take a resolver, player -> provider, because one suggestion involves
+#several players (the suggester and whoever refutes it).
+
+from __future__ import annotations
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from game.output import SUMMARY, VERBOSE
+
+Triplet = Tuple[str, str, str]
+
+#Turn actions returned by choose_turn_action
+MOVE = "move"
+ACCUSE = "accuse"
+QUIT = "quit"
+
+
+class DecisionProvider:
+    #Turn level (asked by the GameEngine)
+    def choose_turn_action(self, engine, player) -> str:
+        raise NotImplementedError
+
+    def stay_after_summon(self, engine, player, room_name: str) -> bool:
+        raise NotImplementedError
+
+    def use_secret_passage(self, engine, player, current_room_name: str, dest_room_name: str) -> bool:
+        raise NotImplementedError
+
+    #Movement
+    def plan_move(self, base_board, players, player, steps: int) -> Optional[List[str]]:
+        #Whole-roll plan, or None to be asked step by step with choose_move
+        return None
+
+    def choose_move(self, base_board, players, player, steps_remaining: int) -> str:
+        raise NotImplementedError
+
+    #Suggestions / accusations
+    def choose_suggestion(self, player, room_name: str) -> Triplet:
+        raise NotImplementedError
+
+    def choose_card_to_show(self, refuter, suggester, matches: Sequence[str]) -> str:
+        raise NotImplementedError
+
+    def see_refutation(self, player, card: str, refuter) -> None:
+        #The suggester is shown `card` by `refuter`
+        pass
+
+    def accuse_after_unrefuted(self, player, triplet: Triplet) -> bool:
+        raise NotImplementedError
+
+    def choose_accusation(self, player) -> Optional[Triplet]:
+        #None = changed their mind
+        raise NotImplementedError
+
+
+class AIDecisions(DecisionProvider):
+    #Thin adapter over the player's AIPlayerController (player.ai)
+
+    def choose_turn_action(self, engine, player) -> str:
+        if player.ai.check_for_winning_accusation():
+            engine.out.emit("ai_solved", SUMMARY, "\n💡 AI {player} has deduced the solution! Making accusation...",
+                            player=player.name)
+            return ACCUSE
+        return MOVE
+
+    def stay_after_summon(self, engine, player, room_name: str) -> bool:
+        engine.out.emit("ai_stays", VERBOSE, "AI {player} chooses to STAY and suggest.", player=player.name)
+        return True
+
+    def use_secret_passage(self, engine, player, current_room_name: str, dest_room_name: str) -> bool:
+        return player.ai.decide_use_secret_passage(current_room_name, dest_room_name)
+
+    def plan_move(self, base_board, players, player, steps: int) -> Optional[List[str]]:
+        return player.ai.plan_move(base_board, players, steps)
+
+    def choose_move(self, base_board, players, player, steps_remaining: int) -> str:
+        return player.ai.choose_move_command(base_board, players, steps_remaining)
+
+    def choose_suggestion(self, player, room_name: str) -> Triplet:
+        return player.ai.choose_suggestion(room_name)
+
+    def choose_card_to_show(self, refuter, suggester, matches: Sequence[str]) -> str:
+        return matches[0]
+
+    def see_refutation(self, player, card: str, refuter) -> None:
+        #The AI already has the card from the game's EventBus (game/events.py)
+        pass
+
+    def accuse_after_unrefuted(self, player, triplet: Triplet) -> bool:
+        return player.ai.decide_accusation_from_suggestion(triplet)
+
+    def choose_accusation(self, player) -> Optional[Triplet]:
+        return player.ai.choose_accusation()
+
+
+AI_DECISIONS = AIDecisions()
+
+Resolver = Callable[[object], DecisionProvider]
+
+
+def default_decisions(player) -> DecisionProvider:
+    #AI players decide for themselves, humans are asked at the terminal
+    if getattr(player, "is_ai", False) and getattr(player, "ai", None) is not None:
+        return AI_DECISIONS
+    from game.console import CONSOLE_DECISIONS
+    return CONSOLE_DECISIONS
@@ -0,0 +1,214 @@
+# game/engine.py
+
+#Headless game engine.
+#Owns the board, the players and the solution, and plays the game one turn at a time.
+#All decisions come from decision providers (game/decisions.py) and all narration goes
+#to an output sink (game/output.py), so an all-AI game runs without a terminal:
+#
+#    engine = GameEngine.new_game(ai_flags=[True] * 6, output=NullOutput())
+#    winner = engine.run_to_completion()
+#
+#main.py is the interactive CLI built on top of this.
+#
+#Each game owns one random.Random: seat order, solution, hands, dice and the AIs' random
+#choices all come from it, so GameEngine.new_game(seed=S) replays the same game every time.
+
+from __future__ import annotations
+import random
+from typing import Dict, List, Optional, Sequence
+
+from board.rooms import SECRET_PASSAGES, SECRET_PASSAGE_POSITIONS, get_room_name
+from entities.player import Player
+from game.decisions import Resolver, default_decisions, MOVE, ACCUSE, QUIT
+from game.events import EventBus
+from game.output import CONSOLE, SUMMARY, VERBOSE
+from game.setup import setup_game
+from game.state import GameState, capture_state, restore_state
+from mechanics.movement import move_player_turn
+from mechanics.suggestions import make_suggestion, make_accusation_standalone
+
+
+class GameEngine:
+    def __init__(self,
+                 base_board,
+                 players: List[Player],
+                 solution: Dict[str, str],
+                 decisions: Optional[Resolver] = None,
+                 output=None,
+                 rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None):
+        self.base_board = base_board
+        self.players = players
+        self.solution = solution
+        self.decisions: Resolver = decisions or default_decisions
+        self.out = output or CONSOLE
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+
+        #Suggestions / refutations / wrong accusations, heard by every AI (game/events.py)
+        self.events = EventBus(players)
+        for p in players:
+            if p.is_ai and p.ai is not None:
+                self.events.subscribe(p.name, p.ai)
+
+        self.current_player_index = 0
+        self.turn_count = 1
+        self.winner: Optional[Player] = None
+        self.finished = False
+        self.quit = False
+
+    @classmethod
+    def new_game(cls,
+                 ai_flags: Optional[Sequence[bool]] = None,
+                 debug: bool = False,
+                 decisions: Optional[Resolver] = None,
+                 output=None,
+                 seed: Optional[int] = None) -> "GameEngine":
+        #ai_flags=None asks at the terminal who is an AI (the CLI way).
+        #Without a seed one is drawn from the global random module and kept in engine.seed.
+        out = output or CONSOLE
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        rng = random.Random(seed)
+        base_board, players, solution = setup_game(debug=debug, ai_flags=ai_flags, out=out, rng=rng)
+        if debug:
+            out.write(f"\n=== [DEBUG] GAME SEED: {seed} ===", SUMMARY)
+        return cls(base_board, players, solution, decisions=decisions, output=out, rng=rng, seed=seed)
+
+    # ------------- state helpers -------------
+    @property
+    def current_player(self) -> Player:
+        return self.players[self.current_player_index % len(self.players)]
+
+    def active_players(self) -> List[Player]:
+        return [p for p in self.players if not p.is_eliminated]
+
+    def _end_turn(self) -> None:
+        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        self.turn_count += 1
+
+    def _win(self, player: Player) -> None:
+        self.winner = player
+        self.finished = True
+        self.out.emit("win", SUMMARY, player=player.name, turns=self.turn_count)
+
+    # ------------- snapshots (game/state.py) -------------
+    def snapshot(self) -> GameState:
+        return capture_state(self)
+
+    def restore(self, state: GameState) -> None:
+        restore_state(self, state)
+
+    # ------------- game flow -------------
+    def run_to_completion(self, max_turns: Optional[int] = None) -> Optional[Player]:
+        #Play until someone wins, everybody is eliminated, someone quits,
+        #or max_turns turns have been played. Returns the winner (or None).
+        while self.step():
+            if max_turns is not None and self.turn_count > max_turns:
+                break
+        return self.winner
+
+    def step(self) -> bool:
+        #Play one turn of the current player. Returns False once the game is over.
+        if self.finished:
+            return False
+
+        out = self.out
+
+        #Checking if the players are eliminated
+        if not self.active_players():
+            out.emit("game_over", SUMMARY, lambda: "\n".join([
+                "\n" + "=" * 40,
+                "       GAME OVER - ALL PLAYERS ELIMINATED",
+                f"       Total Turns: {self.turn_count}",
+                "=" * 40,
+            ]), turns=self.turn_count)
+            self.finished = True
+            return False
+
+        player = self.current_player
+
+        #skip the eliminated players
+        if player.is_eliminated:
+            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+            return True
+
+        chooser = self.decisions(player)
+        out.emit("turn", VERBOSE, turn=self.turn_count, player=player.name)
+
+        #1. Summon rule - connected with suggestion.py
+        if player.was_summoned:
+            room_name = get_room_name(player.in_room)
+            out.emit("was_summoned", VERBOSE, "\n❗ {player} was summoned to the {room}!",
+                     player=player.name, room=room_name)
+            player.was_summoned = False
+
+            if chooser.stay_after_summon(self, player, room_name):
+                if make_suggestion(player, self.players, self.solution, self.decisions, out, self.events):
+                    self._win(player)
+                    return False
+
+                if player.is_eliminated:
+                    out.emit("lost_turn", SUMMARY, "({player} lost the turn due to wrong accusation.)",
+                             player=player.name)
+
+                self._end_turn()
+                return True
+
+        #2. If they are not summoned, the next best thing is to check for secret passages
+        if player.in_room in SECRET_PASSAGES and not player.is_eliminated:
+            dest_room_id = SECRET_PASSAGES[player.in_room]
+            dest_room_name = get_room_name(dest_room_id)
+            current_room_name = get_room_name(player.in_room)
+
+            if chooser.use_secret_passage(self, player, current_room_name, dest_room_name):
+                player.move_to(SECRET_PASSAGE_POSITIONS[dest_room_id])
+                player.enter_room(dest_room_id)
+                out.emit("secret_passage", SUMMARY, "{player} uses the secret passage to the {room}!",
+                         player=player.name, room=dest_room_name, room_id=dest_room_id,
+                         pos=player.position)
+
+                if make_suggestion(player, self.players, self.solution, self.decisions, out, self.events):
+                    self._win(player)
+                    return False
+
+                if player.is_eliminated:
+                    out.emit("lost_turn", SUMMARY, "({player} lost the turn.)", player=player.name)
+
+                self._end_turn()
+                return True
+
+        #3. Regular turn, you can move or accuse
+        action = chooser.choose_turn_action(self, player)
+
+        if action == QUIT:
+            out.emit("quit", SUMMARY, "Quitting game...", player=player.name)
+            self.quit = True
+            self.finished = True
+            return False
+
+        if action == ACCUSE:
+            if make_accusation_standalone(player, self.solution, self.decisions, out, self.events):
+                self._win(player)
+                return False
+
+            #A cancelled accusation gives the same player another go
+            if player.is_eliminated:
+                self._end_turn()
+            return True
+
+        if action == MOVE:
+            out.emit("move_turn", VERBOSE, "\n--- {player}'s turn ---", player=player.name)
+            entered_room = move_player_turn(
+                self.base_board, self.players, player, self.decisions, out, self.rng
+            )
+
+            if entered_room and player.in_room is not None:
+                if make_suggestion(player, self.players, self.solution, self.decisions, out, self.events):
+                    self._win(player)
+                    return False
+
+            self._end_turn()
+            return True
+
+        raise ValueError(f"Unknown turn action: {action!r}")
@@ -0,0 +1,161 @@
+# game/eventlog.py
+
+#Append-only game log, written while the game runs.
+#EventLogWriter is an output sink (game/output.py): put it next to the normal output
+#with a TeeOutput and every event the mechanics emit is appended to the log as one
+#compact JSON line. game/replay.py reads it back.
+#
+#    log = EventLogWriter("game.cluedo.jsonl")
+#    engine = GameEngine.new_game(ai_flags=[True] * 6, output=TeeOutput(CONSOLE, log), seed=7)
+#    log.start(engine)
+#    engine.run_to_completion()
+#    log.close()
+#
+#File layout (one JSON object per line):
+#  {"log": 1, "seed": ..., "players": [...], "solution": {...}, "keyframe_every": K}   header
+#  {"k": turn, "seat": i, "pos": [[r, c], ...], "room": [...], "out": [...], "sum": [...]}
+#                                          keyframe: the full state at the start of a turn
+#  {"e": kind, "p": seat, ...}             event; players are referred to by seat number
+#  {"e": "step", "p": seat, "d": "w"}      a one-tile move is stored as its direction only
+#
+#A keyframe is written every K turns, and its turn and byte offset are appended to a
+#sidecar index (<log>.idx), so the replay can seek straight to the keyframe before any
+#turn and only replay the few events after it.
+
+from __future__ import annotations
+import json
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from game.output import OutputSink, SILENT, Text
+
+LOG_VERSION = 1
+DEFAULT_KEYFRAME_EVERY = 25
+
+#Direction letter for every one-tile move
+STEP_LETTERS = {(-1, 0): "w", (1, 0): "s", (0, -1): "a", (0, 1): "d"}
+STEP_VECTORS = {letter: vec for vec, letter in STEP_LETTERS.items()}
+
+#Event fields that name a player; they are stored as seat numbers
+PLAYER_FIELDS = {"player": "p", "to": "to"}
+
+
+def index_path(log_path: str) -> str:
+    return log_path + ".idx"
+
+
+def _dumps(record: dict) -> bytes:
+    return (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class EventLogWriter(OutputSink):
+    #Never shows any text itself
+    level = SILENT
+
+    def __init__(self, path: str, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1")
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._index = open(index_path(path), "w", encoding="utf-8")
+        self._offset = 0
+
+        self.engine = None
+        self._seats: Dict[str, int] = {}
+        #Last logged position of every seat, to delta-encode the steps
+        self._pos: List[Tuple[int, int]] = []
+        self._last_keyframe: Optional[int] = None
+
+    # ------------- writing -------------
+    def _append(self, record: dict) -> None:
+        if self._file is None:
+            return
+        data = _dumps(record)
+        self._file.write(data)
+        self._offset += len(data)
+
+    def start(self, engine) -> None:
+        #Header: everything that does not change during the game
+        self.engine = engine
+        self._seats = {p.name: i for i, p in enumerate(engine.players)}
+        self._pos = [p.position for p in engine.players]
+        self._append({
+            "log": LOG_VERSION,
+            "seed": engine.seed,
+            "keyframe_every": self.keyframe_every,
+            "solution": engine.solution,
+            "players": [
+                {"name": p.name, "token": p.token, "ai": p.is_ai, "hand": list(p.hand),
+                 "start": list(p.start_position)}
+                for p in engine.players
+            ],
+        })
+
+    def _keyframe(self, turn: int, seat: int) -> None:
+        players = self.engine.players
+        self._index.write(f"{turn} {self._offset}\n")
+        self._append({
+            "k": turn,
+            "seat": seat,
+            "pos": [list(p.position) for p in players],
+            "room": [p.in_room for p in players],
+            "out": [int(p.is_eliminated) for p in players],
+            "sum": [int(p.was_summoned) for p in players],
+        })
+        self._pos = [p.position for p in players]
+        self._last_keyframe = turn
+        #Everything up to a keyframe survives a crash
+        self._file.flush()
+        self._index.flush()
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        if self._file is None or self.engine is None:
+            return
+
+        seat = self._seats.get(fields.get("player"))
+        if kind == "turn":
+            turn = fields["turn"]
+            if self._last_keyframe is None or turn >= self._last_keyframe + self.keyframe_every:
+                self._keyframe(turn, seat)
+            self._append({"e": "turn", "p": seat, "t": turn})
+            return
+
+        if kind == "step":
+            pos = tuple(fields["pos"])
+            old = self._pos[seat]
+            self._pos[seat] = pos
+            letter = STEP_LETTERS.get((pos[0] - old[0], pos[1] - old[1]))
+            if letter is not None:
+                self._append({"e": "step", "p": seat, "d": letter})
+            else:
+                self._append({"e": "step", "p": seat, "pos": list(pos)})
+            return
+
+        record = {"e": kind}
+        for key, value in fields.items():
+            short = PLAYER_FIELDS.get(key)
+            if short is not None:
+                record[short] = self._seats.get(value, value)
+            elif isinstance(value, tuple):
+                record[key] = list(value)
+            else:
+                record[key] = value
+        if "pos" in fields and seat is not None:
+            #Jumps (summons, secret passages) are stored in full
+            self._pos[seat] = tuple(fields["pos"])
+        self._append(record)
+
+    def write(self, text: str = "", level: int = 0) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._index.close()
+            self._file = None
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,75 @@
+# game/events.py
+
+#Table talk: what everybody at the table hears.
+#Who suggested what, who could not refute it, who showed a card and who accused wrongly is
+#public in Cluedo; only the card shown is private to the suggester. mechanics/suggestions.py
+#publishes each suggestion (with its passes and refutation) and each wrong accusation on the
+#game's EventBus, and every subscribed listener - the AIPlayerControllers - gets it, so every
+#AI learns from the other players' turns as well as from its own.
+#
+#A publish is one loop over the subscribers. The suggester's listener gets the event with the
+#card, everybody else the same event with card=None.
+#
+#A listener has three methods:
+#    on_table(names, hand_sizes)      seat order and hand sizes, once, when it subscribes
+#    on_suggestion(event)             a SuggestionEvent
+#    on_accusation(event)             an AccusationEvent (a wrong accusation)
+
+from __future__ import annotations
+from typing import List, NamedTuple, Optional, Tuple
+
+Triplet = Tuple[str, str, str]
+
+
+class SuggestionEvent(NamedTuple):
+    suggester: str
+    triplet: Triplet
+    passers: Tuple[str, ...]   #could not refute, in the order they were asked
+    refuter: Optional[str]     #None if nobody could refute
+    card: Optional[str]        #the card shown; None for everybody but the suggester
+
+
+class AccusationEvent(NamedTuple):
+    player: str
+    triplet: Triplet
+
+
+class EventBus:
+    def __init__(self, players):
+        #players: the table's seat list (the GameEngine's, kept by reference)
+        self.players = players
+        self._listeners: List[Tuple[str, object]] = []
+
+    @classmethod
+    def for_players(cls, players) -> "EventBus":
+        #A bus with every AI of the table subscribed (for callers without a GameEngine)
+        bus = cls(players)
+        for p in players:
+            if p.is_ai and p.ai is not None:
+                bus.subscribe(p.name, p.ai)
+        return bus
+
+    def subscribe(self, name: str, listener) -> None:
+        #name: the seat the listener plays (it gets the cards shown to that seat)
+        self.unsubscribe(listener)
+        self._listeners.append((name, listener))
+        listener.on_table([p.name for p in self.players], [len(p.hand) for p in self.players])
+
+    def unsubscribe(self, listener) -> None:
+        self._listeners = [(n, l) for n, l in self._listeners if l is not listener]
+
+    def __len__(self) -> int:
+        return len(self._listeners)
+
+    # ------------- publishing -------------
+    def suggestion(self, suggester: str, triplet: Triplet, passers, refuter: Optional[str],
+                   card: Optional[str]) -> None:
+        private = SuggestionEvent(suggester, tuple(triplet), tuple(passers), refuter, card)
+        public = private._replace(card=None)
+        for name, listener in self._listeners:
+            listener.on_suggestion(private if name == suggester else public)
+
+    def accusation(self, player: str, triplet: Triplet) -> None:
+        event = AccusationEvent(player, tuple(triplet))
+        for _, listener in self._listeners:
+            listener.on_accusation(event)
@@ -0,0 +1,137 @@
+# game/output.py
+
+#Where game narration goes.
+#The mechanics used to print() directly, so a game could not run without a terminal.
+#Now they emit into an output sink instead:
+#
+#    out.emit("roll", SUMMARY, "\n{player} rolled a {dice}.", player=player.name, dice=dice)
+#
+#Every event has a kind, a level and its data as keyword fields. The text is a
+#str.format template (or a zero-argument callable for anything fancier) and is only
+#filled in when the sink is going to show it, so a silent or JSON game never formats
+#a line or a board. Anything expensive is guarded with out.enabled(level) first.
+#
+#Sinks:
+#  ConsoleOutput   print()s the text up to its level (the CLI uses VERBOSE = the full text)
+#  BufferedOutput  same, but keeps the lines in a list
+#  NullOutput      drops everything (simulations)
+#  JsonEventOutput one JSON object per event, no text at all
+#  TeeOutput       fans out to several sinks (e.g. console text + game/eventlog.py)
+
+from __future__ import annotations
+import json
+import sys
+from typing import Callable, List, Optional, TextIO, Union
+
+#Levels, from quietest to chattiest
+SILENT = 0
+SUMMARY = 1   #suggestions, refutations, accusations, eliminations, the result
+VERBOSE = 2   #everything: rolls, boards, every step, rule messages
+
+LEVELS = {"silent": SILENT, "summary": SUMMARY, "verbose": VERBOSE}
+OUTPUT_MODES = ("silent", "summary", "verbose", "json")
+
+Text = Union[str, Callable[[], str], None]
+
+
+class OutputSink:
+    level = VERBOSE
+
+    def enabled(self, level: int) -> bool:
+        #Would text at this level be shown?
+        return level <= self.level
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        if text is None or level > self.level:
+            return
+        if callable(text):
+            text = text()
+        elif fields:
+            text = text.format(**fields)
+        self._put(text)
+
+    def write(self, text: str = "", level: int = VERBOSE) -> None:
+        #Plain line of text with no event behind it
+        if level <= self.level:
+            self._put(text)
+
+    def _put(self, text: str) -> None:
+        raise NotImplementedError
+
+
+class ConsoleOutput(OutputSink):
+    def __init__(self, level: int = VERBOSE):
+        self.level = level
+
+    def _put(self, text: str) -> None:
+        print(text)
+
+
+class BufferedOutput(OutputSink):
+    def __init__(self, level: int = VERBOSE):
+        self.level = level
+        self.lines: List[str] = []
+
+    def _put(self, text: str) -> None:
+        self.lines.append(text)
+
+
+class NullOutput(OutputSink):
+    level = SILENT
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        pass
+
+    def write(self, text: str = "", level: int = VERBOSE) -> None:
+        pass
+
+
+class JsonEventOutput(OutputSink):
+    #Structured events, one JSON object per line: {"event": kind, ...fields}.
+    #level filters the events themselves; no text is ever formatted.
+    level = SILENT
+
+    def __init__(self, stream: Optional[TextIO] = None, event_level: int = VERBOSE):
+        self.stream = stream or sys.stdout
+        self.event_level = event_level
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        if level > self.event_level:
+            return
+        record = {"event": kind}
+        record.update(fields)
+        self.stream.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def write(self, text: str = "", level: int = VERBOSE) -> None:
+        pass
+
+
+class TeeOutput(OutputSink):
+    def __init__(self, *sinks: OutputSink):
+        self.sinks = [s for s in sinks if s is not None]
+        self.level = max((s.level for s in self.sinks), default=SILENT)
+
+    def enabled(self, level: int) -> bool:
+        return any(s.enabled(level) for s in self.sinks)
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        for s in self.sinks:
+            s.emit(kind, level, text, **fields)
+
+    def write(self, text: str = "", level: int = VERBOSE) -> None:
+        for s in self.sinks:
+            s.write(text, level)
+
+
+def make_output(mode: str = "verbose", stream: Optional[TextIO] = None) -> OutputSink:
+    #mode: one of OUTPUT_MODES
+    if mode == "json":
+        return JsonEventOutput(stream)
+    if mode == "silent":
+        return NullOutput()
+    if mode not in LEVELS:
+        raise ValueError(f"Unknown output mode: {mode!r} (expected one of {', '.join(OUTPUT_MODES)})")
+    return ConsoleOutput(LEVELS[mode])
+
+
+CONSOLE = ConsoleOutput()
@@ -0,0 +1,79 @@
+# game/pacing.py
+
+#How fast an autoplay game is shown.
+#The CLI used to sleep inside the AI decisions (0.05 s per action, 1 s before a winning
+#accusation). Now the game loop asks one pacer to wait after every turn instead:
+#
+#  turbo      no delay at all (unattended games, CI)
+#  fixed:S    sleep S seconds after every turn (a bare number means the same)
+#  fps:N      "real time" for spectators: at most N turns per second; time spent
+#             playing and drawing the turn counts towards the frame, so a slow turn
+#             is not followed by an extra sleep
+
+from __future__ import annotations
+import time
+from typing import Optional
+
+DEFAULT_PACE = "fixed:0.05"
+
+
+class TurboPacer:
+    def tick(self) -> None:
+        pass
+
+    def __str__(self) -> str:
+        return "turbo"
+
+
+class FixedDelayPacer:
+    def __init__(self, delay: float):
+        if delay < 0:
+            raise ValueError("Delay must not be negative")
+        self.delay = delay
+
+    def tick(self) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+
+    def __str__(self) -> str:
+        return f"fixed:{self.delay:g}"
+
+
+class FrameRatePacer:
+    def __init__(self, fps: float):
+        if fps <= 0:
+            raise ValueError("Frames per second must be positive")
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self._next_frame: Optional[float] = None
+
+    def tick(self) -> None:
+        now = time.monotonic()
+        if self._next_frame is None:
+            self._next_frame = now + self.interval
+            return
+
+        if now < self._next_frame:
+            time.sleep(self._next_frame - now)
+            self._next_frame += self.interval
+        else:
+            #Running late: start counting again from now instead of rushing to catch up
+            self._next_frame = now + self.interval
+
+    def __str__(self) -> str:
+        return f"fps:{self.fps:g}"
+
+
+def make_pacer(pace: str = DEFAULT_PACE):
+    #"turbo", "fixed:0.25", "0.25" or "fps:10"
+    text = pace.strip().lower()
+    try:
+        if text == "turbo":
+            return TurboPacer()
+        if text.startswith("fps:"):
+            return FrameRatePacer(float(text[4:]))
+        if text.startswith("fixed:"):
+            text = text[6:]
+        return FixedDelayPacer(float(text))
+    except ValueError as e:
+        raise ValueError(f"Invalid pace {pace!r}: use turbo, fixed:SECONDS or fps:N ({e})") from None
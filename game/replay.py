@@ -0,0 +1,209 @@
+# game/replay.py
+
+#Replay of a log written by game/eventlog.py.
+#GameLog.state_at(turn) seeks to the last keyframe at or before that turn (found with
+#the sidecar index, or by one scan of the file if the index is missing) and then only
+#applies the events after it, so turn 500 of a long game costs one keyframe and a
+#handful of events, not 500 turns.
+#
+#Run from the project root:
+#    python -m game.replay game.cluedo.jsonl --turn 120
+#    python -m game.replay game.cluedo.jsonl --turn 120 --events 2
+
+from __future__ import annotations
+import argparse
+import bisect
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from board.grid import format_board, get_board_array, overlay_players_on_board
+from board.rooms import get_room_name
+from entities.occupancy import OccupancyIndex
+from entities.player import Player
+from game.eventlog import LOG_VERSION, STEP_VECTORS, index_path
+
+
+class ReplayState:
+    #Board-level state of the game at the start of a turn
+    def __init__(self, header: dict):
+        self.header = header
+        self.players: List[Player] = []
+        for meta in header["players"]:
+            p = Player(name=meta["name"], token=meta["token"], start_position=tuple(meta["start"]))
+            p.hand = list(meta["hand"])
+            p.is_ai = meta["ai"]
+            self.players.append(p)
+        OccupancyIndex(self.players)
+
+        self.turn = 1
+        self.seat = 0
+        self.winner: Optional[int] = None
+        self.finished = False
+
+    def load_keyframe(self, frame: dict) -> None:
+        self.turn = frame["k"]
+        self.seat = frame["seat"]
+        for p, pos, room, out, summoned in zip(
+            self.players, frame["pos"], frame["room"], frame["out"], frame["sum"]
+        ):
+            p.move_to(tuple(pos))
+            p.in_room = room
+            p.is_eliminated = bool(out)
+            p.was_summoned = bool(summoned)
+
+    def apply(self, record: dict) -> None:
+        kind = record.get("e")
+        seat = record.get("p")
+        p = self.players[seat] if seat is not None else None
+
+        if kind == "step":
+            if "d" in record:
+                dr, dc = STEP_VECTORS[record["d"]]
+                r, c = p.position
+                p.move_to((r + dr, c + dc))
+            else:
+                p.move_to(tuple(record["pos"]))
+        elif kind == "turn":
+            self.turn = record["t"]
+            self.seat = seat
+        elif kind == "enter_room":
+            p.in_room = record["room"]
+        elif kind == "exit_room":
+            p.in_room = None
+        elif kind in ("summoned", "secret_passage"):
+            p.move_to(tuple(record["pos"]))
+            p.in_room = record["room_id"]
+            if kind == "summoned":
+                p.was_summoned = True
+        elif kind == "was_summoned":
+            p.was_summoned = False
+        elif kind == "accusation" and not record["correct"]:
+            p.is_eliminated = True
+        elif kind == "win":
+            self.winner = seat
+            self.finished = True
+        elif kind in ("game_over", "quit"):
+            self.finished = True
+
+    def board(self):
+        return overlay_players_on_board(get_board_array(), self.players)
+
+
+class GameLog:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            first = f.readline()
+            self.header = json.loads(first)
+            if self.header.get("log") != LOG_VERSION:
+                raise ValueError(f"{path}: unsupported log version {self.header.get('log')!r}")
+            self._body_offset = len(first)
+        self.keyframes: List[Tuple[int, int]] = self._load_index()
+        self._keyframe_turns = [turn for turn, _ in self.keyframes]
+
+    def _load_index(self) -> List[Tuple[int, int]]:
+        idx = index_path(self.path)
+        if os.path.exists(idx):
+            with open(idx, encoding="utf-8") as f:
+                return [tuple(int(x) for x in line.split()) for line in f if line.strip()]
+        #No sidecar: one pass over the log to find the keyframes
+        frames = []
+        with open(self.path, "rb") as f:
+            offset = self._body_offset
+            f.seek(offset)
+            for line in f:
+                if line.startswith(b'{"k":'):
+                    frames.append((json.loads(line)["k"], offset))
+                offset += len(line)
+        return frames
+
+    def records(self, offset: Optional[int] = None) -> Iterator[dict]:
+        with open(self.path, "rb") as f:
+            f.seek(self._body_offset if offset is None else offset)
+            for line in f:
+                yield json.loads(line)
+
+    def _seek(self, turn: int) -> Optional[int]:
+        #Offset of the last keyframe at or before `turn` (None = start of the log)
+        i = bisect.bisect_right(self._keyframe_turns, turn) - 1
+        return self.keyframes[i][1] if i >= 0 else None
+
+    def state_at(self, turn: int) -> ReplayState:
+        #State at the start of `turn` (or the final state if the game ended earlier)
+        state = ReplayState(self.header)
+        for record in self.records(self._seek(turn)):
+            if "k" in record:
+                if record["k"] > turn:
+                    break
+                state.load_keyframe(record)
+                if record["k"] == turn:
+                    break
+            elif record.get("e") == "turn" and record["t"] >= turn:
+                #Who is about to play, but nothing of their turn yet
+                state.apply(record)
+                break
+            else:
+                state.apply(record)
+        return state
+
+    def events(self, turn: int, count: int = 1) -> Iterator[dict]:
+        #The events of `count` turns, starting with `turn`
+        started = False
+        for record in self.records(self._seek(turn)):
+            if "k" in record:
+                continue
+            if record.get("e") == "turn":
+                if record["t"] >= turn + count:
+                    return
+                if record["t"] >= turn:
+                    started = True
+            if started:
+                yield record
+
+
+def _describe(state: ReplayState) -> str:
+    lines = [f"=== TURN {state.turn} | next to play: {state.players[state.seat].name} ==="]
+    for seat, p in enumerate(state.players):
+        where = get_room_name(p.in_room) if p.in_room is not None else f"hallway {p.position}"
+        flags = []
+        if p.is_eliminated:
+            flags.append("eliminated")
+        if p.was_summoned:
+            flags.append("summoned")
+        lines.append(f"  {seat + 1}. {p.name:<16} [{p.token}] {where}" + (f" ({', '.join(flags)})" if flags else ""))
+    if state.finished:
+        result = state.players[state.winner].name + " won" if state.winner is not None else "no winner"
+        lines.append(f"Game over: {result}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a game log written with --log.")
+    parser.add_argument("log")
+    parser.add_argument("--turn", type=int, default=None,
+                        help="show the state at the start of this turn (default: the end of the game)")
+    parser.add_argument("--events", type=int, default=0, metavar="N",
+                        help="also list the events of the next N turns")
+    parser.add_argument("--no-board", action="store_true")
+    args = parser.parse_args(argv)
+
+    log = GameLog(args.log)
+    turn = args.turn if args.turn is not None else 10 ** 9
+    state = log.state_at(turn)
+
+    print(f"Log: {args.log} (seed {log.header.get('seed')}, {len(log.keyframes)} keyframes)")
+    if not args.no_board:
+        print(format_board(state.board()))
+    print(_describe(state))
+
+    if args.events:
+        print(f"\n=== EVENTS, TURNS {state.turn}-{state.turn + args.events - 1} ===")
+        names = [p.name for p in state.players]
+        for record in log.events(state.turn, args.events):
+            shown = {k: (names[v] if k in ("p", "to") and isinstance(v, int) else v) for k, v in record.items()}
+            print(json.dumps(shown, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# game/savefile.py
+
+#Save / resume a whole game.
+#A save is the GameState (game/state.py) plus the game's RNG state, written as gzipped
+#JSON with a format name and a version number. Loading it gives a GameEngine that plays
+#on exactly as the saved one would have, because the rolls and AI choices come from the
+#same random stream.
+#
+#    save_game(engine, "game.cluedo", meta={"autoplay": True})
+#    engine, meta = load_game("game.cluedo", decisions=..., output=...)
+#
+#Saves are written to a temporary file and renamed into place, so a crash while saving
+#never leaves a half-written checkpoint behind.
+
+from __future__ import annotations
+import base64
+import gzip
+import json
+import os
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ai.knowledge import NotebookState
+from board.grid import board_rows, encode_board
+from entities.character import CHARACTERS
+from entities.occupancy import OccupancyIndex
+from entities.player import Player
+from game.engine import GameEngine
+from game.state import GameState, PlayerState, capture_state, restore_state, shared_board
+
+SAVE_FORMAT = "cluedo-save"
+SAVE_VERSION = 1
+DEFAULT_SAVE_PATH = "cluedo_save.json.gz"
+
+
+# ------------- RNG state -------------
+def _encode_rng(rng: random.Random) -> dict:
+    version, internal, gauss_next = rng.getstate()
+    words = np.asarray(internal, dtype="<u4").tobytes()
+    return {"v": version, "mt": base64.b64encode(words).decode("ascii"), "gauss": gauss_next}
+
+
+def _decode_rng(data: dict) -> random.Random:
+    words = np.frombuffer(base64.b64decode(data["mt"]), dtype="<u4")
+    rng = random.Random()
+    rng.setstate((data["v"], tuple(int(w) for w in words), data["gauss"]))
+    return rng
+
+
+# ------------- GameState <-> JSON -------------
+def _notebook_to_json(nb: Optional[NotebookState]):
+    if nb is None:
+        return None
+    data = {
+        "suspects": sorted(nb.possible_suspects),
+        "weapons": sorted(nb.possible_weapons),
+        "rooms": sorted(nb.possible_rooms),
+        "seen": sorted(nb.seen_cards),
+        "visits": dict(nb.room_visit_count),
+        "suggestions": dict(nb.room_suggestion_count),
+        "last_room": nb.last_room,
+    }
+    if nb.wrong_accusations:
+        data["wrong"] = [sorted(cards) for cards in nb.wrong_accusations]
+    if nb.holders:
+        data["table"] = {
+            "owner": nb.owner,
+            "holders": list(nb.holders),
+            "sizes": list(nb.hand_sizes),
+            "holds": [sorted(cards) for cards in nb.holds],
+            "lacks": [sorted(cards) for cards in nb.lacks],
+            "clauses": [[name, sorted(cards)] for name, cards in nb.clauses],
+        }
+    return data
+
+
+def _notebook_from_json(data) -> Optional[NotebookState]:
+    if data is None:
+        return None
+    state = NotebookState(
+        possible_suspects=frozenset(data["suspects"]),
+        possible_weapons=frozenset(data["weapons"]),
+        possible_rooms=frozenset(data["rooms"]),
+        seen_cards=frozenset(data["seen"]),
+        room_visit_count=tuple(sorted(data["visits"].items())),
+        room_suggestion_count=tuple(sorted(data["suggestions"].items())),
+        last_room=data["last_room"],
+    )
+    if data.get("wrong"):
+        state = state._replace(wrong_accusations=tuple(frozenset(cards) for cards in data["wrong"]))
+    table = data.get("table")
+    if table is None:
+        return state
+    return state._replace(
+        owner=table["owner"],
+        holders=tuple(table["holders"]),
+        hand_sizes=tuple(table["sizes"]),
+        holds=tuple(frozenset(cards) for cards in table["holds"]),
+        lacks=tuple(frozenset(cards) for cards in table["lacks"]),
+        clauses=tuple((name, frozenset(cards)) for name, cards in table["clauses"]),
+    )
+
+
+def state_to_json(state: GameState) -> dict:
+    return {
+        #The standard board is not stored, only a board that differs from it
+        "board": None if state.board is shared_board() else board_rows(state.board.codes),
+        "players": [
+            {
+                "name": p.name, "token": p.token, "pos": list(p.position), "room": p.in_room,
+                "hand": list(p.hand), "ai": p.is_ai, "summoned": p.was_summoned, "out": p.is_eliminated,
+            }
+            for p in state.players
+        ],
+        "solution": list(state.solution),
+        "notebooks": [_notebook_to_json(nb) for nb in state.notebooks],
+        "current": state.current_player_index,
+        "turn": state.turn_count,
+        "winner": state.winner,
+        "finished": state.finished,
+    }
+
+
+def state_from_json(data: dict) -> GameState:
+    board = shared_board() if data["board"] is None else shared_board(encode_board(data["board"]))
+    return GameState(
+        board=board,
+        players=tuple(
+            PlayerState(
+                name=p["name"], token=p["token"], position=tuple(p["pos"]), in_room=p["room"],
+                hand=tuple(p["hand"]), is_ai=p["ai"], was_summoned=p["summoned"], is_eliminated=p["out"],
+            )
+            for p in data["players"]
+        ),
+        solution=tuple(data["solution"]),
+        notebooks=tuple(_notebook_from_json(nb) for nb in data["notebooks"]),
+        current_player_index=data["current"],
+        turn_count=data["turn"],
+        winner=data["winner"],
+        finished=data["finished"],
+    )
+
+
+# ------------- files -------------
+def save_game(engine: GameEngine, path: str = DEFAULT_SAVE_PATH, meta: Optional[dict] = None) -> str:
+    #meta: anything the front end wants back on load (e.g. the CLI's autoplay flag)
+    payload = {
+        "format": SAVE_FORMAT,
+        "version": SAVE_VERSION,
+        "seed": engine.seed,
+        "state": state_to_json(capture_state(engine)),
+        "rng": _encode_rng(engine.rng),
+        "meta": meta or {},
+    }
+    data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        #mtime=0: the same game always gives the same bytes
+        f.write(gzip.compress(data, mtime=0))
+    os.replace(tmp, path)
+    return path
+
+
+def read_save(path: str) -> dict:
+    with open(path, "rb") as f:
+        payload = json.loads(gzip.decompress(f.read()))
+    if payload.get("format") != SAVE_FORMAT:
+        raise ValueError(f"{path} is not a Cluedo save file")
+    if payload.get("version") != SAVE_VERSION:
+        raise ValueError(f"{path}: unsupported save version {payload.get('version')!r} (expected {SAVE_VERSION})")
+    return payload
+
+
+def load_game(path: str = DEFAULT_SAVE_PATH, decisions=None, output=None) -> Tuple[GameEngine, dict]:
+    #Returns the engine, ready for its next step(), and the meta dict given to save_game
+    payload = read_save(path)
+    state = state_from_json(payload["state"])
+
+    players = [
+        Player(name=p.name, token=p.token,
+               start_position=tuple(CHARACTERS.get(p.name, {}).get("start_pos", p.position)))
+        for p in state.players
+    ]
+    OccupancyIndex(players)
+    solution = dict(zip(("suspect", "weapon", "room"), state.solution))
+
+    engine = GameEngine(
+        np.array(state.board.codes), players, solution,
+        decisions=decisions, output=output,
+        rng=_decode_rng(payload["rng"]), seed=payload.get("seed"),
+    )
+    restore_state(engine, state)
+    return engine, payload.get("meta", {})
@@ -0,0 +1,642 @@
+# game/server.py
+
+#Multi-game server: many tables in one process, for local clients.
+#The asyncio loop owns the sockets; every table runs its GameEngine in its own thread, because
+#the rules (mechanics/) ask their decisions synchronously in the middle of a turn. A human seat
+#is a RemoteDecisions provider: it sends a prompt to the seat's client and the game thread
+#waits on a future that the loop completes when the answer comes in, so the loop itself never
+#waits for anybody. AI seats use AIDecisions as usual.
+#
+#Protocol: one JSON object per line, both ways. Requests have an "op":
+#  {"op": "create", "seats": ["human", "ai", ...], "seed": 7, "move_timeout": 60,
+#   "join_timeout": 300, "game_timeout": 3600, "events": "summary", "turn_delay": 0,
+#   "watch": true}                            (also follow it)           -> "created"
+#  {"op": "join", "table": 1, "seat": 0}     take a human seat          -> "joined" (with the hand)
+#  {"op": "watch", "table": 1}               public events only         -> "watching"
+#  {"op": "answer", "table": 1, "id": 5, "value": ...}                 answer to a prompt
+#  {"op": "leave", "table": 1}               give the seat to an AI
+#  {"op": "list"}                                                       -> "tables"
+#Messages from the server: "event" (game events, see game/output.py), "prompt" (a decision
+#for your seat, with "ask", "id" and "timeout"), "over" (result) and "error" (with the
+#"request" op and prompt "id" it answers; a rejected answer leaves the prompt open).
+#
+#A table starts as soon as every human seat is taken; one that is still waiting for players
+#after join_timeout, or whose creator disconnects before it starts, is closed. A seat whose
+#player does not answer within move_timeout, leaves or disconnects is handed to an AI for the
+#rest of the game (a player who was only too slow keeps receiving the public events, like a
+#watcher); a table still running after game_timeout is closed. The card shown in a refutation is only sent to
+#the player it was shown to.
+#
+#Run from the project root:
+#    python -m game.server --port 7777
+#    python -m game.server --unix /tmp/cluedo.sock
+#python -m game.client is a terminal client, benchmarks/server_load.py a load generator.
+
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from game.cards import SUSPECTS, WEAPONS, ROOMS
+from game.decisions import AI_DECISIONS, DecisionProvider, MOVE, ACCUSE
+from game.engine import GameEngine
+from game.output import LEVELS, OutputSink, SILENT, SUMMARY, Text
+from game.setup import set_player_ai
+from game.simulate import DEFAULT_MAX_TURNS
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+DEFAULT_MOVE_TIMEOUT = 60.0
+DEFAULT_JOIN_TIMEOUT = 300.0
+DEFAULT_GAME_TIMEOUT = 3600.0
+#A client that lets this much output pile up unread is disconnected
+MAX_BUFFERED = 1 << 20
+MAX_LINE = 1 << 16
+#Pending connections the OS queues for us (asyncio's default of 100 drops bursts of clients)
+BACKLOG = 1024
+
+HUMAN = "human"
+AI = "ai"
+SEAT_KINDS = (HUMAN, AI)
+MOVE_COMMANDS = ("w", "a", "s", "d", "done")
+
+
+def _dumps(message: dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class TableClosed(Exception):
+    #Raised in a table's game thread when the table is shut down mid-game
+    pass
+
+
+# ------------- answer checks: value -> (ok, decision) -------------
+def _one_of(options: Tuple) -> Callable:
+    return lambda value: (value in options, value)
+
+
+def _yes_no(value) -> Tuple[bool, bool]:
+    return isinstance(value, bool), value
+
+
+def _triplet(value, with_room: Optional[str] = None) -> Tuple[bool, Optional[Tuple[str, str, str]]]:
+    if not isinstance(value, dict):
+        return False, None
+    room = with_room if with_room is not None else value.get("room")
+    ok = value.get("suspect") in SUSPECTS and value.get("weapon") in WEAPONS and room in ROOMS
+    return ok, (value.get("suspect"), value.get("weapon"), room)
+
+
+def _accusation(value):
+    #null = changed their mind
+    if value is None:
+        return True, None
+    return _triplet(value)
+
+
+class _Prompt:
+    __slots__ = ("seat", "check", "future")
+
+    def __init__(self, seat: int, check: Callable):
+        self.seat = seat
+        self.check = check
+        self.future: Future = Future()
+
+    def settle(self, result=None, exception: Optional[BaseException] = None) -> bool:
+        #Complete the prompt from the loop. False if it was already answered, closed or
+        #cancelled by the game thread timing out (that can happen between any check and this)
+        try:
+            if exception is not None:
+                self.future.set_exception(exception)
+            else:
+                self.future.set_result(result)
+        except InvalidStateError:
+            return False
+        return True
+
+
+class TableOutput(OutputSink):
+    #Game events of one table, forwarded to its clients (text is never formatted)
+    level = SILENT
+
+    def __init__(self, table: "Table", event_level: int = SUMMARY):
+        self.table = table
+        self.event_level = event_level
+
+    def emit(self, kind: str, level: int, text: Text = None, **fields) -> None:
+        if level <= self.event_level:
+            self.table.publish(kind, fields)
+
+    def write(self, text: str = "", level: int = 0) -> None:
+        pass
+
+
+class RemoteDecisions(DecisionProvider):
+    #A human seat: every decision becomes a prompt to the seat's client.
+    #`fallback` is what the AI would do; it is used once the seat has been handed to an AI.
+    def __init__(self, table: "Table"):
+        self.table = table
+
+    def _ask(self, player, ask: str, check: Callable, fallback: Callable, **info):
+        seat = self.table.seat_of(player)
+        answered, value = self.table.ask(seat, ask, check, **info)
+        if answered:
+            return value
+        return fallback()
+
+    def choose_turn_action(self, engine, player) -> str:
+        return self._ask(player, "turn_action", _one_of((MOVE, ACCUSE)),
+                         lambda: AI_DECISIONS.choose_turn_action(engine, player),
+                         options=[MOVE, ACCUSE])
+
+    def stay_after_summon(self, engine, player, room_name: str) -> bool:
+        return self._ask(player, "stay_after_summon", _yes_no,
+                         lambda: AI_DECISIONS.stay_after_summon(engine, player, room_name),
+                         room=room_name)
+
+    def use_secret_passage(self, engine, player, current_room_name: str, dest_room_name: str) -> bool:
+        return self._ask(player, "secret_passage", _yes_no,
+                         lambda: AI_DECISIONS.use_secret_passage(engine, player, current_room_name, dest_room_name),
+                         room=current_room_name, to=dest_room_name)
+
+    def plan_move(self, base_board, players, player, steps: int):
+        if player.is_ai and player.ai is not None:
+            return AI_DECISIONS.plan_move(base_board, players, player, steps)
+        return None
+
+    def choose_move(self, base_board, players, player, steps_remaining: int) -> str:
+        return self._ask(player, "move", _one_of(MOVE_COMMANDS),
+                         lambda: AI_DECISIONS.choose_move(base_board, players, player, steps_remaining),
+                         options=list(MOVE_COMMANDS), pos=player.position, steps=steps_remaining)
+
+    def choose_suggestion(self, player, room_name: str):
+        return self._ask(player, "suggestion", lambda v: _triplet(v, room_name),
+                         lambda: AI_DECISIONS.choose_suggestion(player, room_name),
+                         room=room_name)
+
+    def choose_card_to_show(self, refuter, suggester, matches) -> str:
+        return self._ask(refuter, "show_card", _one_of(tuple(matches)),
+                         lambda: AI_DECISIONS.choose_card_to_show(refuter, suggester, matches),
+                         options=list(matches), to=suggester.name)
+
+    def see_refutation(self, player, card: str, refuter) -> None:
+        #The "refuted" event already carries the card to this player (and an AI that has
+        #taken the seat over hears it on the EventBus)
+        pass
+
+    def accuse_after_unrefuted(self, player, triplet) -> bool:
+        return self._ask(player, "accuse_now", _yes_no,
+                         lambda: AI_DECISIONS.accuse_after_unrefuted(player, triplet),
+                         suspect=triplet[0], weapon=triplet[1], room=triplet[2])
+
+    def choose_accusation(self, player):
+        return self._ask(player, "accusation", _accusation,
+                         lambda: AI_DECISIONS.choose_accusation(player))
+
+
+class Client:
+    _ids = itertools.count(1)
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.id = next(self._ids)
+        self.writer = writer
+        #table id -> seat (None = watching)
+        self.tables: Dict[int, Optional[int]] = {}
+        #Tables this client created (closed if it goes away before they start)
+        self.created: Set[int] = set()
+        self.closed = False
+
+    def send(self, message: dict) -> None:
+        if self.closed:
+            return
+        self.writer.write(_dumps(message))
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            #Not reading its messages: drop it rather than buffer without limit
+            self.close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class Table:
+    def __init__(self, table_id: int, server: "GameServer", seats: List[str],
+                 seed: Optional[int] = None,
+                 move_timeout: float = DEFAULT_MOVE_TIMEOUT,
+                 join_timeout: float = DEFAULT_JOIN_TIMEOUT,
+                 game_timeout: float = DEFAULT_GAME_TIMEOUT,
+                 event_level: int = SUMMARY,
+                 turn_delay: float = 0.0,
+                 max_turns: int = DEFAULT_MAX_TURNS):
+        self.id = table_id
+        self.server = server
+        self.loop = server.loop
+        self.move_timeout = move_timeout
+        self.game_timeout = game_timeout
+        self.turn_delay = turn_delay
+        self.max_turns = max_turns
+
+        self.remote = RemoteDecisions(self)
+        self.engine = GameEngine.new_game(
+            ai_flags=[kind == AI for kind in seats],
+            decisions=self._decisions,
+            output=TableOutput(self, event_level),
+            seed=seed,
+        )
+        self.seats = list(seats)
+        self.players: Dict[int, Client] = {}
+        self.watchers: Set[Client] = set()
+
+        self._prompts: Dict[int, _Prompt] = {}
+        self._prompt_ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        #The lobby deadline until the game starts, then game_timeout
+        self._timer: Optional[asyncio.TimerHandle] = self.loop.call_later(
+            join_timeout, self.close, "join_timeout")
+
+    def _decisions(self, player) -> DecisionProvider:
+        if player.is_ai and player.ai is not None:
+            return AI_DECISIONS
+        return self.remote
+
+    def seat_of(self, player) -> int:
+        return self.engine.players.index(player)
+
+    def open_seats(self) -> List[int]:
+        return [i for i, kind in enumerate(self.seats) if kind == HUMAN and i not in self.players]
+
+    def info(self) -> dict:
+        return {
+            "table": self.id,
+            "seats": [
+                {"seat": i, "name": p.name, "kind": self.seats[i], "taken": i in self.players}
+                for i, p in enumerate(self.engine.players)
+            ],
+            "started": self._thread is not None,
+            "turn": self.engine.turn_count,
+        }
+
+    # ------------- loop side -------------
+    def join(self, client: Client, seat: int) -> None:
+        if self._thread is not None:
+            raise ValueError("the game has already started")
+        if seat not in self.open_seats():
+            raise ValueError(f"seat {seat} is not an open human seat")
+        self.players[seat] = client
+        client.tables[self.id] = seat
+        player = self.engine.players[seat]
+        client.send({"op": "joined", "table": self.id, "seat": seat, "name": player.name,
+                     "hand": list(player.hand)})
+        self.start_if_ready()
+
+    def watch(self, client: Client) -> None:
+        self.watchers.add(client)
+        client.tables.setdefault(self.id, None)
+        client.send({"op": "watching", **self.info()})
+
+    def leave(self, client: Client) -> None:
+        seat = client.tables.pop(self.id, None)
+        self.watchers.discard(client)
+        if seat is not None and self.players.get(seat) is client:
+            del self.players[seat]
+            if self._thread is None:
+                return
+            #Wake the game thread if it is waiting on this seat; it hands the seat to an AI
+            for prompt in list(self._prompts.values()):
+                if prompt.seat == seat:
+                    prompt.settle((False, None))
+
+    def answer(self, client: Client, prompt_id: int, value) -> None:
+        prompt = self._prompts.get(prompt_id)
+        if prompt is None or prompt.future.done():
+            raise ValueError(f"no open prompt {prompt_id}")
+        if self.players.get(prompt.seat) is not client:
+            raise ValueError(f"prompt {prompt_id} is not for you")
+        ok, decision = prompt.check(value)
+        if not ok:
+            #The prompt stays open; the client can answer again before the timeout
+            raise ValueError(f"invalid answer {value!r}")
+        if not prompt.settle((True, decision)):
+            raise ValueError(f"no open prompt {prompt_id}")
+
+    def start_if_ready(self) -> None:
+        if self._thread is not None or self.closed or self.open_seats():
+            return
+        self._thread = threading.Thread(target=self._run, name=f"table-{self.id}", daemon=True)
+        self._thread.start()
+        self._timer.cancel()
+        self._timer = self.loop.call_later(self.game_timeout, self.close, "timeout")
+
+    def abandon(self) -> None:
+        #The creator went away: a table nobody started is not worth keeping
+        if self._thread is None:
+            self.close("creator_left")
+
+    def close(self, reason: str = "closed") -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        if self._timer is not None:
+            self._timer.cancel()
+        for prompt in list(self._prompts.values()):
+            prompt.settle(exception=TableClosed(reason))
+        if self._thread is None:
+            self._finish({"op": "over", "table": self.id, "reason": reason})
+
+    def _deliver(self, message: dict, seat: Optional[int] = None) -> None:
+        #To one seat's player, or to every player and watcher of the table
+        if seat is not None:
+            client = self.players.get(seat)
+            if client is not None:
+                client.send(message)
+            return
+        for client in self.players.values():
+            client.send(message)
+        for client in self.watchers:
+            client.send(message)
+
+    def _finish(self, message: dict) -> None:
+        self._deliver(message)
+        for client in list(self.players.values()) + list(self.watchers):
+            client.tables.pop(self.id, None)
+        self.server.tables.pop(self.id, None)
+
+    # ------------- game thread side -------------
+    def _call_loop(self, fn, *args) -> None:
+        try:
+            self.loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            #Loop already closed (server shutting down)
+            pass
+
+    def publish(self, kind: str, fields: dict) -> None:
+        message = {"op": "event", "table": self.id, "event": kind}
+        for key, value in fields.items():
+            message[key] = list(value) if isinstance(value, tuple) else value
+        if kind == "refuted":
+            #Everybody sees who showed a card to whom, only the suggester sees which card
+            card = message.pop("card", None)
+            to_seat = next((i for i, p in enumerate(self.engine.players) if p.name == fields.get("to")), None)
+            self._call_loop(self._deliver_refutation, message, to_seat, card)
+            return
+        self._call_loop(self._deliver, message)
+
+    def _deliver_refutation(self, message: dict, to_seat: Optional[int], card: Optional[str]) -> None:
+        for seat, client in self.players.items():
+            client.send({**message, "card": card} if seat == to_seat else message)
+        for client in self.watchers:
+            client.send(message)
+
+    def ask(self, seat: int, ask: str, check: Callable, **info) -> Tuple[bool, object]:
+        #(True, decision) once the seat's client answers; (False, None) if the seat has no
+        #player any more (left, disconnected, too slow), in which case it now belongs to an AI
+        if self.closed:
+            raise TableClosed(self.close_reason)
+        if seat not in self.players:
+            self._hand_to_ai(seat, "left")
+            return False, None
+
+        prompt_id = next(self._prompt_ids)
+        prompt = _Prompt(seat, check)
+        self._prompts[prompt_id] = prompt
+        message = {"op": "prompt", "table": self.id, "id": prompt_id, "ask": ask,
+                   "timeout": self.move_timeout}
+        for key, value in info.items():
+            message[key] = list(value) if isinstance(value, tuple) else value
+        self._call_loop(self._deliver, message, seat)
+
+        reason = "left"
+        try:
+            answered, value = prompt.future.result(timeout=self.move_timeout)
+        except FutureTimeout:
+            #Too late: refuse the answer from now on, unless it got in just before the cancel
+            if prompt.future.cancel():
+                answered, value = False, None
+                reason = "timeout"
+            else:
+                answered, value = prompt.future.result()
+        finally:
+            self._prompts.pop(prompt_id, None)
+
+        if not answered:
+            self._hand_to_ai(seat, reason)
+        return answered, value
+
+    def _hand_to_ai(self, seat: int, reason: str) -> None:
+        player = self.engine.players[seat]
+        if not player.is_ai:
+            set_player_ai(player, True, self.engine.rng, self.engine.events)
+            self.seats[seat] = AI
+            self.publish("ai_takeover", {"player": player.name, "reason": reason})
+        self._call_loop(self._drop_seat, seat, reason)
+
+    def _drop_seat(self, seat: int, reason: str) -> None:
+        client = self.players.pop(seat, None)
+        if client is None:
+            return
+        if reason == "timeout":
+            #Too slow, but still connected: keep following the table as a watcher
+            self.watchers.add(client)
+            client.tables[self.id] = None
+        else:
+            client.tables.pop(self.id, None)
+
+    def _run(self) -> None:
+        engine = self.engine
+        reason = None
+        try:
+            while not self.closed and engine.step():
+                if engine.turn_count > self.max_turns:
+                    reason = "turn_limit"
+                    break
+                if self.turn_delay:
+                    time.sleep(self.turn_delay)
+        except TableClosed:
+            pass
+        except Exception as e:
+            #A bug in one game must not take the server down
+            reason = f"error: {e!r}"
+
+        if self.closed:
+            reason = self.close_reason
+        elif reason is None:
+            reason = "win" if engine.winner is not None else ("quit" if engine.quit else "all_eliminated")
+
+        self.closed = True
+        self._call_loop(self._over, {
+            "op": "over",
+            "table": self.id,
+            "reason": reason,
+            "winner": engine.winner.name if engine.winner is not None else None,
+            "turns": engine.turn_count,
+            "solution": engine.solution,
+        })
+
+    def _over(self, message: dict) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._finish(message)
+
+
+class GameServer:
+    def __init__(self, max_tables: int = 1000):
+        self.max_tables = max_tables
+        self.tables: Dict[int, Table] = {}
+        self.clients: Set[Client] = set()
+        self._table_ids = itertools.count(1)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ------------- listening -------------
+    async def start_tcp(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=BACKLOG)
+        return self._server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_unix_server(self.handle, path, limit=MAX_LINE, backlog=BACKLOG)
+        return self._server
+
+    async def close(self) -> None:
+        for table in list(self.tables.values()):
+            table.close("server_shutdown")
+        for client in list(self.clients):
+            client.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ------------- connections -------------
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = Client(writer)
+        self.clients.add(client)
+        client.send({"op": "hello", "protocol": PROTOCOL_VERSION})
+        try:
+            while not client.closed:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                message = None
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("expected a JSON object")
+                    self.dispatch(client, message)
+                except (ValueError, KeyError, TypeError) as e:
+                    error = {"op": "error", "error": str(e)}
+                    if isinstance(message, dict):
+                        #So a client can tell which request (and which prompt) failed
+                        error["request"] = message.get("op")
+                        if "id" in message:
+                            error["id"] = message["id"]
+                    client.send(error)
+        finally:
+            for table_id in list(client.tables):
+                table = self.tables.get(table_id)
+                if table is not None:
+                    table.leave(client)
+            for table_id in client.created:
+                table = self.tables.get(table_id)
+                if table is not None:
+                    table.abandon()
+            self.clients.discard(client)
+            client.close()
+
+    def _table(self, message: dict) -> Table:
+        table = self.tables.get(message["table"])
+        if table is None:
+            raise ValueError(f"no table {message['table']!r}")
+        return table
+
+    def dispatch(self, client: Client, message: dict) -> None:
+        op = message.get("op")
+        if op == "create":
+            table = self.create_table(message)
+            client.created.add(table.id)
+            client.send({"op": "created", **table.info()})
+            if message.get("watch"):
+                table.watch(client)
+            table.start_if_ready()
+        elif op == "join":
+            self._table(message).join(client, int(message["seat"]))
+        elif op == "watch":
+            self._table(message).watch(client)
+        elif op == "answer":
+            self._table(message).answer(client, int(message["id"]), message.get("value"))
+        elif op == "leave":
+            self._table(message).leave(client)
+            client.send({"op": "left", "table": message["table"]})
+        elif op == "list":
+            client.send({"op": "tables", "tables": [t.info() for t in self.tables.values()]})
+        else:
+            raise ValueError(f"unknown op {op!r}")
+
+    def create_table(self, message: dict) -> Table:
+        if len(self.tables) >= self.max_tables:
+            raise ValueError("server is full")
+        seats = message.get("seats") or [AI] * 6
+        if len(seats) != 6 or any(kind not in SEAT_KINDS for kind in seats):
+            raise ValueError(f"seats must be 6 of {', '.join(SEAT_KINDS)}")
+        level = message.get("events", "summary")
+        if level not in LEVELS:
+            raise ValueError(f"events must be one of {', '.join(LEVELS)}")
+
+        table = Table(
+            next(self._table_ids), self, seats,
+            seed=message.get("seed"),
+            move_timeout=float(message.get("move_timeout", DEFAULT_MOVE_TIMEOUT)),
+            join_timeout=float(message.get("join_timeout", DEFAULT_JOIN_TIMEOUT)),
+            game_timeout=float(message.get("game_timeout", DEFAULT_GAME_TIMEOUT)),
+            event_level=LEVELS[level],
+            turn_delay=float(message.get("turn_delay", 0.0)),
+            max_turns=int(message.get("max_turns", DEFAULT_MAX_TURNS)),
+        )
+        self.tables[table.id] = table
+        return table
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix: Optional[str] = None,
+                max_tables: int = 1000) -> None:
+    server = GameServer(max_tables)
+    if unix:
+        listener = await server.start_unix(unix)
+        where = unix
+    else:
+        listener = await server.start_tcp(host, port)
+        where = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Cluedo server listening on {where}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Host many Cluedo games for local clients.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-tables", type=int, default=1000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_tables))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
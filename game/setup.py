@@ -3,10 +3,12 @@
 #basic game setup functions to create players, set up AI, make solution, deal cards, etc.
 
 import random
-from typing import List, Tuple
-from board.grid import get_board
+from typing import List, Optional, Sequence, Tuple
+from board.grid import get_board_array, overlay_players_on_board
 from entities.character import CHARACTERS
 from entities.player import Player
+from entities.occupancy import OccupancyIndex
+from game.output import CONSOLE, SUMMARY
 from game.cards import (
     SUSPECTS,
     WEAPONS,
@@ -16,7 +18,7 @@ from game.cards import (
 )
 
 #AI
-from ai.knowledge import ClueNotebook
+from ai.knowledge import JointNotebook
 from ai.ai_player import AIPlayerController
 
 
@@ -28,10 +30,32 @@ def create_players() -> List[Player]:
         start_pos = meta["start_pos"]
         p = Player(name=name, token=token, start_position=start_pos)
         players.append(p)
+
+    #Shared position/name index, updated by the players themselves as they move
+    OccupancyIndex(players)
     return players
 
 
-def attach_ai_players(players: List[Player]) -> None:
+def set_player_ai(p: Player, is_ai: bool, rng=None, events=None) -> None:
+    #Give the player an AI controller (or take it away)
+    #events: the game's EventBus once the game is running (the GameEngine subscribes the AIs
+    #it starts with itself)
+    if events is not None and p.ai is not None:
+        events.unsubscribe(p.ai)
+    p.is_ai = is_ai
+    if is_ai:
+        nb = JointNotebook(SUSPECTS, WEAPONS, ROOMS)
+        controller = AIPlayerController(p, nb, rng)
+        p.ai_controller = controller
+        p.ai = controller
+        if events is not None:
+            events.subscribe(p.name, controller)
+    else:
+        p.ai_controller = None
+        p.ai = None
+
+
+def attach_ai_players(players: List[Player], rng=None) -> None:
     #Asking for each player if they are AI or human
     print("\n=== AI PLAYER SETUP ===")
     for p in players:
@@ -40,57 +64,52 @@ def attach_ai_players(players: List[Player]) -> None:
             ans = input(f"Set '{p.name}' as AI? (y/n): ").strip().lower()
 
             if ans.startswith("y"):
-                p.is_ai = True
                 is_ai_choice = True
             elif ans.startswith("n"):
-                p.is_ai = False
                 is_ai_choice = False
             else:
                 print("Invalid input. Please enter 'y' or 'n'.")
 
+        set_player_ai(p, is_ai_choice, rng)
         if p.is_ai:
-            nb = ClueNotebook(SUSPECTS, WEAPONS, ROOMS)
-            controller = AIPlayerController(p, nb)
-            p.ai_controller = controller
-            p.ai = controller
             print(f"-> {p.name} is set as AI.")
         else:
-            p.ai_controller = None
-            p.ai = None
             print(f"-> {p.name} is set as Human.")
 
 
-def setup_game(debug: bool = False) -> Tuple[list, List[Player], dict]:
-    base_board = get_board()
+def setup_game(debug: bool = False,
+               ai_flags: Optional[Sequence[bool]] = None,
+               out=None,
+               rng=None) -> Tuple[list, List[Player], dict]:
+    #ai_flags: one True/False per player (in seating order after the shuffle).
+    #Leave it out to ask at the terminal, like the CLI does.
+    #rng: the game's random.Random; seat order, solution, hands and the AIs all draw from it.
+    out = out or CONSOLE
+    rng = rng or random
+    base_board = get_board_array()
     players = create_players()
 
     #Random player order
-    random.shuffle(players)
+    rng.shuffle(players)
     
-    solution = make_solution()
-    deal_cards(players, solution)
+    solution = make_solution(rng)
+    deal_cards(players, solution, rng)
 
-    attach_ai_players(players)
+    if ai_flags is None:
+        attach_ai_players(players, rng)
+    else:
+        for p, is_ai in zip(players, ai_flags):
+            set_player_ai(p, bool(is_ai), rng)
 
     if debug:
-        print("\n=== [DEBUG] MURDER SOLUTION (HIDDEN IN REAL GAME) ===")
-        print(f"Suspect: {solution['suspect']}")
-        print(f"Weapon : {solution['weapon']}")
-        print(f"Room   : {solution['room']}")
+        out.write("\n=== [DEBUG] MURDER SOLUTION (HIDDEN IN REAL GAME) ===", SUMMARY)
+        out.write(f"Suspect: {solution['suspect']}", SUMMARY)
+        out.write(f"Weapon : {solution['weapon']}", SUMMARY)
+        out.write(f"Room   : {solution['room']}", SUMMARY)
 
-        print("\n=== [DEBUG] PLAYER CARDS ===")
+        out.write("\n=== [DEBUG] PLAYER CARDS ===", SUMMARY)
         for p in players:
             role = "AI" if p.is_ai else "HUMAN"
-            print(f"{p.name} ({p.token}, {role}): {sorted(p.hand)}")
+            out.write(f"{p.name} ({p.token}, {role}): {sorted(p.hand)}", SUMMARY)
 
     return base_board, players, solution
-
-
-def overlay_players_on_board(base_board, players: List[Player]):
-    #Returning a copy of the board with player tokens drawn on top
-    board = [row[:] for row in base_board]
-    for p in players:
-        r, c = p.position
-        if 0 <= r < len(board) and 0 <= c < len(board[0]):
-            board[r][c] = p.token
-    return board
\ No newline at end of file
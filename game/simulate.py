@@ -0,0 +1,204 @@
+# game/simulate.py
+
+#Monte Carlo runner for all-AI games.
+#Every game is a headless GameEngine with six AI seats and a NullOutput, so nothing is asked
+#or printed. Games are handed out to a process pool in chunks of consecutive game numbers;
+#each worker plays its chunk and sends back one SimStats, which the parent merges.
+#Game number i always uses seed + i for its own random.Random, so a game is the same
+#whichever worker plays it and results do not depend on --jobs or --chunk-size.
+#
+#Run from the project root:
+#    python -m game.simulate --games 100000 --jobs 8 --seed 1
+
+from __future__ import annotations
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from entities.character import CHARACTERS
+from game.engine import GameEngine
+from game.output import NullOutput
+
+SEATS = len(CHARACTERS)
+#Safety net against a game that never ends (all AIs stuck without a deduction)
+DEFAULT_MAX_TURNS = 2000
+
+
+class GameResult(NamedTuple):
+    winner_seat: Optional[int]
+    winner_name: Optional[str]
+    turns: int
+    eliminated: int
+    capped: bool
+
+
+def play_game(seed: int, max_turns: int = DEFAULT_MAX_TURNS) -> GameResult:
+    #One silent all-AI game, with its own random.Random seeded from `seed`
+    engine = GameEngine.new_game(ai_flags=[True] * SEATS, output=NullOutput(), seed=seed)
+    winner = engine.run_to_completion(max_turns=max_turns)
+
+    seat = engine.players.index(winner) if winner is not None else None
+    return GameResult(
+        winner_seat=seat,
+        winner_name=winner.name if winner is not None else None,
+        turns=engine.turn_count,
+        eliminated=sum(1 for p in engine.players if p.is_eliminated),
+        capped=not engine.finished,
+    )
+
+
+class SimStats:
+    #Aggregated results, cheap to send between processes and to merge
+    def __init__(self):
+        self.games = 0
+        self.wins_by_seat: Counter = Counter()
+        self.wins_by_character: Counter = Counter()
+        self.turns: Counter = Counter()
+        self.eliminated_players = 0
+        self.games_with_elimination = 0
+        self.no_winner = 0
+        self.capped = 0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        if result.winner_seat is None:
+            self.no_winner += 1
+        else:
+            self.wins_by_seat[result.winner_seat] += 1
+            self.wins_by_character[result.winner_name] += 1
+        self.turns[result.turns] += 1
+        self.eliminated_players += result.eliminated
+        if result.eliminated:
+            self.games_with_elimination += 1
+        if result.capped:
+            self.capped += 1
+
+    def merge(self, other: "SimStats") -> None:
+        self.games += other.games
+        self.wins_by_seat.update(other.wins_by_seat)
+        self.wins_by_character.update(other.wins_by_character)
+        self.turns.update(other.turns)
+        self.eliminated_players += other.eliminated_players
+        self.games_with_elimination += other.games_with_elimination
+        self.no_winner += other.no_winner
+        self.capped += other.capped
+
+    # ------------- turn distribution -------------
+    def turn_percentile(self, q: float) -> int:
+        if not self.games:
+            return 0
+        target = q * (self.games - 1)
+        seen = 0
+        for turns in sorted(self.turns):
+            seen += self.turns[turns]
+            if seen > target:
+                return turns
+        return max(self.turns)
+
+    def mean_turns(self) -> float:
+        if not self.games:
+            return 0.0
+        return sum(t * n for t, n in self.turns.items()) / self.games
+
+    def turn_histogram(self, bucket: int) -> List[Tuple[int, int]]:
+        buckets: Counter = Counter()
+        for turns, n in self.turns.items():
+            buckets[(turns // bucket) * bucket] += n
+        return sorted(buckets.items())
+
+
+def _run_chunk(args: Tuple[int, int, int]) -> SimStats:
+    #Worker side: play games seed, seed+1, ..., seed+count-1
+    first_seed, count, max_turns = args
+    stats = SimStats()
+    for seed in range(first_seed, first_seed + count):
+        stats.add(play_game(seed, max_turns))
+    return stats
+
+
+def _chunks(games: int, seed: int, chunk_size: int, max_turns: int) -> Iterator[Tuple[int, int, int]]:
+    for start in range(0, games, chunk_size):
+        yield seed + start, min(chunk_size, games - start), max_turns
+
+
+def run_simulation(games: int,
+                   jobs: int = 1,
+                   seed: int = 0,
+                   chunk_size: Optional[int] = None,
+                   max_turns: int = DEFAULT_MAX_TURNS) -> SimStats:
+    jobs = max(1, jobs)
+    if chunk_size is None:
+        #A few chunks per worker keeps them all busy until the end without much IPC
+        chunk_size = max(1, min(500, games // (jobs * 8) or 1))
+
+    total = SimStats()
+    work = _chunks(games, seed, chunk_size, max_turns)
+
+    if jobs == 1:
+        for chunk in work:
+            total.merge(_run_chunk(chunk))
+        return total
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for stats in pool.map(_run_chunk, work):
+            total.merge(stats)
+    return total
+
+
+def print_report(stats: SimStats, elapsed: float, jobs: int) -> None:
+    games = stats.games
+    print(f"\n=== SIMULATION: {games} games, {jobs} job(s) ===")
+    print(f"Time: {elapsed:.2f} s  ({games / elapsed if elapsed else 0:.1f} games/s)")
+
+    print("\nWin rate by seat (turn order):")
+    for seat in range(SEATS):
+        wins = stats.wins_by_seat[seat]
+        print(f"  Seat {seat + 1}: {wins:>8}  {100 * wins / games:5.1f}%")
+
+    print("\nWin rate by character:")
+    for name in CHARACTERS:
+        wins = stats.wins_by_character[name]
+        print(f"  {name:<16} {wins:>8}  {100 * wins / games:5.1f}%")
+
+    print("\nTurns per game:")
+    print(
+        f"  mean {stats.mean_turns():.1f} | min {stats.turn_percentile(0)} | "
+        f"p10 {stats.turn_percentile(0.1)} | median {stats.turn_percentile(0.5)} | "
+        f"p90 {stats.turn_percentile(0.9)} | max {stats.turn_percentile(1)}"
+    )
+    bucket = 50
+    for start, n in stats.turn_histogram(bucket):
+        bar = "#" * max(1, round(40 * n / games)) if n else ""
+        print(f"  {start:>5}-{start + bucket - 1:<5} {n:>8}  {bar}")
+
+    print("\nEliminations:")
+    print(f"  Players eliminated: {100 * stats.eliminated_players / (games * SEATS):.1f}% of seats")
+    print(f"  Games with at least one wrong accusation: {100 * stats.games_with_elimination / games:.1f}%")
+    print(f"  Games without a winner: {stats.no_winner} ({stats.capped} stopped at the turn limit)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run many all-AI Cluedo games in parallel.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="game i is played with seed + i")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="games per work unit (default: picked from --games and --jobs)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    args = parser.parse_args(argv)
+
+    if args.games <= 0:
+        parser.error("--games must be positive")
+
+    start = time.perf_counter()
+    stats = run_simulation(args.games, args.jobs, args.seed, args.chunk_size, args.max_turns)
+    print_report(stats, time.perf_counter() - start, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# game/state.py
+
+#The whole game as one immutable value.
+#The live game is spread over Player objects, the solution dict, the GameEngine counters
+#and one ClueNotebook per AI. GameState packs all of that into nested tuples:
+#
+#  - the board is never copied: every state points at the same read-only SharedBoard
+#  - a player is a PlayerState tuple, a notebook a NotebookState tuple of frozensets
+#  - changing one player builds a new players tuple that reuses the other five entries,
+#    so a "clone" costs O(players), not a deep copy of lists of lists
+#
+#    state = capture_state(engine)
+#    moved = state.with_player(2, position=(9, 12), in_room=None)
+#    restore_state(engine, state)            #put the live game back
+#
+#stable_hash() is the same in every process and on every run (unlike hash() of strings,
+#which changes with PYTHONHASHSEED), so it can be used as a key for caches, transposition
+#tables or to check that a save file or a replay reached the same state.
+
+from __future__ import annotations
+import hashlib
+import json
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ai.knowledge import NotebookState
+from board.grid import get_board_array
+
+Pos = Tuple[int, int]
+
+
+class SharedBoard:
+    #Read-only tile-code array shared by every state; compared by content digest
+    __slots__ = ("codes", "digest")
+
+    def __init__(self, codes: np.ndarray):
+        codes = np.array(codes, dtype=np.uint8)
+        codes.setflags(write=False)
+        self.codes = codes
+        self.digest = hashlib.blake2b(
+            bytes(codes.shape) + codes.tobytes(), digest_size=16
+        ).hexdigest()
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SharedBoard) and other.digest == self.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return f"SharedBoard({self.digest[:8]})"
+
+
+_DEFAULT_BOARD: Optional[SharedBoard] = None
+#Last board object seen and its SharedBoard, so capturing the same game again is free
+_LAST_SEEN: Tuple[object, Optional[SharedBoard]] = (None, None)
+
+
+def shared_board(base_board=None) -> SharedBoard:
+    #The standard board is built once per process and shared by every state
+    global _DEFAULT_BOARD, _LAST_SEEN
+    if _DEFAULT_BOARD is None:
+        _DEFAULT_BOARD = SharedBoard(get_board_array())
+    if base_board is None:
+        return _DEFAULT_BOARD
+    if _LAST_SEEN[0] is base_board:
+        return _LAST_SEEN[1]
+
+    board = SharedBoard(base_board)
+    if board == _DEFAULT_BOARD:
+        board = _DEFAULT_BOARD
+    _LAST_SEEN = (base_board, board)
+    return board
+
+
+class PlayerState(NamedTuple):
+    name: str
+    token: str
+    position: Pos
+    in_room: Optional[int]
+    hand: Tuple[str, ...]
+    is_ai: bool
+    was_summoned: bool
+    is_eliminated: bool
+
+
+class GameState(NamedTuple):
+    board: SharedBoard
+    players: Tuple[PlayerState, ...]
+    solution: Tuple[str, str, str]                  #suspect, weapon, room
+    notebooks: Tuple[Optional[NotebookState], ...]  #one per seat, None for humans
+    current_player_index: int
+    turn_count: int
+    winner: Optional[int]                           #seat of the winner
+    finished: bool
+
+    # ------------- cheap "copies" -------------
+    def with_player(self, seat: int, **changes) -> "GameState":
+        players = list(self.players)
+        players[seat] = players[seat]._replace(**changes)
+        return self._replace(players=tuple(players))
+
+    def with_notebook(self, seat: int, notebook: Optional[NotebookState]) -> "GameState":
+        notebooks = list(self.notebooks)
+        notebooks[seat] = notebook
+        return self._replace(notebooks=tuple(notebooks))
+
+    def advance_turn(self) -> "GameState":
+        return self._replace(
+            current_player_index=(self.current_player_index + 1) % len(self.players),
+            turn_count=self.turn_count + 1,
+        )
+
+    # ------------- lookups -------------
+    @property
+    def current_player(self) -> PlayerState:
+        return self.players[self.current_player_index]
+
+    def seat_of(self, name: str) -> int:
+        for seat, p in enumerate(self.players):
+            if p.name == name:
+                return seat
+        raise KeyError(name)
+
+    # ------------- stable hash -------------
+    def canonical(self) -> list:
+        #Plain JSON-able form with every set sorted, the basis of stable_hash
+        return [
+            self.board.digest,
+            [list(p) for p in self.players],
+            list(self.solution),
+            [None if nb is None else _canonical_notebook(nb) for nb in self.notebooks],
+            self.current_player_index,
+            self.turn_count,
+            self.winner,
+            self.finished,
+        ]
+
+    def stable_hash(self) -> str:
+        data = json.dumps(self.canonical(), separators=(",", ":"), ensure_ascii=False)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _canonical_notebook(nb: NotebookState) -> list:
+    canonical = [
+        sorted(nb.possible_suspects),
+        sorted(nb.possible_weapons),
+        sorted(nb.possible_rooms),
+        sorted(nb.seen_cards),
+        [list(pair) for pair in nb.room_visit_count],
+        [list(pair) for pair in nb.room_suggestion_count],
+        nb.last_room,
+    ]
+    if nb.wrong_accusations:
+        canonical.append(sorted(sorted(cards) for cards in nb.wrong_accusations))
+    if nb.holders:
+        #DeductionNotebook's who-holds-what table
+        canonical += [
+            nb.owner,
+            list(nb.holders),
+            list(nb.hand_sizes),
+            [sorted(cards) for cards in nb.holds],
+            [sorted(cards) for cards in nb.lacks],
+            sorted([name, sorted(cards)] for name, cards in nb.clauses),
+        ]
+    return canonical
+
+
+# ------------- live game <-> GameState -------------
+def capture_state(engine) -> GameState:
+    players = engine.players
+    winner = players.index(engine.winner) if engine.winner is not None else None
+    return GameState(
+        board=shared_board(engine.base_board),
+        players=tuple(
+            PlayerState(
+                name=p.name,
+                token=p.token,
+                position=tuple(p.position),
+                in_room=p.in_room,
+                hand=tuple(p.hand),
+                is_ai=p.is_ai,
+                was_summoned=p.was_summoned,
+                is_eliminated=p.is_eliminated,
+            )
+            for p in players
+        ),
+        solution=(engine.solution["suspect"], engine.solution["weapon"], engine.solution["room"]),
+        notebooks=tuple(p.ai.nb.snapshot() if p.is_ai and p.ai is not None else None for p in players),
+        current_player_index=engine.current_player_index,
+        turn_count=engine.turn_count,
+        winner=winner,
+        finished=engine.finished,
+    )
+
+
+def restore_state(engine, state: GameState) -> None:
+    #Put a captured state back into the engine's live objects (same seats, same players)
+    from game.setup import set_player_ai
+
+    by_name = {p.name: p for p in engine.players}
+    players = []
+    for ps in state.players:
+        p = by_name[ps.name]
+        p.move_to(ps.position)
+        p.in_room = ps.in_room
+        p.hand = list(ps.hand)
+        p.was_summoned = ps.was_summoned
+        p.is_eliminated = ps.is_eliminated
+        players.append(p)
+
+    #Seat order is part of the state; the list object itself is kept (mechanics hold on to it)
+    engine.players[:] = players
+
+    #AIs last: a new controller subscribes to the EventBus, which hands it the seat order and
+    #hand sizes, so every hand and the seat order have to be back first
+    for p, ps, nb in zip(players, state.players, state.notebooks):
+        if p.is_ai != ps.is_ai or (ps.is_ai and p.ai is None):
+            set_player_ai(p, ps.is_ai, engine.rng, engine.events)
+        if nb is not None and p.ai is not None:
+            p.ai.nb.restore(nb)
+
+    engine.solution = {"suspect": state.solution[0], "weapon": state.solution[1], "room": state.solution[2]}
+    engine.current_player_index = state.current_player_index
+    engine.turn_count = state.turn_count
+    engine.winner = players[state.winner] if state.winner is not None else None
+    engine.finished = state.finished
@@ -1,10 +1,15 @@
-from game.setup import setup_game, overlay_players_on_board
-from board.renderer import visualize_board
+from game.engine import GameEngine
+from game.setup import overlay_players_on_board
+from game.decisions import AIDecisions, MOVE, ACCUSE, QUIT
+from game.console import ConsoleDecisions
 from board.grid import print_board
-from mechanics.movement import move_player_turn
-from mechanics.suggestions import make_suggestion, make_accusation_standalone
-from board.rooms import SECRET_PASSAGES, SECRET_PASSAGE_POSITIONS, get_room_name
-import time
+from mechanics.reachability import reachable_by_roll
+from board.rooms import get_room_name
+from game.output import OUTPUT_MODES, SUMMARY, VERBOSE, TeeOutput, make_output
+from game.eventlog import EventLogWriter
+from game.savefile import DEFAULT_SAVE_PATH, load_game, save_game
+from game.pacing import DEFAULT_PACE, make_pacer
+import argparse
 
 
 #final printing for win
@@ -18,180 +23,204 @@ def print_victory_screen(winner_name: str, turn_count: int):
     print("★" * 50 + "\n")
 
 
-#Main game loop
-def main():
-
-    #This if for testing but if the player wants to see the solution and cards
-    debug_choice = input(
-        "Show debug info (solution and player cards)? (y/n): "
-    ).strip().lower()
-    debug = debug_choice.startswith("y")
-
-    base_board, players, solution = setup_game(debug=debug)
-
-    current_player_index = 0
-    turn_count = 1
-    autoplay = False
-
-    #Checking if the players are eliminated
-    while True:
-        active_players = [p for p in players if not p.is_eliminated]
-        if not active_players:
-            print("\n" + "="*40)
-            print("       GAME OVER - ALL PLAYERS ELIMINATED")
-            print(f"       Total Turns: {turn_count}")
-            print("="*40)
-            break
-
-        current_player = players[current_player_index % len(players)]
-
-        #skip the eliminated players
-        if current_player.is_eliminated:
-            current_player_index = (current_player_index + 1) % len(players)
-            continue
-
-        is_ai = getattr(current_player, "is_ai", False)
-        ai_ctrl = getattr(current_player, "ai", None)
-
-
-        #1. Summon rule - connected with suggestion.py
-        if getattr(current_player, "was_summoned", False):
-            print(f"\n❗ {current_player.name} was summoned to the {get_room_name(current_player.in_room)}!")
-            
-            stay_choice = False
-            current_player.was_summoned = False
-
-            if autoplay and is_ai:
-                print(f"[AUTOPLAY] AI {current_player.name} chooses to STAY and suggest.")
-                time.sleep(0.05)
-                stay_choice = True
-            elif is_ai:
-                print(f"AI {current_player.name} chooses to STAY and suggest.")
-                stay_choice = True
-            else:
-                ans = input("Do you want to stay and make a suggestion? (y/n): ").strip().lower()
-                stay_choice = ans.startswith("y")
-
-            if stay_choice:
-                game_over = make_suggestion(current_player, players, solution)
-                if game_over:
-                    print_victory_screen(current_player.name, turn_count)
-                    break
-            
-                if current_player.is_eliminated:
-                    print(f"({current_player.name} lost the turn due to wrong accusation.)")
-
-                current_player_index = (current_player_index + 1) % len(players)
-                turn_count += 1
-                continue
-
-        #2. If they are not summoned, the next best thing is to check for secret passages
-        if current_player.in_room in SECRET_PASSAGES and not current_player.is_eliminated:
-            dest_room_id = SECRET_PASSAGES[current_player.in_room]
-            dest_room_name = get_room_name(dest_room_id)
-            current_room_name = get_room_name(current_player.in_room)
-
-            if is_ai and ai_ctrl is not None and hasattr(ai_ctrl, "decide_use_secret_passage"):
-                use_sp = ai_ctrl.decide_use_secret_passage(current_room_name, dest_room_name)
-            else:
-                ans = input(
-                    f"\n{current_player.name} is in the {current_room_name}, which has a secret passage.\n"
-                    f"Use secret passage to the {dest_room_name}? (y/n): "
-                ).strip().lower()
-                use_sp = ans.startswith("y")
-
-            if use_sp:
-                target_pos = SECRET_PASSAGE_POSITIONS[dest_room_id]
-                current_player.move_to(target_pos)
-                current_player.enter_room(dest_room_id)
-                print(f"{current_player.name} uses the secret passage to the {dest_room_name}!")
-
-                game_over = make_suggestion(current_player, players, solution)
-                if game_over:
-                    print_victory_screen(current_player.name, turn_count)
-                    break
-                
-                if current_player.is_eliminated:
-                     print(f"({current_player.name} lost the turn.)")
-
-                current_player_index = (current_player_index + 1) % len(players)
-                turn_count += 1
-                continue
-
-        #3. Regular turn, you can move or accuse
-        choice = None
-
-        #for the Ai 
-        if is_ai:
-            winning_hypo = ai_ctrl.check_for_winning_accusation()
-            if winning_hypo:
-                print(f"\n💡 AI {current_player.name} has deduced the solution! Making accusation...")
-                time.sleep(1)
-                choice = "x"
-            elif autoplay:
-                print(f"\n[AUTOPLAY] Turn {turn_count}: AI {current_player.name} is moving...")
-                time.sleep(0.05)
-                choice = "m"
-
-        if choice is None:
+#"Show me where I can go" for every dice roll
+def print_reachability(base_board, players, player):
+    print(f"\n=== WHERE CAN {player.name.upper()} GO? ===")
+    for roll, reach in reachable_by_roll(base_board, players, player).items():
+        rooms = ", ".join(sorted(get_room_name(r) for r in reach.rooms)) or "none"
+        print(f"Roll {roll}: rooms: {rooms} | doors: {len(reach.doors)} | tiles: {len(reach.tiles)}")
+
+
+#CLI state that is not part of the game itself: autoplay toggle, pacing and the live map window
+class CliSession:
+    def __init__(self, pacer=None):
+        self.autoplay = False
+        self.live_view = None
+        self.pacer = pacer if pacer is not None else make_pacer(DEFAULT_PACE)
+        #turn_count after the last turn we paced
+        self.paced_turn = None
+
+    def after_turn(self, engine) -> None:
+        #The one place where an autoplay game is slowed down for whoever is watching.
+        #engine.step() also returns after skipping an eliminated seat, which plays no turn
+        #(turn_count stays the same): nothing to show or wait for then.
+        if engine.turn_count == self.paced_turn:
+            return
+        self.paced_turn = engine.turn_count
+        self.refresh_live_view(engine)
+        if self.autoplay:
+            self.pacer.tick()
+
+    def refresh_live_view(self, engine) -> None:
+        if self.live_view is not None and self.live_view.is_open():
+            self.live_view.update(overlay_players_on_board(engine.base_board, engine.players))
+
+    def open_visual_map(self, engine) -> None:
+        board_with_players = overlay_players_on_board(engine.base_board, engine.players)
+        #Matplotlib is only imported the first time the map is asked for
+        from board.mpl_backend import is_interactive
+        if not is_interactive():
+            from board.renderer import save_board_image
+            path = save_board_image(board_with_players, "cluedo_board.png")
+            print(f"\nNo display available - visual map saved to {path}")
+        elif self.live_view is not None and self.live_view.is_open():
+            self.live_view.update(board_with_players)
+        else:
+            from board.live_view import LiveBoardView
+            print("\n=== OPENING LIVE VISUAL MAP ===")
+            self.live_view = LiveBoardView(board_with_players)
+
+    def save(self, engine) -> None:
+        path = input(f"Save to (Enter for {DEFAULT_SAVE_PATH}): ").strip() or DEFAULT_SAVE_PATH
+        try:
+            save_game(engine, path, meta={"autoplay": self.autoplay})
+        except OSError as e:
+            print(f"Could not save the game: {e}")
+            return
+        print(f"Game saved to {path} (resume with: python main.py --load {path})")
+
+    #Game menu, shown for humans and for AIs when autoplay is off.
+    #Returns the turn action, or None when autoplay was toggled during an AI's turn.
+    def menu(self, engine, player):
+        while True:
             print("\n=== GAME MENU ===")
-            print(f"(Turn {turn_count} | Current turn: {current_player.name} [{current_player.token}])")
+            print(f"(Turn {engine.turn_count} | Current turn: {player.name} [{player.token}])")
             print("p - print board")
-            print("w - open visual map")
+            print("w - open live visual map (stays open and updates as the game goes)")
+            print("r - show where I can go (rooms reachable per dice roll)")
             print("m - move current player")
             print("x - make accusation (any room)")
-            print(f"a - toggle autoplay (currently {'ON' if autoplay else 'OFF'})")
+            print("s - save game")
+            print(f"a - toggle autoplay (currently {'ON' if self.autoplay else 'OFF'})")
             print("q - quit")
             choice = input("\nEnter choice: ").strip().lower()
 
-        if choice == "a":
-            autoplay = not autoplay
-            print(f"Autoplay is now {'ON' if autoplay else 'OFF'}.")
-            continue
-
-        elif choice == "p":
-            board_with_players = overlay_players_on_board(base_board, players)
-            print("\n=== CURRENT BOARD (CLI) ===\n")
-            print_board(board_with_players)
-
-        elif choice == "w":
-            board_with_players = overlay_players_on_board(base_board, players)
-            print("\n=== OPENING VISUAL MAP ===")
-            visualize_board(board_with_players)
-
-        elif choice == "x":
-            game_over = make_accusation_standalone(current_player, solution)
-            if game_over:
-                print_victory_screen(current_player.name, turn_count)
-                break
-            
-            if current_player.is_eliminated:
-                current_player_index = (current_player_index + 1) % len(players)
-                turn_count += 1
-            continue
-
-        elif choice == "m":
-            print(f"\n--- {current_player.name}'s turn ---")
-            entered_room = move_player_turn(base_board, players, current_player)
-
-            game_over = False
-            if entered_room and current_player.in_room is not None:
-                game_over = make_suggestion(current_player, players, solution)
-
-            if game_over:
-                print_victory_screen(current_player.name, turn_count)
-                break
-
-            current_player_index = (current_player_index + 1) % len(players)
-            turn_count += 1
-
-        elif choice == "q":
-            print("Quitting game...")
-            break
+            if choice == "a":
+                self.autoplay = not self.autoplay
+                print(f"Autoplay is now {'ON' if self.autoplay else 'OFF'}.")
+                #Let an AI whose turn it is decide again with the new setting
+                if player.is_ai:
+                    return None
 
-        else:
-            print("Invalid choice, try again.")
+            elif choice == "p":
+                board_with_players = overlay_players_on_board(engine.base_board, engine.players)
+                print("\n=== CURRENT BOARD (CLI) ===\n")
+                print_board(board_with_players)
+
+            elif choice == "w":
+                self.open_visual_map(engine)
+
+            elif choice == "r":
+                print_reachability(engine.base_board, engine.players, player)
+
+            elif choice == "s":
+                self.save(engine)
+
+            elif choice == "x":
+                return ACCUSE
+
+            elif choice == "m":
+                return MOVE
+
+            elif choice == "q":
+                return QUIT
+
+            else:
+                print("Invalid choice, try again.")
+
+
+class CliHumanDecisions(ConsoleDecisions):
+    def __init__(self, session: CliSession):
+        self.session = session
+
+    def choose_turn_action(self, engine, player) -> str:
+        return self.session.menu(engine, player)
+
+
+class CliAIDecisions(AIDecisions):
+    #AI decisions, but the human at the terminal drives the turns unless autoplay is on
+    def __init__(self, session: CliSession):
+        self.session = session
+
+    def choose_turn_action(self, engine, player) -> str:
+        while True:
+            if player.ai.check_for_winning_accusation():
+                engine.out.emit("ai_solved", SUMMARY, "\n💡 AI {player} has deduced the solution! Making accusation...",
+                                player=player.name)
+                return ACCUSE
+            if self.session.autoplay:
+                engine.out.emit("autoplay_move", VERBOSE, "\n[AUTOPLAY] Turn {turn}: AI {player} is moving...",
+                                player=player.name, turn=engine.turn_count)
+                return MOVE
+            action = self.session.menu(engine, player)
+            if action is not None:
+                return action
+
+    def stay_after_summon(self, engine, player, room_name: str) -> bool:
+        if self.session.autoplay:
+            engine.out.emit("ai_stays", VERBOSE, "[AUTOPLAY] AI {player} chooses to STAY and suggest.",
+                            player=player.name)
+            return True
+        return super().stay_after_summon(engine, player, room_name)
+
+
+#Main game loop
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cluedo in the terminal.")
+    parser.add_argument("--output", choices=OUTPUT_MODES, default="verbose",
+                        help="game narration: full text (default), summary only, silent, or JSON events")
+    parser.add_argument("--pace", default=DEFAULT_PACE,
+                        help="autoplay speed: turbo, fixed:SECONDS (default %(default)s) or fps:N")
+    parser.add_argument("--load", metavar="PATH",
+                        help="resume a game saved with the 's' menu option")
+    parser.add_argument("--log", metavar="PATH",
+                        help="record the game to an event log (replay it with python -m game.replay PATH)")
+    args = parser.parse_args(argv)
+    output = make_output(args.output)
+    try:
+        pacer = make_pacer(args.pace)
+    except ValueError as e:
+        parser.error(str(e))
+
+    session = CliSession(pacer)
+    human = CliHumanDecisions(session)
+    ai = CliAIDecisions(session)
+
+    def decisions(player):
+        return ai if player.is_ai and player.ai is not None else human
+
+    log = EventLogWriter(args.log) if args.log else None
+    game_output = TeeOutput(output, log) if log else output
+
+    if args.load:
+        try:
+            engine, meta = load_game(args.load, decisions=decisions, output=game_output)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load {args.load}: {e}")
+        session.autoplay = bool(meta.get("autoplay", False))
+        print(f"Resumed {args.load} at turn {engine.turn_count} ({engine.current_player.name} to play).")
+    else:
+        #This if for testing but if the player wants to see the solution and cards
+        debug_choice = input(
+            "Show debug info (solution and player cards)? (y/n): "
+        ).strip().lower()
+        debug = debug_choice.startswith("y")
+
+        engine = GameEngine.new_game(debug=debug, decisions=decisions, output=game_output)
+
+    try:
+        if log is not None:
+            log.start(engine)
+        while engine.step():
+            session.after_turn(engine)
+    finally:
+        if log is not None:
+            log.close()
+
+    session.refresh_live_view(engine)
+    if engine.winner is not None and output.enabled(SUMMARY):
+        print_victory_screen(engine.winner.name, engine.turn_count)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
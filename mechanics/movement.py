@@ -1,7 +1,11 @@
 # mechanics/movement.py
 
 import random
-from board.grid import print_board
+from board.grid import format_board, overlay_players_on_board
+from board.topology import get_topology, HALL, DOOR, ROOM, SECRET, WALL
+from entities.occupancy import occupancy_for
+from game.decisions import default_decisions
+from game.output import CONSOLE, SUMMARY, VERBOSE
 
 # tiles
 ROOM_TILES = set("123456789")
@@ -21,9 +25,9 @@ DIRECTIONS = {
 }
 
 
-def roll_dice() -> int:
+def roll_dice(rng=None) -> int:
     #Dice roll between 1 and 6
-    return random.randint(1, 6)
+    return (rng or random).randint(1, 6)
 
 
 def in_bounds(board, r, c) -> bool:
@@ -34,6 +38,10 @@ def in_bounds(board, r, c) -> bool:
 
 def is_occupied(players, row, col, ignore_player):
     #Checking if a tile is occupied by any player
+    index = occupancy_for(players)
+    if index is not None:
+        return index.is_occupied((row, col), ignore_player)
+
     for p in players:
         if p is ignore_player:
             continue
@@ -46,124 +54,175 @@ def tile_is_room(tile: str) -> bool:
     return tile in ROOM_TILES or tile in SECRET_TILES
 
 
-def overlay_players_on_board(base_board, players):
-    #Returning a copy of the board with player tokens drawn on top
-    board = [row[:] for row in base_board]
-    for p in players:
-        r, c = p.position
-        if 0 <= r < len(board) and 0 <= c < len(board[0]):
-            board[r][c] = p.token
-    return board
-
-
-def attempt_step(base_board, players, player, dr, dc):
+def attempt_step(base_board, players, player, dr, dc, out=None):
     #Moving a player one step in the given direction
+    out = out or CONSOLE
     r, c = player.position
     new_r = r + dr
     new_c = c + dc
 
     if not in_bounds(base_board, new_r, new_c):
-        print("Cannot move off the board.")
+        out.emit("blocked", VERBOSE, "Cannot move off the board.", player=player.name, reason="edge")
         return False, False
 
-    current_tile = base_board[r][c]
-    target_tile = base_board[new_r][new_c]
+    topo = get_topology(base_board)
+    current_kind = topo.kind[r][c]
+    target_kind = topo.kind[new_r][new_c]
 
     #Movement rules
     
     #Wall is always blocked
-    if target_tile == WALL_TILE:
-        print("You bumped into a wall.")
+    if target_kind == WALL:
+        out.emit("blocked", VERBOSE, "You bumped into a wall.", player=player.name, reason="wall")
         return False, False
 
 
-    if player.in_room is not None and tile_is_room(current_tile):
+    if player.in_room is not None and current_kind in (ROOM, SECRET):
         #Move inside the same room (to another room/secret tile)
-        if tile_is_room(target_tile):
+        if target_kind in (ROOM, SECRET):
             player.move_to((new_r, new_c))
+            out.emit("step", VERBOSE, player=player.name, pos=(new_r, new_c))
             return True, False
 
         #Exit from the X door
-        if target_tile == DOOR_TILE:
+        if target_kind == DOOR:
+            out.emit("exit_room", VERBOSE, player=player.name, room=player.in_room)
             player.exit_room()
             player.move_to((new_r, new_c))
+            out.emit("step", VERBOSE, player=player.name, pos=(new_r, new_c))
             return True, False
 
         #Room entrance only from door
-        print("You must exit the room through a door (X).")
+        out.emit("blocked", VERBOSE, "You must exit the room through a door (X).",
+                 player=player.name, reason="room_exit")
         return False, False
 
-    if target_tile == ".":
+    if target_kind == HALL:
         player.move_to((new_r, new_c))
+        out.emit("step", VERBOSE, player=player.name, pos=(new_r, new_c))
         return True, False
 
     #I kept logic so that door is a separate tile
-    if target_tile == DOOR_TILE:
+    if target_kind == DOOR:
         player.move_to((new_r, new_c))
+        out.emit("step", VERBOSE, player=player.name, pos=(new_r, new_c))
         return True, False
 
-    if target_tile in SECRET_TILES:
-        print("You can only use a secret passage from inside a room.")
+    if target_kind == SECRET:
+        out.emit("blocked", VERBOSE, "You can only use a secret passage from inside a room.",
+                 player=player.name, reason="secret")
         return False, False
 
     #Entering a room
-    if target_tile in ROOM_TILES:
-        if current_tile != DOOR_TILE:
-            print("You can only enter a room through a door (X).")
+    if target_kind == ROOM:
+        if current_kind != DOOR:
+            out.emit("blocked", VERBOSE, "You can only enter a room through a door (X).",
+                     player=player.name, reason="room_entry")
             return False, False
 
-        room_id = int(target_tile)
+        room_id = topo.room_id[new_r][new_c]
         player.enter_room(room_id)
         player.move_to((new_r, new_c))
-        print(f"{player.name} entered room {room_id}. Movement ends.")
+        out.emit("step", VERBOSE, player=player.name, pos=(new_r, new_c))
+        out.emit("enter_room", SUMMARY, "{player} entered room {room}. Movement ends.",
+                 player=player.name, room=room_id)
         return True, True
 
-    print("You can't move there.")
+    out.emit("blocked", VERBOSE, "You can't move there.", player=player.name, reason="other")
     return False, False
 
 
-def move_player_turn(base_board, players, player):
+def apply_move_plan(base_board, players, player, plan, steps_remaining, out=None):
+    #Apply a planned list of commands, checking every step against the rules and occupancy.
+    #Returns (steps_remaining, entered_room, finished). finished is False when a step was
+    #rejected and the rest of the roll still has to be played.
+    out = out or CONSOLE
+    for cmd in plan:
+        if steps_remaining <= 0:
+            break
+
+        vector = DIRECTIONS.get(cmd)
+        if vector is None:
+            return steps_remaining, False, False
+
+        dr, dc = vector
+        r, c = player.position
+        if is_occupied(players, r + dr, c + dc, player):
+            out.emit("plan_blocked", VERBOSE, "{player}'s planned move '{cmd}' is blocked.",
+                     player=player.name, cmd=cmd)
+            return steps_remaining, False, False
+
+        moved, entered_room = attempt_step(base_board, players, player, dr, dc, out)
+        if not moved:
+            return steps_remaining, False, False
+
+        steps_remaining -= 1
+        if entered_room:
+            return steps_remaining, True, True
+
+    #Plan used up (or stopped early on purpose): movement is over
+    return steps_remaining, False, True
+
+
+def _show_board(base_board, players, out) -> None:
+    #The whole board, every step: by far the most expensive line of narration,
+    #so it is only built when the sink is going to show it
+    if out.enabled(VERBOSE):
+        board_with_players = overlay_players_on_board(base_board, players)
+        out.write("\n=== CURRENT BOARD (during movement) ===")
+        out.write(format_board(board_with_players))
+
+
+def move_player_turn(base_board, players, player, decisions=None, out=None, rng=None):
     #Player Turn
     #Dice rolll + movement + room entry
-    dice = roll_dice()
-    print(f"\n{player.name} rolled a {dice}.")
+    decisions = decisions or default_decisions
+    out = out or CONSOLE
+    chooser = decisions(player)
+
+    dice = roll_dice(rng)
+    out.emit("roll", VERBOSE, "\n{player} rolled a {dice}.", player=player.name, dice=dice)
 
     steps_remaining = dice
     entered_room_any = False
 
-    #Ai Player logic
-    controller = getattr(player, "ai_controller", None) or getattr(player, "ai", None)
-    is_ai = getattr(player, "is_ai", False) and controller is not None
+    #Whole-roll plan (AI), applied here step by step.
+    #If a step turns out to be blocked we drop back to the one-step-at-a-time loop below.
+    plan = chooser.plan_move(base_board, players, player, steps_remaining)
+    if plan is not None:
+        _show_board(base_board, players, out)
+        out.emit("plan", VERBOSE, lambda: f"\nAI {player.name} plans moves: {' '.join(plan) if plan else 'done'}",
+                 player=player.name, plan=plan)
 
-    while steps_remaining > 0:
-        board_with_players = overlay_players_on_board(base_board, players)
-        print("\n=== CURRENT BOARD (during movement) ===")
-        print_board(board_with_players)
-        print(
-            f"\n{player.name} at {player.position}, "
-            f"steps remaining: {steps_remaining}"
+        steps_remaining, entered_room_any, finished = apply_move_plan(
+            base_board, players, player, plan, steps_remaining, out
         )
+        if finished:
+            out.emit("move_end", VERBOSE, "\n{player}'s movement turn is over.", player=player.name)
+            return entered_room_any
 
-        if is_ai:
-            cmd = controller.choose_move_command(base_board, players, steps_remaining)
-            print(f"AI {player.name} chooses move: {cmd}")
-        else:
-            print(
-                "Enter direction: w(up), s(down), a(left), d(right), "
-                "or 'done' to stop movement."
+    while steps_remaining > 0:
+        _show_board(base_board, players, out)
+        if out.enabled(VERBOSE):
+            out.write(
+                f"\n{player.name} at {player.position}, "
+                f"steps remaining: {steps_remaining}"
             )
-            cmd = input("> ").strip().lower()
+
+        cmd = chooser.choose_move(base_board, players, player, steps_remaining)
+        if player.is_ai:
+            out.emit("choose_move", VERBOSE, "AI {player} chooses move: {cmd}", player=player.name, cmd=cmd)
 
         if cmd in ("done", "stop", ""):
-            print("Ending movement early.")
+            out.write("Ending movement early.")
             break
 
         if cmd not in DIRECTIONS:
-            print("Invalid direction. Use w/a/s/d or 'done'.")
+            out.write("Invalid direction. Use w/a/s/d or 'done'.")
             continue
 
         dr, dc = DIRECTIONS[cmd]
-        moved, entered_room = attempt_step(base_board, players, player, dr, dc)
+        moved, entered_room = attempt_step(base_board, players, player, dr, dc, out)
 
         if not moved:
             continue
@@ -174,5 +233,5 @@ def move_player_turn(base_board, players, player):
             entered_room_any = True
             break
 
-    print(f"\n{player.name}'s movement turn is over.")
-    return entered_room_any
\ No newline at end of file
+    out.emit("move_end", VERBOSE, "\n{player}'s movement turn is over.", player=player.name)
+    return entered_room_any
@@ -0,0 +1,103 @@
+# mechanics/reachability.py
+
+#"Where can this player get to with a roll of k?"
+#Uses the same rules as attempt_step in mechanics/movement.py:
+#  - hallway and door tiles can be walked on,
+#  - a room can only be entered from a door, and entering ends the movement,
+#  - inside a room you can walk over the room tiles and leave through a door,
+#  - tiles with another player on them (is_occupied) are blocked.
+#Since a player may stop early, anything reachable in d steps is reachable for every roll >= d,
+#so one BFS, expanded layer by layer up to 6, answers all six rolls at once.
+
+from __future__ import annotations
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Tuple
+
+from board.topology import get_topology, BoardTopology, HALL, DOOR, ROOM, SECRET
+from entities.occupancy import occupancy_for
+
+Pos = Tuple[int, int]
+
+MAX_ROLL = 6
+
+
+class Reach(NamedTuple):
+    tiles: FrozenSet[Pos]   #tiles the player can end on (hallway/doors, or tiles inside the start room)
+    doors: FrozenSet[Pos]   #door tiles among them
+    rooms: FrozenSet[int]   #rooms that can be entered through a door (movement ends there)
+
+
+def reachable_by_roll(base_board, players, player) -> Dict[int, Reach]:
+    #{roll: Reach} for rolls 1..6, given where everyone else is standing right now
+    topo = get_topology(base_board)
+    index = occupancy_for(players)
+    if index is not None:
+        blocked = index.occupied_positions(player)
+    else:
+        blocked = frozenset(p.position for p in players if p is not player)
+    in_room = player.in_room is not None and topo.is_room_like(player.position)
+    layers = _layered_reach(topo, player.position, in_room, blocked)
+    return {roll: layers[roll - 1] for roll in range(1, MAX_ROLL + 1)}
+
+
+def reachable_with_roll(base_board, players, player, roll: int) -> Reach:
+    return reachable_by_roll(base_board, players, player)[min(max(roll, 1), MAX_ROLL)]
+
+
+#Memoized on (board, position, in-room flag, occupancy fingerprint). The topology is
+#shared per board layout, so repeated questions during a turn are free.
+@lru_cache(maxsize=4096)
+def _layered_reach(topo: BoardTopology,
+                   start: Pos,
+                   start_in_room: bool,
+                   blocked: FrozenSet[Pos]) -> Tuple[Reach, ...]:
+    #BFS state is (position, still inside the start room)
+    seen = {(start, start_in_room)}
+    frontier = deque([(start, start_in_room)])
+
+    tiles = set()
+    doors = set()
+    rooms = set()
+    layers = []
+
+    for _ in range(MAX_ROLL):
+        next_frontier = deque()
+        while frontier:
+            pos, inside = frontier.popleft()
+            r, c = pos
+            current_kind = topo.kind[r][c]
+
+            for _, nxt in topo.neighbours[pos]:
+                if nxt in blocked:
+                    continue
+                kind = topo.kind[nxt[0]][nxt[1]]
+
+                if inside:
+                    if kind in (ROOM, SECRET):
+                        state = (nxt, True)
+                    elif kind == DOOR:
+                        state = (nxt, False)
+                    else:
+                        continue
+                elif kind in (HALL, DOOR):
+                    state = (nxt, False)
+                elif kind == ROOM and current_kind == DOOR:
+                    #Entering a room ends movement, so it is never expanded further
+                    rooms.add(topo.room_id[nxt[0]][nxt[1]])
+                    continue
+                else:
+                    continue
+
+                if state in seen:
+                    continue
+                seen.add(state)
+                tiles.add(nxt)
+                if kind == DOOR:
+                    doors.add(nxt)
+                next_frontier.append(state)
+
+        frontier = next_frontier
+        layers.append(Reach(frozenset(tiles), frozenset(doors), frozenset(rooms)))
+
+    return tuple(layers)
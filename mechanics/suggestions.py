@@ -1,30 +1,20 @@
 # mechanics/suggestions.py
 # Suggestion / refutation / accusation logic.
 # It does for both human and AI players.
+# Choices come from decision providers (game/decisions.py) and narration goes
+# to an output sink (game/output.py), so nothing here touches input()/print().
+# What the whole table learns (passes, refutations, wrong accusations) is published
+# on the game's EventBus (game/events.py) for the AIs.
 
 
 from __future__ import annotations
-from typing import List, Dict, Tuple, Sequence, Optional
-from game.cards import SUSPECTS, WEAPONS, ROOMS
+from typing import List, Dict, Optional
 from board.rooms import get_room_name
 from entities.player import Player
-import random
-
-
-#User choice
-def _choose_from_list(prompt: str, options: Sequence[str]) -> str:
-    while True:
-        print(prompt)
-        for i, opt in enumerate(options, start=1):
-            print(f"{i}. {opt}")
-        choice = input("Enter number: ").strip()
-        if not choice.isdigit():
-            print("Please enter a number.")
-            continue
-        idx = int(choice) - 1
-        if 0 <= idx < len(options):
-            return options[idx]
-        print("Invalid choice, try again.")
+from entities.occupancy import occupancy_for
+from game.decisions import Resolver, default_decisions
+from game.events import EventBus
+from game.output import CONSOLE, SUMMARY, VERBOSE
 
 
 def _players_in_turn_order(start_index: int, players: List[Player]):
@@ -37,35 +27,50 @@ def _players_in_turn_order(start_index: int, players: List[Player]):
 #Main suggestion function
 def make_suggestion(current_player: Player,
                     players: List[Player],
-                    solution: Dict[str, str]) -> bool:
+                    solution: Dict[str, str],
+                    decisions: Optional[Resolver] = None,
+                    out=None,
+                    events: Optional[EventBus] = None) -> bool:
+    decisions = decisions or default_decisions
+    out = out or CONSOLE
+
     if current_player.in_room is None:
-        print(f"{current_player.name} is not in a room; cannot make a suggestion.")
+        out.emit("no_suggestion", VERBOSE, "{player} is not in a room; cannot make a suggestion.",
+                 player=current_player.name)
         return False
 
     room_id = current_player.in_room
     room_name = get_room_name(room_id)
 
-    print(f"\n{current_player.name} is in the {room_name} and may make a suggestion.")
-    if current_player.is_ai:
-        suspect, weapon, room = current_player.ai.choose_suggestion(room_name)
-        print(f"AI suggestion: {suspect} with the {weapon} in the {room}.")
-    else:
-        suspect = _choose_from_list("Choose a suspect:", SUSPECTS)
-        weapon = _choose_from_list("Choose a weapon:", WEAPONS)
-        room = room_name
-        print(f"\nSuggestion: {suspect} with the {weapon} in the {room}.")
+    out.emit("may_suggest", VERBOSE, "\n{player} is in the {room} and may make a suggestion.",
+             player=current_player.name, room=room_name)
+    suspect, weapon, room = decisions(current_player).choose_suggestion(current_player, room_name)
+    out.emit(
+        "suggestion", SUMMARY,
+        "AI suggestion: {suspect} with the {weapon} in the {room}." if current_player.is_ai
+        else "\nSuggestion: {suspect} with the {weapon} in the {room}.",
+        player=current_player.name, suspect=suspect, weapon=weapon, room=room,
+    )
 
     #Moving suspect to the room - Summon Rule
-    for p in players:
-        if p.name == suspect and p != current_player:
-            if p.in_room != room_id:
-                p.move_to(current_player.position)
-                p.enter_room(room_id)
-                p.was_summoned = True
-                print(f"❗ {p.name} has been summoned to the {room}!")
+    index = occupancy_for(players)
+    if index is not None:
+        summoned = index.by_name(suspect)
+    else:
+        summoned = next((p for p in players if p.name == suspect), None)
+
+    p = summoned
+    if p is not None and p != current_player:
+        if p.in_room != room_id:
+            p.move_to(current_player.position)
+            p.enter_room(room_id)
+            p.was_summoned = True
+            out.emit("summoned", SUMMARY, "❗ {player} has been summoned to the {room}!",
+                     player=p.name, room=room, room_id=room_id, pos=p.position)
 
     #Resolve refutation
-    print("\nResolving suggestion...")
+    events = events if events is not None else EventBus.for_players(players)
+    out.write("\nResolving suggestion...")
     suggester_index = players.index(current_player)
     suggested_cards = (suspect, weapon, room)
 
@@ -75,112 +80,108 @@ def make_suggestion(current_player: Player,
     
     
     #Main refutation loop
+    passers = []
     for p in _players_in_turn_order(suggester_index, players):
         matches = [card for card in p.hand if card in suggested_cards]
         if not matches:
-            print(f"{p.name} cannot refute.")
+            out.emit("cannot_refute", VERBOSE, "{player} cannot refute.", player=p.name)
+            passers.append(p.name)
             continue
 
-        print(f"{p.name} CAN refute the suggestion.")
+        out.emit("can_refute", VERBOSE, "{player} CAN refute the suggestion.", player=p.name)
 
         # Refuter shows a card
-        if p.is_ai:
-            shown_card = matches[0]
-            print(f"{p.name} (AI) shows a card to {current_player.name}.")
-        else:
-            #When human player is refuting, I let them choose which card to show
-            shown_card = _choose_from_list(
-                f"{p.name}, choose a card to show {current_player.name}:",
-                matches,
-            )
-            print(f"{p.name} shows a card to {current_player.name}.")
-
-        #Updating ai notebook for knowledge
-        if current_player.is_ai:
-            current_player.ai.note_seen_card(shown_card)
-        else:
-            print(f"The shown card is: {shown_card}")
+        shown_card = decisions(p).choose_card_to_show(p, current_player, matches)
+        #The structured event carries the card; the text never shows it
+        out.emit(
+            "refuted", SUMMARY,
+            "{player} (AI) shows a card to {to}." if p.is_ai else "{player} shows a card to {to}.",
+            player=p.name, to=current_player.name, card=shown_card,
+        )
+
+        #Everybody hears who passed and who refuted, only the suggester gets the card
+        events.suggestion(current_player.name, suggested_cards, passers, p.name, shown_card)
+        decisions(current_player).see_refutation(current_player, shown_card, p)
         return False
 
-    print("\nNo one could refute the suggestion!")
+    out.emit("unrefuted", SUMMARY, "\nNo one could refute the suggestion!", player=current_player.name)
+    events.suggestion(current_player.name, suggested_cards, passers, None, None)
 
     #Accusation decision logic
-    want_accuse = False
+    want_accuse = decisions(current_player).accuse_after_unrefuted(
+        current_player, (suspect, weapon, room)
+    )
     if current_player.is_ai:
-        want_accuse = current_player.ai.decide_accusation_from_suggestion(
-            (suspect, weapon, room)
-        )
         if want_accuse:
-            print(f"AI {current_player.name} decides to MAKE an accusation.")
+            out.emit("accuse_decision", SUMMARY, "AI {player} decides to MAKE an accusation.",
+                     player=current_player.name, accuse=True)
         else:
-            print(f"AI {current_player.name} decides NOT to accuse yet.")
-    else:
-        print("\nNo one could refute your suggestion.")
-        ans = input(
-            "Do you want to make an ACCUSATION with the same suspect/weapon/room? (y/n): "
-        ).strip().lower()
-        want_accuse = ans.startswith("y")
+            out.emit("accuse_decision", VERBOSE, "AI {player} decides NOT to accuse yet.",
+                     player=current_player.name, accuse=False)
 
     if not want_accuse:
         return False
 
     #Resolve accusation. 
-    return _resolve_accusation(current_player, suspect, weapon, room, solution)
+    return _resolve_accusation(current_player, suspect, weapon, room, solution, out, events)
 
 
 
 #Final accusation function. This will end the game of the player if they are wrong
-def make_accusation_standalone(current_player: Player, solution: Dict[str, str]) -> bool:
-    print(f"\n⚠️  {current_player.name} is making a FORMAL ACCUSATION! ⚠️")
-    print("This is a game-ending move. If you are wrong, you are eliminated.")
+def make_accusation_standalone(current_player: Player,
+                               solution: Dict[str, str],
+                               decisions: Optional[Resolver] = None,
+                               out=None,
+                               events: Optional[EventBus] = None) -> bool:
+    decisions = decisions or default_decisions
+    out = out or CONSOLE
+
+    out.emit("formal_accusation", SUMMARY, "\n⚠️  {player} is making a FORMAL ACCUSATION! ⚠️",
+             player=current_player.name)
+    out.write("This is a game-ending move. If you are wrong, you are eliminated.")
+
+    accusation = decisions(current_player).choose_accusation(current_player)
+    if accusation is None:
+        return False
 
+    suspect, weapon, room = accusation
     if current_player.is_ai:
-        #Simple AI fallback if called directly
-        hypo = current_player.ai.nb.current_singleton_hypothesis()
-        if hypo:
-            suspect, weapon, room = hypo
-        else:
-            #Mainly for human accusation testing
-            suspect = random.choice(SUSPECTS)
-            weapon = random.choice(WEAPONS)
-            room = random.choice(ROOMS)
-        print(f"AI Accusation: {suspect}, {weapon}, {room}")
-    else:
-        suspect = _choose_from_list("Accuse Suspect:", SUSPECTS)
-        weapon = _choose_from_list("Accuse Weapon:", WEAPONS)
-        room = _choose_from_list("Accuse Room:", ROOMS)
-        print(f"\nCONFIRM ACCUSATION: {suspect} with the {weapon} in the {room}")
-        confirm = input("Are you sure? (y/n): ").strip().lower()
-        if not confirm.startswith('y'):
-            print("Accusation cancelled.")
-            return False
+        out.emit("ai_accusation", VERBOSE, "AI Accusation: {suspect}, {weapon}, {room}",
+                 player=current_player.name, suspect=suspect, weapon=weapon, room=room)
 
-    return _resolve_accusation(current_player, suspect, weapon, room, solution)
+    return _resolve_accusation(current_player, suspect, weapon, room, solution, out, events)
 
 
 def _resolve_accusation(player: Player, 
                         suspect: str, 
                         weapon: str, 
                         room: str, 
-                        solution: Dict[str, str]) -> bool:
+                        solution: Dict[str, str],
+                        out=None,
+                        events: Optional[EventBus] = None) -> bool:
+    out = out or CONSOLE
     
-    print(f"\nChecking envelope... {player.name} accuses: {suspect}, {weapon}, {room}")
-
     correct = (
         suspect == solution["suspect"]
         and weapon == solution["weapon"]
         and room == solution["room"]
     )
+    out.emit("accusation", SUMMARY, "\nChecking envelope... {player} accuses: {suspect}, {weapon}, {room}",
+             player=player.name, suspect=suspect, weapon=weapon, room=room, correct=correct)
 
     #Game over if accusation right
     if correct:
-        print("\n✅ ACCUSATION IS CORRECT! 🎉")
-        print(f"{player.name} has solved the mystery and WINS the game!")
+        out.write("\n✅ ACCUSATION IS CORRECT! 🎉", SUMMARY)
+        out.emit("solved", SUMMARY, "{player} has solved the mystery and WINS the game!", player=player.name)
         return True
     
-    print("\n❌ ACCUSATION IS WRONG.")
-    print(f"{player.name} is ELIMINATED from making further accusations/moves.")
-    print("They remain in the game to refute suggestions.")
+    out.write("\n❌ ACCUSATION IS WRONG.", SUMMARY)
+    out.emit("eliminated", SUMMARY, "{player} is ELIMINATED from making further accusations/moves.",
+             player=player.name)
+    out.write("They remain in the game to refute suggestions.", SUMMARY)
     
     player.is_eliminated = True
-    return False
\ No newline at end of file
+    #Everybody now knows the envelope is not this triplet
+    if events is not None:
+        events.accusation(player.name, (suspect, weapon, room))
+    return False